@@ -11,10 +11,42 @@
 set -e
 
 LOGFILE="/tmp/colima-k8s-persistent.log"
+LOG_MAX_BYTES="${LOG_MAX_BYTES:-67108864}"     # Rotate the log past this size (64 MiB, roughly a day of snapshots)
+LOG_RETENTION_DAYS="${LOG_RETENTION_DAYS:-28}"  # Rotated logs are kept this long; the monitor's history search covers it
+LOG_KEEP="${LOG_KEEP:-0}"                       # Optional cap on rotated logs kept ("$LOGFILE.<epoch>"); 0 = no cap
 if [ -f "$LOGFILE" ]; then
     mv "$LOGFILE" "$LOGFILE.bak"
 fi
 
+# Moves the log to "$LOGFILE.<epoch>" once it is over LOG_MAX_BYTES and prunes
+# rotated copies older than LOG_RETENTION_DAYS (the epoch is the rotation time,
+# so everything in a pruned copy is older than that), then the oldest copies
+# beyond LOG_KEEP if set (the monitor's search index follows the rename)
+rotate_logfile() {
+    [ -f "$LOGFILE" ] || return 0
+    local size
+    size=$(( $(wc -c < "$LOGFILE") ))
+    [ "$size" -ge "$LOG_MAX_BYTES" ] || return 0
+    local now
+    now=$(date +%s)
+    mv "$LOGFILE" "$LOGFILE.$now"
+    local cutoff=$(( now - LOG_RETENTION_DAYS * 86400 ))
+    local kept=() path
+    for path in "$LOGFILE".[0-9]*; do
+        if [ "${path##*.}" -lt "$cutoff" ]; then
+            rm -f "$path"
+        else
+            kept+=( "$path" )
+        fi
+    done
+    [ "$LOG_KEEP" -gt 0 ] || return 0
+    local excess=$(( ${#kept[@]} - LOG_KEEP ))
+    local i
+    for (( i = 0; i < excess; i++ )); do
+        rm -f "${kept[$i]}"
+    done
+}
+
 # Load variables from .env (exported)
 if [ -f ".env" ]; then
     set -a
@@ -185,8 +217,9 @@ display_access_info
 echo 'Setup complete. You can now deploy workloads using Helm charts or kubectl.'
 echo 'For example, use the provided VSCode tasks to deploy services like Litellm, Milvus, OpenWebUI, MCPO, or Swiss.'
 
-# Enhanced monitoring loop
+# Enhanced monitoring loop (one snapshot per cycle, appended to the log and rotated by size)
 while true; do
+    {
     echo "=== $(date) ==="
     
     echo '--- Colima Status ---'
@@ -209,6 +242,7 @@ while true; do
     
     echo '--- Service Status ---'
     stdbuf -oL kubectl get svc -A 2>/dev/null || echo 'Service controller not ready'
-    
+    } | tee -a "$LOGFILE"
+    rotate_logfile
     sleep 15
-done | tee -a "$LOGFILE"
\ No newline at end of file
+done
\ No newline at end of file
@@ -3,7 +3,6 @@
 import sys
 import time
 import re
-import shutil
 import argparse
 import os
 import json
@@ -12,6 +11,22 @@ from art import text2art, art, FONT_NAMES
 import random
 import difflib
 import subprocess
+import select
+import signal
+
+import hashlib
+import logging
+
+from cyber_k8s_index import SECTION_COMMANDS, TableIndex, table_record
+from cyber_k8s_alerts import DEFAULT_RULES_PATH, AlertEngine, load_rules
+from cyber_k8s_events import EventStream
+from cyber_k8s_logtail import LogTail
+from cyber_k8s_governor import ChangeDetector, Governor
+from cyber_k8s_probes import Prober
+from cyber_k8s_storage import StorageScanner, storage_root
+from cyber_k8s_buffers import LRUCache
+from cyber_k8s_search import format_results, open_index
+from cyber_k8s_render import BACKENDS, AnsiStreamBackend, NullBackend, RealClock, VirtualClock, make_backend
 
 # ANSI color codes
 COLORS = [
@@ -35,58 +50,77 @@ COLORS = [
 RESET = "\033[0m"
 CLEAR_SCREEN = "\033[2J\033[H"
 
-SECTION_HEADER = re.compile(r"^---\s(.*)\s---$")
+# Alerts and diagnostics go to a debug log so they never interleave with the animation
+LOG_FILE = "/tmp/cyber_k8s_logstream_debug.log"
+logging.basicConfig(filename=LOG_FILE, level=logging.DEBUG,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+# Where drawing goes and how animations wait; swapped for --render/--virtual-clock/--benchmark
+backend = AnsiStreamBackend()
+clock = RealClock()
+
+# Idle pacing: command output younger than the governor interval is reused, and
+# pauses stretch while nothing changes (see cyber_k8s_governor)
+POLL_MIN_INTERVAL_SEC = 5.0
+POLL_MAX_INTERVAL_SEC = 300.0
+governor = Governor(POLL_MIN_INTERVAL_SEC, POLL_MAX_INTERVAL_SEC)
+change_detector = ChangeDetector() # Ignores ages, usage, latencies and timestamps when deciding "changed"
+# Memory budget: per-command caches are LRU-capped (scenes may template commands per namespace/pod)
+MAX_CACHED_COMMANDS = 256
+MEMORY_REPORT_INTERVAL_SEC = 300
+command_cache = LRUCache(MAX_CACHED_COMMANDS) # cmd -> (fetched_at, lines)
 
 def colorize(text, color_code):
     return f"{color_code}{text}{RESET}"
 
 def print_centered_typewriter(text, color=None, delay=0.01):
-    width = shutil.get_terminal_size((80, 20)).columns
+    width = backend.size()[1]
     for line in text.splitlines():
         line_stripped = line.rstrip("\n")
         pad = max(0, (width - len(line_stripped)) // 2)
         out = " " * pad + (colorize(line_stripped, color) if color else line_stripped)
         typewriter_line(out, color=None, delay=delay)
-        sys.stdout.write("\n")
-        sys.stdout.flush()
+        backend.write("\n")
+        backend.flush()
 
 def typewriter_line(line, color=None, delay=0.01, highlight_mask=None, highlight_color=None):
     runs = re.findall(r'\S+| +', line)
     idx = 0
     for run in runs:
         if run.isspace():
-            sys.stdout.write(run)
-            sys.stdout.flush()
-            time.sleep(delay)
+            backend.write(run)
+            backend.flush()
+            clock.sleep(delay)
             idx += len(run)
         else:
             for i, c in enumerate(run):
                 if highlight_mask and idx < len(highlight_mask) and highlight_mask[idx]:
                     # Use a lighter version of the main color for highlight
                     if highlight_color:
-                        sys.stdout.write(colorize(c, highlight_color))
+                        backend.write(colorize(c, highlight_color))
                     elif color == COLORS[3]:  # Cyan
-                        sys.stdout.write(colorize(c, COLORS[6]))  # Green as lighter for cyan
+                        backend.write(colorize(c, COLORS[6]))  # Green as lighter for cyan
                     elif color == COLORS[2]:  # Blue
-                        sys.stdout.write(colorize(c, COLORS[7]))  # Yellow as lighter for blue
+                        backend.write(colorize(c, COLORS[7]))  # Yellow as lighter for blue
                     elif color == COLORS[4]:  # Green
-                        sys.stdout.write(colorize(c, COLORS[8]))  # Magenta as lighter for green
+                        backend.write(colorize(c, COLORS[8]))  # Magenta as lighter for green
                     elif color == COLORS[5]:  # Yellow
-                        sys.stdout.write(colorize(c, COLORS[9]))  # Red as lighter for yellow
+                        backend.write(colorize(c, COLORS[9]))  # Red as lighter for yellow
                     elif color == COLORS[1]:  # Magenta
-                        sys.stdout.write(colorize(c, COLORS[3]))  # Cyan as lighter for magenta
+                        backend.write(colorize(c, COLORS[3]))  # Cyan as lighter for magenta
                     else:
-                        sys.stdout.write(colorize(c, COLORS[7]))  # Default to Yellow
+                        backend.write(colorize(c, COLORS[7]))  # Default to Yellow
                 else:
-                    sys.stdout.write(colorize(c, color) if color else c)
-                sys.stdout.flush()
-                time.sleep(delay)
+                    backend.write(colorize(c, color) if color else c)
+                backend.flush()
+                clock.sleep(delay)
                 idx += 1
 
 def print_typewriter(line, color=None, delay=0.01, highlight_mask=None, highlight_color=None):
     typewriter_line(line, color=color, delay=delay, highlight_mask=highlight_mask, highlight_color=highlight_color)
-    sys.stdout.write("\n")
-    sys.stdout.flush()
+    backend.write("\n")
+    backend.flush()
 
 def load_font_knowledge(path=".vscode/entities.json"):
     with open(path, "r", encoding="utf-8") as f:
@@ -120,28 +154,9 @@ def diff_lines(old, new):
             continue
     return result
 
-def split_sections(batch):
-    sections = []
-    current_section = None
-    current_lines = []
-    for line in batch:
-        m = SECTION_HEADER.match(line)
-        if m:
-            if current_section is not None:
-                sections.append((current_section, current_lines))
-            current_section = m.group(1).strip()
-            current_lines = [line]
-        else:
-            if current_section is None:
-                current_section = "Unknown Section"
-                current_lines = []
-            current_lines.append(line)
-    if current_section is not None:
-        sections.append((current_section, current_lines))
-    return sections
-
 def run_commands(commands):
     output_sections = []
+    started = time.perf_counter()
     for cmd in commands:
         try:
             proc = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
@@ -150,8 +165,184 @@ def run_commands(commands):
             output_sections.append((cmd, lines))
         except Exception as e:
             output_sections.append((cmd, [f"[ERROR] {cmd}: {e}"]))
+    run_commands.elapsed += time.perf_counter() - started
     return output_sections
 
+run_commands.elapsed = 0.0 # Total seconds spent waiting on commands (used by --benchmark)
+
+# Streaming data sources for scenes with 'source:' instead of 'commands:'.
+# Each source is started on first use and returns [(label, lines)] like run_commands().
+active_sources = {}
+
+def events_source_sections(scene):
+    stream = active_sources.get("events")
+    if stream is None:
+        stream = active_sources["events"] = EventStream().start()
+        clock.sleep(1.0) # Let the initial event list arrive before the first render
+    stream.aggregator.render_interval_sec = scene.get("render_interval", 2.0)
+    lines = stream.aggregator.render_lines(limit=scene.get("limit", 10))
+    if stream.error:
+        lines = [f"[ERROR] events: {stream.error}"] + lines
+    return [("kubectl get events -A --watch", lines)]
+
+def logs_source_sections(scene):
+    namespace, selector = scene.get("namespace"), scene.get("selector")
+    key = ("logs", namespace, selector)
+    tail = active_sources.get(key)
+    if tail is None:
+        tail = active_sources[key] = LogTail(namespace=namespace, selector=selector,
+                                             max_pods=scene.get("max_pods", 30)).start()
+        clock.sleep(2.0) # Give discovery and the initial --tail a moment
+    label = "kubectl logs -f " + (f"-n {namespace}" if namespace else "-A") + (f" -l {selector}" if selector else "")
+    return [(label, tail.render_lines(limit=scene.get("limit", 20), width=backend.size()[1]))]
+
+def probes_source_sections(scene):
+    prober = active_sources.get("probes")
+    if prober is None:
+        prober = active_sources["probes"] = Prober(max_hosts=scene.get("max_hosts", 20), path=scene.get("path", "/"))
+    # Hosts come from the ingress list (shared with the "Ingress Status" scene through the command cache)
+    (_, ingress_lines), = run_commands_cached(["kubectl get ing -A"], governor.interval())
+    prober.update_from_ingress("\n".join(ingress_lines))
+    prober.probe_round() # One bounded round per showing; no background thread needed here
+    return [("probe ingress hosts", prober.render_lines())]
+
+def storage_source_sections(scene):
+    root = os.path.expanduser(scene["path"]) if scene.get("path") else storage_root()
+    if not root:
+        return [("storage", ["[ERROR] storage: K8S_POD_STORAGE_PATH is not set (environment or .env)"])]
+    scanner = active_sources.get(("storage", root))
+    if scanner is None:
+        scanner = active_sources[("storage", root)] = StorageScanner(
+            root, interval_sec=scene.get("scan_interval", 60)).start()
+        clock.sleep(1.0) # Cached totals are shown at once; give a first scan a moment otherwise
+    return [(f"du {root}", scanner.render_lines(limit=scene.get("limit", 10)))]
+
+def alerts_source_sections(scene):
+    state = active_sources.get("alerts")
+    if state is None:
+        rules, errors = load_rules(scene.get("rules", DEFAULT_RULES_PATH))
+        state = active_sources["alerts"] = (AlertEngine(rules, errors), TableIndex())
+    engine, index = state
+    # Rules name sections of colima-k8s-persistent.sh; run the command behind each one
+    sections = [section for section in engine.sections if section in SECTION_COMMANDS]
+    commands = [SECTION_COMMANDS[section] for section in sections]
+    fetched_before = [command_cache.get(cmd, (None,))[0] for cmd in commands]
+    outputs = run_commands_cached(commands, governor.interval())
+    for section, (_, lines) in zip(sections, outputs):
+        index.update(section, "\n".join(lines))
+        engine.observe(section, index.delta(section)) # Only rows that changed since the last fetch
+    if fetched_before != [command_cache[cmd][0] for cmd in commands]:
+        engine.advance_cycle() # Cached output is not a new snapshot
+    engine.tick()
+    return [("alert rules", engine.render_lines())]
+
+# Sources that are a stream of new lines rather than cluster state; they never wake the governor
+STREAM_SOURCES = {"logs"}
+
+SCENE_SOURCES = {
+    "events": events_source_sections,
+    "logs": logs_source_sections,
+    "probes": probes_source_sections,
+    "storage": storage_source_sections,
+    "alerts": alerts_source_sections,
+}
+
+def stop_sources():
+    """Stops the threads and kubectl children of every started source (they would outlive us otherwise)."""
+    for source in list(active_sources.values()):
+        stop = getattr(source, "stop", None)
+        if stop is not None:
+            stop()
+    active_sources.clear()
+
+def source_sections(scene):
+    """Output of a scene's streaming source, in run_commands() format."""
+    source = scene.get("source")
+    handler = SCENE_SOURCES.get(source)
+    if handler is None:
+        return [(f"source: {source}", [f"[ERROR] Unknown scene source '{source}'. Known: {', '.join(SCENE_SOURCES)}"])]
+    return handler(scene)
+
+def run_commands_cached(commands, max_age):
+    """run_commands(), reusing any command output fetched less than max_age seconds ago."""
+    now = time.time()
+    stale = [cmd for cmd in commands if cmd not in command_cache or now - command_cache[cmd][0] >= max_age]
+    for cmd, lines in run_commands(stale):
+        command_cache[cmd] = (now, lines)
+    return [(cmd, command_cache[cmd][1]) for cmd in commands]
+
+def poll_user_activity():
+    """Reports pending terminal input (e.g. Enter) to the governor and discards it."""
+    try:
+        if sys.stdin.isatty() and select.select([sys.stdin], [], [], 0)[0]:
+            os.read(sys.stdin.fileno(), 1024)
+            governor.note_activity()
+    except (OSError, ValueError):
+        pass
+
+def idle_pause(seconds):
+    """Pause stretched by the governor; falls back to the normal length once the user is active."""
+    total = seconds * governor.slowdown()
+    elapsed = 0.0
+    while elapsed < total:
+        step = min(total - elapsed, 1.0)
+        clock.sleep(step)
+        elapsed += step
+        poll_user_activity()
+        if not governor.idle():
+            total = min(total, seconds)
+
+def stream_ndjson(scenes, once=False, only_changed=False, interval=15.0, out=None):
+    """
+    Headless mode: one NDJSON record per scene per cycle with parsed rows, a
+    content hash and timings. No figlet, colour or typewriter work is done and
+    a command shared by several scenes runs only once per cycle.
+    """
+    out = out or sys.stdout
+    last_hashes = {}
+    cycle = 0
+    while True:
+        cycle_start = time.time()
+        cache = {}
+        for scene in scenes:
+            commands = scene.get("commands", [])
+            if not commands and not scene.get("source"):
+                continue # Message-only slides carry no cluster data
+            scene_start = time.perf_counter()
+            command_records = []
+            if scene.get("source"):
+                for label, lines in source_sections(scene):
+                    record = table_record("\n".join(lines))
+                    record["cmd"] = label
+                    command_records.append(record)
+            for cmd in commands:
+                if cmd not in cache:
+                    started = time.perf_counter()
+                    _, lines = run_commands([cmd])[0]
+                    record = table_record("\n".join(lines))
+                    record["cmd"] = cmd
+                    record["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+                    cache[cmd] = record
+                command_records.append(cache[cmd])
+            scene_hash = hashlib.sha1("".join(r["hash"] for r in command_records).encode()).hexdigest()
+            if only_changed and last_hashes.get(scene["name"]) == scene_hash:
+                continue
+            last_hashes[scene["name"]] = scene_hash
+            out.write(json.dumps({
+                "type": "scene",
+                "cycle": cycle,
+                "ts": round(cycle_start, 3),
+                "scene": scene["name"],
+                "hash": scene_hash,
+                "elapsed_ms": round((time.perf_counter() - scene_start) * 1000, 2),
+                "commands": command_records,
+            }, separators=(",", ":")) + "\n")
+            out.flush()
+        if once:
+            return
+        cycle += 1
+        clock.sleep(max(0.0, interval - (time.time() - cycle_start)))
+
 def count_timed_units(lines):
     total = 0
     for line in lines:
@@ -174,8 +365,58 @@ Uses .vscode/entities.json (font knowledge) and .vscode/cyber-k8s-scene-config.y
                         help="Path to log file to stream (default: /tmp/colima-k8s-persistent.log). Use '-' for stdin.")
     parser.add_argument("--cmd", type=str, default=None,
                         help="Shell command to run and stream its output (overrides logfile).")
+    parser.add_argument("--render", choices=sorted(BACKENDS), default="ansi",
+                        help="Render backend: ansi (terminal, default), virtual (in-memory screen) or null (discard).")
+    parser.add_argument("--virtual-clock", action="store_true",
+                        help="Run animations on a virtual clock (no real sleeping).")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Render every scene once on the null backend with a virtual clock and print timings.")
+    parser.add_argument("--query", type=str, default=None,
+                        help="Search the persistent log (logfile) via its index, e.g. 'litellm crashloopbackoff' or 'milvus*', then exit.")
+    parser.add_argument("--section", type=str, default=None,
+                        help="Restrict --query to one section, e.g. 'Active Pods'.")
+    parser.add_argument("--limit", type=int, default=20,
+                        help="Maximum number of matching lines printed by --query (default: 20).")
+    parser.add_argument("--cpu-budget", type=float, default=None,
+                        help="Cap CPU use per scene as a fraction of one core (e.g. 0.05).")
+    parser.add_argument("--max-poll", type=float, default=POLL_MAX_INTERVAL_SEC,
+                        help=f"Longest interval between kubectl polls when idle, in seconds (default: {POLL_MAX_INTERVAL_SEC:.0f}).")
+    parser.add_argument("--ndjson", action="store_true",
+                        help="Headless mode: emit one NDJSON record per scene per cycle (no figlet, colours or delays).")
+    parser.add_argument("--once", action="store_true",
+                        help="With --ndjson: run a single cycle and exit.")
+    parser.add_argument("--only-changed", action="store_true",
+                        help="With --ndjson: only emit scenes whose content hash changed since the previous cycle.")
+    parser.add_argument("--interval", type=float, default=15.0,
+                        help="With --ndjson: seconds between cycles (default: 15).")
     args = parser.parse_args()
 
+    if args.ndjson:
+        scenes, _, _ = load_scene_config()
+        try:
+            stream_ndjson(scenes, once=args.once, only_changed=args.only_changed, interval=args.interval)
+        except (KeyboardInterrupt, BrokenPipeError):
+            pass
+        finally:
+            stop_sources()
+        return
+
+    if args.query:
+        index = open_index(args.logfile)
+        for line in format_results(index, args.query, section=args.section, limit=args.limit):
+            print(line)
+        return
+
+    global backend, clock, governor
+    governor = Governor(POLL_MIN_INTERVAL_SEC, args.max_poll, cpu_budget=args.cpu_budget)
+    if args.benchmark:
+        backend = NullBackend()
+        clock = VirtualClock(start=time.time())
+    else:
+        backend = make_backend(args.render)
+        if args.virtual_clock:
+            clock = VirtualClock(start=time.time())
+
     color_cycle = [COLORS[1], COLORS[2], COLORS[3], COLORS[4], COLORS[5], COLORS[0]]
     color_idx = [0]
 
@@ -184,7 +425,20 @@ Uses .vscode/entities.json (font knowledge) and .vscode/cyber-k8s-scene-config.y
     allowed_fonts = set(font_knowledge.keys())
     scenes, global_drawing, global_pause = load_scene_config()
 
-    last_sections = {}
+    last_sections = LRUCache(MAX_CACHED_COMMANDS) # cmd -> lines shown last time (for diff highlighting)
+    last_memory_report = [0.0]
+
+    def log_retained_sizes():
+        """Writes cache sizes to the debug log; they must stay flat over a long session."""
+        now = time.time()
+        if now - last_memory_report[0] < MEMORY_REPORT_INTERVAL_SEC:
+            return
+        last_memory_report[0] = now
+        cached_lines = sum(len(lines) for _, lines in command_cache.values())
+        shown_lines = sum(len(lines) for lines in last_sections.values())
+        logging.debug(f"Retained: command_cache={len(command_cache)}/{MAX_CACHED_COMMANDS} ({cached_lines} lines, "
+                      f"{command_cache.evicted} evicted)  last_sections={len(last_sections)}/{MAX_CACHED_COMMANDS} "
+                      f"({shown_lines} lines, {last_sections.evicted} evicted)")
 
     def get_scene_font(scene):
         font = scene.get("font", None)
@@ -196,8 +450,8 @@ Uses .vscode/entities.json (font knowledge) and .vscode/cyber-k8s-scene-config.y
         return next(iter(allowed_fonts)) if allowed_fonts else "block"
 
     def stream_scene(scene):
-        sys.stdout.write(CLEAR_SCREEN)
-        sys.stdout.flush()
+        backend.write(CLEAR_SCREEN)
+        backend.flush()
         font = get_scene_font(scene)
         figlet_text = scene["name"]
         drawing_duration = scene.get("drawing_duration", global_drawing)
@@ -208,8 +462,8 @@ Uses .vscode/entities.json (font knowledge) and .vscode/cyber-k8s-scene-config.y
         header_delay = header_time / max(header_units, 1)
         for line in header_lines:
             typewriter_line(line, color=color_cycle[color_idx[0] % len(color_cycle)], delay=header_delay)
-            sys.stdout.write("\n")
-            sys.stdout.flush()
+            backend.write("\n")
+            backend.flush()
         color_idx[0] += 1
         if "message" in scene:
             msg = scene["message"]
@@ -217,14 +471,19 @@ Uses .vscode/entities.json (font knowledge) and .vscode/cyber-k8s-scene-config.y
             data_time = drawing_duration - header_time
             msg_units = count_timed_units(msg_lines)
             if msg_units == 0:
-                time.sleep(data_time)
+                clock.sleep(data_time)
             else:
                 msg_delay = data_time / msg_units
                 for line in msg_lines:
                     print_typewriter(line, color=COLORS[3], delay=msg_delay)
-            time.sleep(pause_duration)
-            return
-        output_sections = run_commands(scene.get("commands", []))
+            idle_pause(pause_duration)
+            return False
+        if scene.get("source"):
+            output_sections = source_sections(scene)
+        else:
+            output_sections = run_commands_cached(scene.get("commands", []), governor.interval())
+        changed = (scene.get("source") not in STREAM_SOURCES
+                   and change_detector.update({cmd: "\n".join(lines) for cmd, lines in output_sections}))
         data_time = drawing_duration - header_time
         flat_lines = []
         for cmd, lines in output_sections:
@@ -251,14 +510,14 @@ Uses .vscode/entities.json (font knowledge) and .vscode/cyber-k8s-scene-config.y
                     else:
                         total_units += len(run)
         if total_units == 0:
-            time.sleep(data_time)
+            clock.sleep(data_time)
         else:
             delay_per_unit = data_time / total_units
             line_idx = 0
             for cmd, lines in output_sections:
-                sys.stdout.write("\n")
-                sys.stdout.write(colorize(f"$ {cmd}", COLORS[2]) + "\n")
-                sys.stdout.flush()
+                backend.write("\n")
+                backend.write(colorize(f"$ {cmd}", COLORS[2]) + "\n")
+                backend.flush()
                 prev_lines = last_sections.get(cmd, [])
                 diffed = diff_lines(prev_lines, lines)
                 for line, mask in diffed:
@@ -269,23 +528,53 @@ Uses .vscode/entities.json (font knowledge) and .vscode/cyber-k8s-scene-config.y
                         print_typewriter(line, color=COLORS[3], delay=delay_per_unit)
                     line_idx += 1
             while line_idx < len(flat_lines):
-                time.sleep(delay_per_unit)
+                clock.sleep(delay_per_unit)
                 line_idx += 1
             for cmd, lines in output_sections:
                 last_sections[cmd] = lines.copy()
-        time.sleep(pause_duration)
+        idle_pause(pause_duration)
+        return changed
+
+    def benchmark_scenes(scenes=scenes):
+        # Render cost only: time spent waiting on kubectl is subtracted
+        print(f"{'scene':<28} {'render_ms':>10} {'cmd_ms':>8} {'chars':>8} {'virtual_s':>10}")
+        for scene in scenes:
+            cmd_before = run_commands.elapsed
+            chars_before = backend.stats["chars"]
+            virtual_before = clock.now
+            start = time.perf_counter()
+            stream_scene(scene)
+            total_ms = (time.perf_counter() - start) * 1000
+            cmd_ms = (run_commands.elapsed - cmd_before) * 1000
+            print(f"{scene['name'][:28]:<28} {max(total_ms - cmd_ms, 0.0):>10.2f} {cmd_ms:>8.1f} "
+                  f"{backend.stats['chars'] - chars_before:>8} {clock.now - virtual_before:>10.2f}")
 
     def stream_lines(line_iter, scenes=scenes):
+        if hasattr(signal, "SIGWINCH"):
+            signal.signal(signal.SIGWINCH, lambda signum, frame: governor.note_activity())
         while True:
             for scene in scenes:
-                stream_scene(scene)
+                governor.begin_cycle()
+                if stream_scene(scene):
+                    governor.note_change()
+                throttle = governor.end_cycle()
+                if throttle:
+                    clock.sleep(throttle) # Stay within --cpu-budget
+            log_retained_sizes()
 
-    if args.cmd:
-        proc = subprocess.Popen(args.cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
-        stream_lines(proc.stdout)
-        return
+    try:
+        if args.benchmark:
+            benchmark_scenes()
+            return
+
+        if args.cmd:
+            proc = subprocess.Popen(args.cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+            stream_lines(proc.stdout)
+            return
 
-    stream_lines([], scenes=scenes)
+        stream_lines([], scenes=scenes)
+    finally:
+        stop_sources()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
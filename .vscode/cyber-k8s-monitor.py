@@ -20,6 +20,32 @@
 # - Supports resizing: UI re-renders automatically when the terminal is resized.
 # - Includes cyberpunk-themed colors, ASCII borders, and a blinking indicator.
 # - Ensures graceful shutdown, restoring terminal to its original state.
+# - Drilldown filters (namespace, node, status, substring) backed by secondary
+#   indexes that are updated incrementally as new snapshots arrive.
+# - Indexed search over the persistent cluster log ('f' key).
+# - Cluster events section fed by 'kubectl get events --watch', collapsed into
+#   bounded counters (see cyber_k8s_events).
+# - Optional "Pod Logs" pane following many pods' logs concurrently
+#   (--logs-namespace / --logs-selector, see cyber_k8s_logtail).
+# - "Ingress Health" section: the ingress hosts are probed over pooled
+#   keep-alive HTTP(S) connections with p50/p95/p99 latency histograms
+#   (see cyber_k8s_probes).
+# - "PVC Storage" section: per-PVC usage under K8S_POD_STORAGE_PATH from an
+#   incremental, cached background scanner (see cyber_k8s_storage).
+# - "Alerts" section: declarative rules (cyber-k8s-alert-rules.yaml) evaluated
+#   only on the rows that changed between snapshots (see cyber_k8s_alerts).
+#   Failing statuses are coloured red/orange instead of green.
+# - Bounded memory and disk: the source output is read from a pipe, only the
+#   latest snapshots are kept, and the capture file rotates by size. Retained
+#   sizes are reported in the debug log.
+# - Tiled layout ('t' key or --tiled): one curses window per section, sized
+#   from the terminal, each redrawn only when its own data changes, with a
+#   single doupdate() per tick.
+# - Idle-aware governor: the loop slows down step by step while nothing changes
+#   and snaps back on new data, a keypress or a resize; optional CPU budget.
+# - Headless NDJSON ingest mode (--ndjson) for scripts and dashboards.
+# - Draws through a pluggable render backend and clock (cyber_k8s_render), so
+#   section rendering can run headless on a virtual screen with a virtual clock.
 #
 # Usage:
 # 1. Ensure Python 3 is installed.
@@ -28,6 +54,11 @@
 # 4. Update your VSCode tasks.json to run this script.
 # 5. Ensure SOURCE_SCRIPT_PATH points to your Kubernetes monitoring script.
 #
+# Drilldown keys: 'n' namespace, 'o' node, 's' status (cycle through values),
+# 'p' problem pods only, '/' substring filter, 'c' clear all filters.
+# Layout key: 't' toggles between the rotating single panel and the tiled layout.
+# Search key: 'f' searches the persistent log history (see cyber_k8s_search).
+#
 # To exit: Press 'q' or Ctrl+C.
 # ==============================================================================
 
@@ -39,6 +70,8 @@ import re
 import select
 import logging
 import random
+import json
+import argparse
 import sys # For sys.exit()
 
 # Try to import 'art' library, provide instructions if not found
@@ -49,6 +82,17 @@ except ImportError:
     print("Please install it using: pip install art")
     sys.exit(1)
 
+from cyber_k8s_index import PROBLEM_FILTER, SECTION_COMMANDS, SECTION_HEADER, SNAPSHOT_HEADER, TableIndex, split_sections, table_record
+from cyber_k8s_render import CursesBackend, RealClock
+from cyber_k8s_search import IndexWorker
+from cyber_k8s_events import EventAggregator, EventStream
+from cyber_k8s_logtail import LogTail
+from cyber_k8s_governor import ChangeDetector, Governor
+from cyber_k8s_probes import Prober
+from cyber_k8s_storage import StorageScanner, storage_root
+from cyber_k8s_alerts import AlertEngine, load_rules
+from cyber_k8s_buffers import LogFollower, PipeReader, RotatingCapture, SnapshotBuffer
+
 # ==============================================================================
 #                             Logging Setup
 # ==============================================================================
@@ -68,20 +112,58 @@ CHAR_PRINT_MAX_DELAY_SEC = 0.2 # Increased to 200ms
 UPDATE_INTERVAL_SEC = 15
 # Refresh rate for the curses display loop (how often to check for resize/input/blinker)
 DISPLAY_REFRESH_RATE_SEC = 0.05 # 50ms, for smoother animation and resize handling
+# Slowest refresh rate the governor backs off to when nothing changes and nobody types
+IDLE_MAX_REFRESH_RATE_SEC = 2.0
+# Optional cap on CPU use per loop cycle, as a fraction of one core (e.g. 0.05); None = unlimited
+CPU_BUDGET = None
 
 # Path to the original Kubernetes monitoring script (e.g., 'colima-k8s-persistent.sh')
 SOURCE_SCRIPT_PATH = os.path.join(os.path.dirname(__file__), 'colima-k8s-persistent.sh')
+# Persistent log written by the source script (searched with the 'f' key)
+PERSISTENT_LOG_PATH = "/tmp/colima-k8s-persistent.log"
+# Copy of the source output for debugging; rotated to '.1' past CAPTURE_MAX_BYTES and never re-read
+CAPTURE_PATH = "/tmp/k8s_monitor_output.tmp"
+CAPTURE_MAX_BYTES = 5 * 1024 * 1024
+# Complete snapshots kept in memory (the parser only needs the latest one)
+HISTORY_SNAPSHOTS = 4
+# How often retained buffer sizes are written to the debug log
+MEMORY_REPORT_INTERVAL_SEC = 300
+
+# Ingress health probes (disable with --no-probes); at most PROBE_MAX_HOSTS hosts per round
+PROBES_ENABLED = True
+PROBE_MAX_HOSTS = 20
+
+# PVC storage scanner: root defaults to K8S_POD_STORAGE_PATH (environment or .env); None disables it
+STORAGE_PATH = storage_root()
+STORAGE_SCAN_INTERVAL_SEC = 60
+
+# Alert rules for the "Alerts" section (built-in rules are used when the file is missing)
+ALERT_RULES_PATH = os.path.join(os.path.dirname(__file__), 'cyber-k8s-alert-rules.yaml')
+
+# Status words coloured by severity in section content (everything else in the lists stays green)
+HEALTHY_STATUS_WORDS = ["Running", "Ready", "Completed"]
+WARNING_STATUS_WORDS = ["Pending", "Terminating", "ContainerCreating", "PodInitializing", "Unknown", "NotReady"]
+FAILING_STATUS_WORDS = ["Error", "CrashLoopBackOff", "ImagePullBackOff", "ErrImagePull", "OOMKilled",
+                        "Failed", "Evicted", "CreateContainerConfigError", "Down", "Firing"]
 
 # Minimum terminal dimensions for a legible display.
 MIN_COLS = 40
 MIN_LINES = 15
 
+# Tiled layout: smallest pane that is still worth drawing
+MIN_PANE_COLS = 60
+MIN_PANE_LINES = 10
+
 # Define how many sections to cycle through in the main data stream panel
 SECTION_CYCLE_ORDER = [
     "Active Pods",
+    "Alerts",
     "Service Status",
     "Kubernetes Nodes", # This will combine Nodes and Node Resource Usage
     "INGRESS Status",
+    "Ingress Health",
+    "Cluster Events",
+    "PVC Storage",
     "Colima Status",
     "Kubernetes Cluster Info"
 ]
@@ -101,12 +183,33 @@ sections = {
     "Service Status": "",
     "Unknown Section": "" # Fallback for unparsed data
 }
-last_full_output = ""
 source_process = None
-temp_output_file = None
+source_reader = None # Non-blocking reader of the source script's stdout pipe
+capture_file = None # RotatingCapture of the source output
+snapshot_buffer = SnapshotBuffer(HISTORY_SNAPSHOTS) # Snapshot in progress + bounded history of complete ones
 stdscr = None # Global for the main curses screen
 main_content_win = None # Global for the main content window
+render_backend = None # CursesBackend in normal use; a VirtualScreenBackend/NullBackend headless
+clock = RealClock() # Swap for cyber_k8s_render.VirtualClock to run typing effects instantly
 last_drawn_section_title = None # To track which section was last drawn to the main content window
+event_stream = None # Background 'kubectl get events --watch' feeding the "Cluster Events" section
+log_tail = None # Multi-pod 'kubectl logs -f' multiplexer feeding "Pod Logs" (enabled by CLI flags)
+LOG_TAIL_NAMESPACE = None # Set from --logs-namespace
+LOG_TAIL_SELECTOR = None # Set from --logs-selector
+prober = None # Ingress endpoint prober feeding the "Ingress Health" section
+storage_scanner = None # Background incremental scanner feeding the "PVC Storage" section
+history_index = None # Background IndexWorker over the persistent log, answering 'f' searches
+alert_engine = None # Alert rules fed with the rows that changed in each complete snapshot (created in main)
+layout_mode = "single" # "single" (rotating main panel) or "tiled" (one pane per section)
+pane_windows = {} # Tiled layout: section -> curses window
+pane_signatures = {} # Tiled layout: section -> signature of what the pane currently shows
+governor = None # cyber_k8s_governor.Governor pacing the main loop (created in main)
+change_detector = ChangeDetector() # Decides what counts as a change for the governor (ignores ages, usage, ...)
+extra_sections = {} # Sections not produced by the source script (e.g. "Search Results"); survive re-parsing
+pinned_section = None # Section shown instead of the cycle until the next cycle step or 'c'
+section_index = TableIndex() # Secondary indexes (namespace/node/status) over parsed sections
+alert_index = TableIndex() # Rows of the complete snapshots only, feeding the alert rules
+drilldown_filter = {"namespace": None, "node": None, "status": None, "text": None}
 
 # ==============================================================================
 #                             ASCII Art Definitions (using 'art' library)
@@ -120,8 +223,18 @@ ASCII_TITLE_TEXT = "KUBEMON"
 
 def cleanup():
     """Restores terminal to normal state and cleans up subprocess/temp files."""
-    global source_process, temp_output_file, stdscr
+    global source_process, capture_file, stdscr
     logging.info("Starting cleanup process.")
+    if event_stream:
+        event_stream.stop()
+    if log_tail:
+        log_tail.stop()
+    if prober:
+        prober.stop()
+    if storage_scanner:
+        storage_scanner.stop()
+    if history_index:
+        history_index.stop()
     if source_process and source_process.poll() is None:
         try:
             logging.info("Terminating source subprocess.")
@@ -133,12 +246,10 @@ def cleanup():
         except Exception as e:
             logging.error(f"Error during source process termination: {e}")
 
-    if temp_output_file:
+    if capture_file:
         try:
-            logging.info(f"Closing and removing temporary file: {temp_output_file.name}")
-            temp_output_file.close()
-            if os.path.exists(temp_output_file.name):
-                os.remove(temp_output_file.name)
+            logging.info(f"Closing and removing capture files: {capture_file.path}*")
+            capture_file.close(remove=True)
         except Exception as e:
             logging.error(f"Error during temporary file cleanup: {e}")
 
@@ -199,11 +310,107 @@ def parse_raw_output(raw_output: str):
 
     if current_section_name:
         sections[current_section_name] = "\n".join(current_section_content).strip()
-    
+
+    # Keep the drilldown indexes in step; unchanged sections and rows are skipped. The alert
+    # rules are not fed from here: a section may be half-written (see observe_complete_snapshots)
+    for section_name, section_text in sections.items():
+        added, changed, removed = section_index.update(section_name, section_text)
+        if added or changed or removed:
+            logging.debug(f"Index '{section_name}': +{added} ~{changed} -{removed} rows")
+
     logging.debug(f"Parsed sections: {list(sections.keys())}")
     logging.debug(f"Colima Status content length: {len(sections.get('Colima Status', ''))}")
     logging.debug(f"Active Pods content length: {len(sections.get('Active Pods', ''))}")
 
+def observe_complete_snapshots(count):
+    """Feeds the last 'count' complete snapshots of the source script to the alert rules."""
+    if alert_engine is None or count <= 0:
+        return
+    for snapshot in list(snapshot_buffer.history)[-count:]:
+        alert_engine.observe_snapshot(alert_index, snapshot)
+
+def index_section(section_name, text):
+    """Updates the drilldown index of a section built in full by the monitor (events, probes,
+    storage) and feeds its changed rows to the alert rules."""
+    added, changed, removed = section_index.update(section_name, text)
+    if alert_engine and (added or changed or removed):
+        alert_engine.observe(section_name, section_index.delta(section_name))
+    return added, changed, removed
+
+def drilldown_active():
+    """True when any drilldown filter is set."""
+    return any(value is not None for value in drilldown_filter.values())
+
+def drilldown_label():
+    """Short human-readable description of the active drilldown filters."""
+    parts = []
+    for field in ("namespace", "node", "status", "text"):
+        value = drilldown_filter[field]
+        if value is None:
+            continue
+        if value == PROBLEM_FILTER:
+            value = "problems"
+        parts.append(f"{field}={value}")
+    return " ".join(parts)
+
+def filtered_section_content(content_key):
+    """Returns a section's content restricted to the rows matching the drilldown filters."""
+    return "\n".join(section_index.query(content_key, **drilldown_filter))
+
+def cycle_drilldown_value(section_key, field):
+    """Advances a drilldown filter to the next indexed value of the current section (None wraps)."""
+    keys = [section_key]
+    if section_key == "Kubernetes Nodes":
+        keys.append("Node Resource Usage")
+    values = sorted({value for key in keys for value in section_index.values(key, field)})
+    current = drilldown_filter[field]
+    if not values:
+        drilldown_filter[field] = None
+    elif current not in values:
+        drilldown_filter[field] = values[0] if current is None or current == PROBLEM_FILTER else None
+    else:
+        position = values.index(current) + 1
+        drilldown_filter[field] = values[position] if position < len(values) else None
+    logging.info(f"Drilldown {field} -> {drilldown_filter[field]}")
+
+def prompt_input(stdscr, prompt):
+    """Reads one line of input on the bottom line of the screen."""
+    max_y, max_x = stdscr.getmaxyx()
+    raw = b""
+    try:
+        stdscr.move(max_y - 1, 0)
+        stdscr.clrtoeol()
+        stdscr.addstr(max_y - 1, 0, prompt, curses.A_BOLD)
+        curses.echo()
+        curses.curs_set(1)
+        stdscr.nodelay(False)
+        raw = stdscr.getstr(max_y - 1, len(prompt), max(1, max_x - len(prompt) - 1))
+    except curses.error:
+        pass
+    finally:
+        curses.noecho()
+        curses.curs_set(0)
+        stdscr.nodelay(True)
+    return raw.decode("utf-8", errors="replace").strip() if raw else ""
+
+def prompt_substring_filter(stdscr):
+    """Reads a substring filter from the bottom line of the screen."""
+    drilldown_filter["text"] = prompt_input(stdscr, "filter: ") or None
+    logging.info(f"Drilldown text -> {drilldown_filter['text']}")
+
+def search_history(stdscr):
+    """Prompts for a query and pins the "Search Results" section; the search runs on the index thread."""
+    global pinned_section, history_index
+    query = prompt_input(stdscr, "search history: ")
+    if not query:
+        return
+    if history_index is None:
+        history_index = IndexWorker(PERSISTENT_LOG_PATH).start()
+    history_index.submit(query)
+    logging.info(f"History search '{query}' submitted")
+    refresh_search_section()
+    pinned_section = "Search Results"
+
 
 def type_text_to_window(win, text, color_pair, delay_sec):
     """Prints text character by character to a curses window with a delay."""
@@ -213,7 +420,7 @@ def type_text_to_window(win, text, color_pair, delay_sec):
             win.addch(char)
             # win.noutrefresh() # Mark for update, but don't force screen redraw yet
             # curses.doupdate() # Perform all pending updates
-            time.sleep(delay_sec)
+            clock.sleep(delay_sec)
         except curses.error:
             # Handle cases where addch tries to write outside window bounds
             break
@@ -229,10 +436,12 @@ def draw_box(win, color_pair):
         logging.warning(f"Could not draw box for window at {win.getbegyx()}, {win.getmaxyx()} due to curses error. Skipping box.")
         pass # Ignore error if window is too small for a box
 
-def draw_section_content_matrix_style(win, title, content_key, color_title_pair, color_content_pair, color_highlight_pair, color_dim_pair):
+def draw_section_content_matrix_style(win, title, content_key, color_title_pair, color_content_pair, color_highlight_pair, color_dim_pair, delay_sec=None, color_warning_pair=None, color_failing_pair=None):
     """
     Displays a section's content with matrix-like flow, key/value isolation,
     and adaptive word wrapping within a single main window.
+    delay_sec overrides the per-character typing delay (0 draws instantly).
+    Warning/failing status words use their own pairs (default: the highlight pair).
     """
     win_height, win_width = win.getmaxyx()
     win.clear() # Clear the window content before drawing new data
@@ -247,23 +456,31 @@ def draw_section_content_matrix_style(win, title, content_key, color_title_pair,
     content_max_width = win_width - 2
 
     if content_max_height <= 0 or content_max_width <= 0:
-        win.noutrefresh()
-        curses.doupdate()
+        win.noutrefresh() # draw_main_screen performs the single doupdate() per tick
         return # No space for content
 
-    display_content = sections.get(content_key, "").strip()
+    display_content = extra_sections.get(content_key, sections.get(content_key, "")).strip()
     if content_key == "Kubernetes Nodes": # Special combined section for display
         display_content = sections.get("Kubernetes Nodes", "").strip()
         if sections.get("Node Resource Usage", "").strip():
              display_content += "\n\n" + sections.get("Node Resource Usage", "").strip()
 
+    if drilldown_active() and content_key in section_index.sections:
+        # Served from the secondary indexes, no re-parse of the section text
+        display_content = filtered_section_content(content_key)
+        if content_key == "Kubernetes Nodes":
+            usage = filtered_section_content("Node Resource Usage")
+            if usage:
+                display_content = (display_content + "\n\n" + usage).strip()
+        title = f"{title} [{drilldown_label()}]"
+
 
     # Apply a typing delay that ensures the content streams over the UPDATE_INTERVAL_SEC
     total_chars_in_display_area = 0
     
     # First, filter Colima INFO lines if applicable
     processed_lines_for_display = []
-    if title == "Colima Status":
+    if content_key == "Colima Status":
         for line in display_content.splitlines():
             if not re.match(r"^(INFO|time)=\[[0-9]{4}\].*$", line): # Filter INFO and time= lines from Colima status
                 processed_lines_for_display.append(line.strip())
@@ -287,7 +504,9 @@ def draw_section_content_matrix_style(win, title, content_key, color_title_pair,
                 current_segment = current_segment[cut_point:].lstrip()
     
     # Calculate delay per char
-    if total_chars_in_display_area > 0:
+    if delay_sec is not None:
+        actual_delay_per_char = delay_sec
+    elif total_chars_in_display_area > 0:
         # Use the fixed typing delay as requested, instead of dynamically calculating
         actual_delay_per_char = random.uniform(CHAR_PRINT_MIN_DELAY_SEC, CHAR_PRINT_MAX_DELAY_SEC)
     else:
@@ -311,8 +530,7 @@ def draw_section_content_matrix_style(win, title, content_key, color_title_pair,
             win.addstr(current_content_row, content_start_x, "No data available...", curses.A_DIM | color_dim_pair)
         except curses.error:
             pass
-        win.noutrefresh()
-        curses.doupdate()
+        win.noutrefresh() # draw_main_screen performs the single doupdate() per tick
         return
 
     # Now, process lines for actual display with highlighting and wrapping
@@ -357,8 +575,12 @@ def draw_section_content_matrix_style(win, title, content_key, color_title_pair,
                     current_word_color = color_content_pair # Default
                     
                     # Check for specific patterns/keywords
-                    if word in ["Running", "Ready", "Terminating", "Error", "Pending", "CrashLoopBackOff", "Completed"]:
+                    if word in HEALTHY_STATUS_WORDS:
                         current_word_color = color_highlight_pair # Neon Green
+                    elif word in FAILING_STATUS_WORDS:
+                        current_word_color = color_failing_pair if color_failing_pair is not None else color_highlight_pair # Cyber Red
+                    elif word in WARNING_STATUS_WORDS:
+                        current_word_color = color_warning_pair if color_warning_pair is not None else color_highlight_pair # Cyber Orange
                     elif re.match(r"^\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}$", word): # Basic IP regex
                         current_word_color = color_highlight_pair # Neon Green
                     elif re.match(r"^\d+m$", word) or re.match(r"^\d+Mi$", word) or word.endswith('%'): # CPU/Memory usage (e.g., 230m, 1466Mi, 2%)
@@ -385,6 +607,89 @@ def draw_section_content_matrix_style(win, title, content_key, color_title_pair,
 
     win.noutrefresh() # Mark for update
 
+def compute_tile_grid(height, width, count):
+    """Splits the data area into at most 'count' panes of at least MIN_PANE_LINES x MIN_PANE_COLS."""
+    if count <= 0 or height <= 0 or width <= 0:
+        return []
+    cols = max(1, min(count, width // MIN_PANE_COLS))
+    max_rows = max(1, height // MIN_PANE_LINES)
+    panes = min(count, cols * max_rows)
+    rows = -(-panes // cols) # ceil
+    cols = -(-panes // rows) # rebalance so the last row is not mostly empty
+    tiles = []
+    for i in range(panes):
+        row, col = divmod(i, cols)
+        y0, y1 = row * height // rows, (row + 1) * height // rows
+        x0, x1 = col * width // cols, (col + 1) * width // cols
+        tiles.append((y0, x0, y1 - y0, x1 - x0))
+    return tiles
+
+def drilldown_target():
+    """Section the drilldown keys act on: the one in the rotating panel, highlighted when tiled."""
+    return SECTION_CYCLE_ORDER[current_cycle_index % len(SECTION_CYCLE_ORDER)]
+
+def pane_signature(section_key, geometry, is_target=False):
+    """What a pane would show; equal signatures mean the pane can be left untouched."""
+    content = extra_sections.get(section_key, sections.get(section_key, ""))
+    if section_key == "Kubernetes Nodes":
+        content += "\0" + sections.get("Node Resource Usage", "")
+    return (hash(content), drilldown_label(), geometry, is_target)
+
+def draw_tiled_panes(start_y, height, width, colors, status_colors=(None, None)):
+    """
+    Tiled layout: every visible section has its own window and is redrawn only
+    when its content, the filters, its geometry or the drilldown target changed
+    (or after a resize / layout switch). Panes only mark themselves with
+    noutrefresh(); the caller does the one doupdate(). The drilldown target is
+    drawn in the highlight colour; a pinned section such as "Search Results"
+    gets the first pane.
+    """
+    order = SECTION_CYCLE_ORDER
+    pinned = [pinned_section] if pinned_section and pinned_section not in order else []
+    tiles = compute_tile_grid(height, width, len(pinned) + len(order))
+    slots = max(0, len(tiles) - len(pinned))
+    # If not every section fits, the visible set rotates with the cycle index
+    offset = current_cycle_index if slots < len(order) else 0
+    visible = pinned + [order[(offset + i) % len(order)] for i in range(slots)]
+    for section_key in list(pane_windows):
+        if section_key not in visible:
+            del pane_windows[section_key]
+            pane_signatures.pop(section_key, None)
+    force = getattr(draw_tiled_panes, 'force_redraw', False)
+    target = drilldown_target()
+    redrawn = 0
+    for section_key, (y, x, h, w) in zip(visible, tiles):
+        geometry = (start_y + y, x, h, w)
+        is_target = section_key == target
+        signature = pane_signature(section_key, geometry, is_target)
+        if pane_signatures.get(section_key) == signature and not force:
+            continue
+        win = pane_windows.get(section_key)
+        if win is None or (win.getbegyx() + win.getmaxyx()) != geometry:
+            win = pane_windows[section_key] = render_backend.newwin(h, w, start_y + y, x)
+        title, pane_colors = section_key, colors
+        if is_target:
+            title, pane_colors = f"{section_key} <n/o/s/p>", (colors[2],) + tuple(colors[1:])
+        draw_section_content_matrix_style(win, title, section_key, *pane_colors, delay_sec=0,
+                                          color_warning_pair=status_colors[0], color_failing_pair=status_colors[1])
+        pane_signatures[section_key] = signature
+        redrawn += 1
+    draw_tiled_panes.force_redraw = False
+    draw_main_screen.force_content_redraw = False # Only meaningful to the single panel
+    if redrawn:
+        logging.debug(f"Tiled layout: redrew {redrawn}/{len(tiles)} panes")
+
+def toggle_layout():
+    """Switches between the rotating single panel and the tiled layout."""
+    global layout_mode
+    layout_mode = "tiled" if layout_mode == "single" else "single"
+    pane_windows.clear()
+    pane_signatures.clear()
+    draw_main_screen.last_max_y = None # Forces a full clear on the next draw
+    draw_main_screen.force_content_redraw = True
+    draw_tiled_panes.force_redraw = True
+    logging.info(f"Layout switched to {layout_mode}.")
+
 def draw_main_screen(stdscr):
     """
     Calculates layout, draws static header/footer, and triggers dynamic content
@@ -458,8 +763,10 @@ def draw_main_screen(stdscr):
         header_offset = 1
 
     # --- Header Area (ASCII Title and Timestamp) ---
-    # Generate ASCII art dynamically using the 'art' library
-    ascii_title_lines = [line for line in art.text2art(ASCII_TITLE_TEXT, font=ART_TITLE_FONT).splitlines() if line.strip()]
+    # Generate ASCII art using the 'art' library (once; it never changes)
+    if not hasattr(draw_main_screen, 'ascii_title_lines'):
+        draw_main_screen.ascii_title_lines = [line for line in art.text2art(ASCII_TITLE_TEXT, font=ART_TITLE_FONT).splitlines() if line.strip()]
+    ascii_title_lines = draw_main_screen.ascii_title_lines
 
     ascii_title_height = len(ascii_title_lines)
     header_pad = 2
@@ -505,43 +812,50 @@ def draw_main_screen(stdscr):
             pass
         return
 
-    # Create or resize the main content window
-    global main_content_win
-    if main_content_win is None:
-        main_content_win = curses.newwin(main_panel_height, main_panel_width, main_panel_start_y, 0)
+    if layout_mode == "tiled":
+        stdscr.noutrefresh() # Flush the header first so its touched lines cannot overwrite the panes
+        draw_tiled_panes(main_panel_start_y, main_panel_height, main_panel_width,
+                         (COLOR_CYBER_BLUE_PAIR, COLOR_DEFAULT_PAIR, COLOR_CYBER_GREEN_HIGHLIGHT_PAIR, COLOR_CYBER_PURPLE_DIM_PAIR),
+                         (COLOR_CYBER_ORANGE_PAIR, COLOR_CYBER_RED_PAIR))
     else:
-        try:
-            main_content_win.resize(main_panel_height, main_panel_width)
-            main_content_win.mvwin(main_panel_start_y, 0)
-        except curses.error as e:
-            logging.error(f"Error resizing main_content_win: {e}. Attempting to recreate window.")
-            main_content_win = curses.newwin(main_panel_height, main_panel_width, main_panel_start_y, 0)
+        # Create or resize the main content window
+        if main_content_win is None:
+            main_content_win = render_backend.newwin(main_panel_height, main_panel_width, main_panel_start_y, 0)
+        else:
+            try:
+                main_content_win.resize(main_panel_height, main_panel_width)
+                main_content_win.mvwin(main_panel_start_y, 0)
+            except curses.error as e:
+                logging.error(f"Error resizing main_content_win: {e}. Attempting to recreate window.")
+                main_content_win = render_backend.newwin(main_panel_height, main_panel_width, main_panel_start_y, 0)
 
-    # Determine which section to display in the main panel based on current_cycle_index
-    try:
-        current_section_title = SECTION_CYCLE_ORDER[current_cycle_index % len(SECTION_CYCLE_ORDER)]
-    except ZeroDivisionError:
-        current_section_title = "No Data Configured"
-        logging.error("SECTION_CYCLE_ORDER is empty!")
+        # Determine which section to display in the main panel based on current_cycle_index
+        try:
+            current_section_title = pinned_section or SECTION_CYCLE_ORDER[current_cycle_index % len(SECTION_CYCLE_ORDER)]
+        except ZeroDivisionError:
+            current_section_title = "No Data Configured"
+            logging.error("SECTION_CYCLE_ORDER is empty!")
         
-    # Only redraw/re-type the content if the section has changed OR the data has changed
-    # (The main loop will set a flag if data has changed)
-    # This prevents re-typing the same content over and over.
-    if current_section_title != last_drawn_section_title or \
-       getattr(draw_main_screen, 'force_content_redraw', False): # Check the force redraw flag from main loop
+        # Only redraw/re-type the content if the section has changed OR the data has changed
+        # (The main loop will set a flag if data has changed)
+        # This prevents re-typing the same content over and over.
+        if current_section_title != last_drawn_section_title or \
+           getattr(draw_main_screen, 'force_content_redraw', False): # Check the force redraw flag from main loop
         
-        logging.info(f"Redrawing main content window for: {current_section_title}")
-        draw_section_content_matrix_style(
-            main_content_win,
-            current_section_title,
-            current_section_title, # Content key is often same as title for simplicity
-            COLOR_CYBER_BLUE_PAIR,
-            COLOR_DEFAULT_PAIR,
-            COLOR_CYBER_GREEN_HIGHLIGHT_PAIR,
-            COLOR_CYBER_PURPLE_DIM_PAIR
-        )
-        last_drawn_section_title = current_section_title
-        draw_main_screen.force_content_redraw = False # Reset flag after drawing
+            logging.info(f"Redrawing main content window for: {current_section_title}")
+            draw_section_content_matrix_style(
+                main_content_win,
+                current_section_title,
+                current_section_title, # Content key is often same as title for simplicity
+                COLOR_CYBER_BLUE_PAIR,
+                COLOR_DEFAULT_PAIR,
+                COLOR_CYBER_GREEN_HIGHLIGHT_PAIR,
+                COLOR_CYBER_PURPLE_DIM_PAIR,
+                color_warning_pair=COLOR_CYBER_ORANGE_PAIR,
+                color_failing_pair=COLOR_CYBER_RED_PAIR
+            )
+            last_drawn_section_title = current_section_title
+            draw_main_screen.force_content_redraw = False # Reset flag after drawing
 
     # --- Footer Area ---
     footer_row = max_y - footer_height + 1
@@ -563,12 +877,210 @@ def draw_main_screen(stdscr):
         pass
 
     stdscr.noutrefresh() # Mark main screen for update (only for static elements)
-    curses.doupdate() # Perform all pending updates from all windows and main screen
+    render_backend.doupdate() # Perform all pending updates from all windows and main screen
+
+
+def refresh_event_section():
+    """Copies the (rate-limited) event render into the "Cluster Events" section. True if it changed."""
+    if event_stream is None:
+        return False
+    lines = event_stream.aggregator.render_lines()
+    if event_stream.error:
+        lines = [f"Events stream error: {event_stream.error}"] + lines
+    text = "\n".join(lines)
+    if text == extra_sections.get("Cluster Events"):
+        return False
+    extra_sections["Cluster Events"] = text
+    index_section("Cluster Events", text)
+    return True
+
+def refresh_log_section():
+    """Copies the latest merged pod log lines into the "Pod Logs" section. True if it changed."""
+    if log_tail is None:
+        return False
+    last_version = getattr(refresh_log_section, "version", None)
+    if log_tail.version == last_version and "Pod Logs" in extra_sections:
+        return False
+    refresh_log_section.version = log_tail.version
+    width = stdscr.getmaxyx()[1] - 2 if stdscr else None
+    text = "\n".join(log_tail.render_lines(limit=100, width=width))
+    extra_sections["Pod Logs"] = text
+    return True
+
+def refresh_probe_section():
+    """Copies the probe results into the "Ingress Health" section. True if they changed."""
+    if prober is None:
+        return False
+    last_version = getattr(refresh_probe_section, "version", None)
+    if prober.version == last_version and "Ingress Health" in extra_sections:
+        return False
+    refresh_probe_section.version = prober.version
+    text = "\n".join(prober.render_lines())
+    extra_sections["Ingress Health"] = text
+    index_section("Ingress Health", text)
+    return True
+
+def refresh_storage_section():
+    """Copies the latest storage scan into the "PVC Storage" section. True if it changed."""
+    if storage_scanner is None:
+        return False
+    last_version = getattr(refresh_storage_section, "version", None)
+    if storage_scanner.version == last_version and "PVC Storage" in extra_sections:
+        return False
+    refresh_storage_section.version = storage_scanner.version
+    text = "\n".join(storage_scanner.render_lines())
+    extra_sections["PVC Storage"] = text
+    index_section("PVC Storage", text)
+    return True
+
+def note_section_change(section):
+    """Wakes the governor if a refreshed section changed beyond its volatile columns."""
+    if change_detector.changed(section, extra_sections.get(section, "")):
+        governor.note_change()
+
+def refresh_search_section():
+    """Copies the index worker's report into the "Search Results" section. True if it changed."""
+    if history_index is None:
+        return False
+    last_version = getattr(refresh_search_section, "version", None)
+    if history_index.version == last_version and "Search Results" in extra_sections:
+        return False
+    refresh_search_section.version = history_index.version
+    if history_index.query is None:
+        return False
+    extra_sections["Search Results"] = "\n".join(history_index.render_lines())
+    return True
+
+def refresh_alert_section():
+    """Runs due alert timers and copies the alerts into the "Alerts" section. True if they changed."""
+    if alert_engine is None:
+        return False
+    alert_engine.tick()
+    last_version = getattr(refresh_alert_section, "version", None)
+    if alert_engine.version == last_version and "Alerts" in extra_sections:
+        return False
+    refresh_alert_section.version = alert_engine.version
+    extra_sections["Alerts"] = "\n".join(alert_engine.render_lines())
+    return True
+
+def log_retained_sizes():
+    """Writes the size of every long-lived buffer to the debug log (they must stay flat over time)."""
+    parts = [
+        f"snapshots={len(snapshot_buffer.history)}/{snapshot_buffer.history.maxlen} ({snapshot_buffer.retained_chars()} chars, {snapshot_buffer.snapshots} seen)",
+        f"capture={capture_file.size if capture_file else 0}/{CAPTURE_MAX_BYTES} bytes ({capture_file.rotations if capture_file else 0} rotations)",
+        f"source_read={source_reader.bytes_read if source_reader else 0} bytes",
+        f"index_rows={sum(len(index.rows) for index in section_index.sections.values())}",
+        f"alert_index_rows={sum(len(index.rows) for index in alert_index.sections.values())}",
+        f"extra_sections={sum(len(text) for text in extra_sections.values())} chars",
+    ]
+    if event_stream:
+        parts.append(f"event_groups={len(event_stream.aggregator.groups)}/{event_stream.aggregator.max_entries}")
+    if log_tail:
+        parts.append(f"log_lines={len(log_tail.merged)}/{log_tail.merged.maxlen}")
+    index = history_index.index if history_index else None
+    if index is not None: # Owned by the worker thread; only sizes are read
+        parts.append(f"history_index={len(index.snapshots)} snapshots ({index.snapshots.nbytes()} bytes), "
+                     f"{len(index.terms)} terms, {index.pending_bytes}/{index.max_pending_bytes} pending posting bytes")
+    if alert_engine:
+        parts.append(f"alerts={len(alert_engine.firing)} firing, {sum(len(r.state) for rules in alert_engine.rules_by_section.values() for r in rules)} rule keys")
+    try:
+        import resource
+        parts.append(f"max_rss={resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}") # KiB on Linux, bytes on macOS
+    except ImportError:
+        pass
+    logging.debug("Retained: " + "  ".join(parts))
+
+def ndjson_record(snapshot, section, text, started):
+    """NDJSON record for a section: parsed rows, content hash and timings."""
+    record = {
+        "type": "section",
+        "snapshot": snapshot,
+        "section": section,
+        "ts": round(started, 3),
+        "elapsed_ms": round((time.time() - started) * 1000, 2),
+    }
+    record.update(table_record(text.strip()))
+    return record
+
+def write_ndjson(out, record):
+    out.write(json.dumps(record, separators=(",", ":")) + "\n")
+    out.flush()
+
+def snapshot_ndjson(out=None, timeout_sec=30):
+    """
+    Headless one-shot export (--ndjson --once): runs the section commands of
+    colima-k8s-persistent.sh directly and emits one record per section. The
+    lifecycle script is never started here: stopping it stops the cluster.
+    """
+    out = out or sys.stdout
+    snapshot = time.strftime("%a %b %d %H:%M:%S %Z %Y") # Same format as the script's `date`
+    for section, command in SECTION_COMMANDS.items():
+        started = time.time()
+        try:
+            result = subprocess.run(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                    text=True, timeout=timeout_sec)
+            text = result.stdout if result.returncode == 0 else f"{result.stdout}\n'{command}' failed (exit {result.returncode})"
+        except subprocess.TimeoutExpired:
+            text = f"'{command}' timed out after {timeout_sec}s"
+        write_ndjson(out, ndjson_record(snapshot, section, text, started))
+    logging.info("NDJSON snapshot finished.")
 
+def ingest_ndjson(only_changed=False, out=None, log_path=None, poll_sec=0.5):
+    """
+    Headless ingest: follows the persistent log of colima-k8s-persistent.sh
+    (across rotation) and emits one NDJSON record per section per cycle
+    (parsed rows, content hash, timings). The script itself is never started
+    or signalled here: its exit handler drains and stops the cluster, so a
+    consumer restarting (broken pipe) or Ctrl+C must not touch it.
+    """
+    out = out or sys.stdout
+    log_path = log_path or PERSISTENT_LOG_PATH
+    follower = LogFollower(log_path)
+    logging.info(f"NDJSON ingest following {log_path}")
+    last_hashes = {}
+    snapshot = None
+    section_name = None
+    section_lines = []
+    section_started = time.time()
+    partial = ""
+
+    def emit_section():
+        record = ndjson_record(snapshot, section_name, "\n".join(section_lines), section_started)
+        if only_changed and last_hashes.get(section_name) == record["hash"]:
+            return
+        last_hashes[section_name] = record["hash"]
+        write_ndjson(out, record)
+
+    try:
+        while True:
+            text = follower.read_available()
+            if not text:
+                time.sleep(poll_sec)
+                continue
+            lines = (partial + text).split("\n")
+            partial = lines.pop() # Wait for the rest of the line
+            for line in lines:
+                snapshot_match = SNAPSHOT_HEADER.match(line)
+                section_match = SECTION_HEADER.match(line)
+                if (snapshot_match or section_match) and snapshot is not None and section_name:
+                    emit_section()
+                    section_name = None
+                if snapshot_match:
+                    snapshot = snapshot_match.group(1).strip()
+                elif section_match and snapshot is not None:
+                    section_name = section_match.group(1).strip()
+                    section_lines = []
+                    section_started = time.time()
+                elif section_name:
+                    section_lines.append(line)
+    finally:
+        follower.close()
+        logging.info("NDJSON ingest finished.")
 
 def main(stdscr_instance):
-    global stdscr, source_process, temp_output_file, last_full_output, current_cycle_index
+    global stdscr, source_process, source_reader, capture_file, current_cycle_index, render_backend, pinned_section, event_stream, log_tail, governor, prober, storage_scanner, alert_engine, history_index
     stdscr = stdscr_instance
+    render_backend = CursesBackend(stdscr)
 
     logging.info("Main function started.")
 
@@ -585,17 +1097,38 @@ def main(stdscr_instance):
     # Initial "Initializing..." message
     logging.info("Starting source script subprocess setup.")
     try:
-        temp_output_file = open("/tmp/k8s_monitor_output.tmp", "w+", encoding='utf-8')
+        capture_file = RotatingCapture(CAPTURE_PATH, max_bytes=CAPTURE_MAX_BYTES)
         logging.info(f"Source script path: {SOURCE_SCRIPT_PATH}")
         source_process = subprocess.Popen(
             [SOURCE_SCRIPT_PATH],
-            stdout=temp_output_file,
+            stdout=subprocess.PIPE, # Read with select(); nothing accumulates on our side
             stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1, # Line-buffered
-            universal_newlines=True
+            bufsize=0
         )
+        source_reader = PipeReader(source_process.stdout)
         logging.info(f"Source script PID: {source_process.pid}")
+
+        rules, rule_errors = load_rules(ALERT_RULES_PATH)
+        for error in rule_errors:
+            logging.error(f"Alert rules: {error}")
+        alert_engine = AlertEngine(rules, rule_errors)
+
+        # Events are streamed separately; redraws are limited to one per update interval
+        event_stream = EventStream(EventAggregator(render_interval_sec=UPDATE_INTERVAL_SEC)).start()
+        if LOG_TAIL_NAMESPACE or LOG_TAIL_SELECTOR:
+            log_tail = LogTail(namespace=LOG_TAIL_NAMESPACE, selector=LOG_TAIL_SELECTOR).start()
+            SECTION_CYCLE_ORDER.insert(1, "Pod Logs")
+        if PROBES_ENABLED:
+            # Hosts come from the INGRESS Status section after each parse
+            prober = Prober(max_hosts=PROBE_MAX_HOSTS, interval_sec=UPDATE_INTERVAL_SEC).start()
+        else:
+            SECTION_CYCLE_ORDER.remove("Ingress Health")
+        if STORAGE_PATH:
+            storage_scanner = StorageScanner(STORAGE_PATH, interval_sec=STORAGE_SCAN_INTERVAL_SEC).start()
+        else:
+            SECTION_CYCLE_ORDER.remove("PVC Storage")
+        # The history index is built and kept current off the UI thread, ready for 'f'
+        history_index = IndexWorker(PERSISTENT_LOG_PATH).start()
         
         # Display initial message using curses
         stdscr.addstr(0, 0, "Initializing Cyber Kube Monitor... Waiting for initial data.", curses.A_BOLD)
@@ -622,10 +1155,18 @@ def main(stdscr_instance):
         return
 
     last_cycle_change_time = time.time() # Tracks when the section in the main panel last changed
+    last_memory_report = 0.0
+    last_snapshot_count = 0
+    governor = Governor(DISPLAY_REFRESH_RATE_SEC, IDLE_MAX_REFRESH_RATE_SEC, cpu_budget=CPU_BUDGET)
+    last_governor_level = 0
 
     running = True
     while running:
+        governor.begin_cycle()
+        stdscr.timeout(int(governor.interval() * 1000)) # Tick rate follows the governor
         char = stdscr.getch() # Non-blocking getch due to stdscr.timeout
+        if char != -1:
+            governor.note_activity() # Any key or resize snaps back to full speed
         if char == ord('q'):
             logging.info("'q' pressed. Exiting main loop.")
             running = False
@@ -633,24 +1174,92 @@ def main(stdscr_instance):
             logging.info("Terminal resize event detected. Forcing full redraw.")
             # When resized, force a full redraw, including re-typing current content
             draw_main_screen.force_content_redraw = True 
+            draw_tiled_panes.force_redraw = True # The screen was cleared under every pane
             # draw_main_screen will be called later in the loop.
+        elif char in (ord('n'), ord('o'), ord('s'), ord('p'), ord('/'), ord('c')):
+            current_section_key = drilldown_target()
+            if char == ord('n'):
+                cycle_drilldown_value(current_section_key, "namespace")
+            elif char == ord('o'):
+                cycle_drilldown_value(current_section_key, "node")
+            elif char == ord('s'):
+                cycle_drilldown_value(current_section_key, "status")
+            elif char == ord('p'):
+                # Toggle "problems only": resolved against the current statuses on every query
+                if drilldown_filter["status"] == PROBLEM_FILTER:
+                    drilldown_filter["status"] = None
+                else:
+                    drilldown_filter["status"] = PROBLEM_FILTER
+            elif char == ord('/'):
+                prompt_substring_filter(stdscr)
+            else:
+                for field in drilldown_filter:
+                    drilldown_filter[field] = None
+                pinned_section = None
+                logging.info("Drilldown filters cleared.")
+            draw_main_screen.force_content_redraw = True
+        elif char == ord('t'):
+            toggle_layout()
+        elif char == ord('f'):
+            search_history(stdscr)
+            last_cycle_change_time = time.time() # Keep the results up for a full interval
+            draw_main_screen.force_content_redraw = True
 
         current_time = time.time()
 
-        # Check for new data from the source script (updates global 'sections' dict)
-        temp_output_file.seek(0)
-        current_full_output = temp_output_file.read()
-        
-        if current_full_output != last_full_output:
+        # Check for new data from the source script (updates global 'sections' dict).
+        # Whatever the pipe holds is drained without blocking; only the latest
+        # snapshots are kept, so parsing cost does not grow with session length.
+        new_output = source_reader.read_available()
+        capture_file.write(new_output)
+        if snapshot_buffer.feed(new_output):
+            if snapshot_buffer.snapshots != last_snapshot_count:
+                # Only complete snapshots are compared; a section half-written is not a change
+                observe_complete_snapshots(snapshot_buffer.snapshots - last_snapshot_count)
+                last_snapshot_count = snapshot_buffer.snapshots
+                latest = split_sections(snapshot_buffer.latest().splitlines())
+                if change_detector.update({title: "\n".join(lines) for title, lines in latest}):
+                    governor.note_change()
             logging.info("New data detected. Parsing and forcing content redraw.")
-            last_full_output = current_full_output
-            parse_raw_output(current_full_output)
+            parse_raw_output(snapshot_buffer.text())
+            if prober:
+                prober.update_from_ingress(sections.get("INGRESS Status", ""))
             # When new data arrives, force re-typing of the current content
             draw_main_screen.force_content_redraw = True 
 
+        if refresh_event_section():
+            note_section_change("Cluster Events")
+            if last_drawn_section_title == "Cluster Events":
+                draw_main_screen.force_content_redraw = True
+        # Probe results change every round; re-type the pane at most once per update interval like the logs
+        if current_time - getattr(refresh_probe_section, "last_time", 0) >= UPDATE_INTERVAL_SEC:
+            refresh_probe_section.last_time = current_time
+            if refresh_probe_section() and last_drawn_section_title == "Ingress Health":
+                draw_main_screen.force_content_redraw = True
+        if refresh_alert_section():
+            note_section_change("Alerts")
+            if last_drawn_section_title == "Alerts":
+                draw_main_screen.force_content_redraw = True
+        if refresh_storage_section():
+            note_section_change("PVC Storage")
+            if last_drawn_section_title == "PVC Storage":
+                draw_main_screen.force_content_redraw = True
+        if refresh_search_section() and last_drawn_section_title == "Search Results":
+            draw_main_screen.force_content_redraw = True
+        # Log lines arrive continuously; re-type the pane at most once per update interval
+        if current_time - getattr(refresh_log_section, "last_time", 0) >= UPDATE_INTERVAL_SEC:
+            refresh_log_section.last_time = current_time
+            if refresh_log_section() and last_drawn_section_title == "Pod Logs":
+                draw_main_screen.force_content_redraw = True
+
+        if current_time - last_memory_report >= MEMORY_REPORT_INTERVAL_SEC:
+            last_memory_report = current_time
+            log_retained_sizes()
+
         # Cycle the displayed section only after UPDATE_INTERVAL_SEC has passed
         if current_time - last_cycle_change_time >= UPDATE_INTERVAL_SEC:
             current_cycle_index = (current_cycle_index + 1) % len(SECTION_CYCLE_ORDER)
+            pinned_section = None
             logging.info(f"Cycling to section: {SECTION_CYCLE_ORDER[current_cycle_index]}. Forcing content redraw.")
             last_cycle_change_time = current_time
             # When section cycles, force re-typing of the new content
@@ -658,16 +1267,62 @@ def main(stdscr_instance):
         
         # Always call draw_main_screen. It will decide if the content panel needs re-typing.
         draw_main_screen(stdscr)
+
+        if governor.level != last_governor_level:
+            logging.debug(f"Governor: {governor.describe()}")
+            last_governor_level = governor.level
+        throttle = governor.end_cycle()
+        if throttle:
+            clock.sleep(throttle) # Stay within CPU_BUDGET
             
     logging.info("Main loop finished.")
     cleanup()
 
 if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description="Cyber K8s Monitor (curses UI, or headless NDJSON ingest).")
+    arg_parser.add_argument("--ndjson", action="store_true",
+                            help="Headless: follow the persistent log and emit one NDJSON record per section per cycle instead of the curses UI.")
+    arg_parser.add_argument("--once", action="store_true",
+                            help="With --ndjson: run the section commands once, emit one snapshot and exit (the cluster script is not started).")
+    arg_parser.add_argument("--only-changed", action="store_true",
+                            help="With --ndjson: only emit sections whose content hash changed.")
+    arg_parser.add_argument("--tiled", action="store_true",
+                            help="Start in the tiled layout (one pane per section) instead of the rotating panel.")
+    arg_parser.add_argument("--cpu-budget", type=float, default=None,
+                            help="Cap CPU use per loop cycle as a fraction of one core (e.g. 0.05).")
+    arg_parser.add_argument("--no-probes", action="store_true",
+                            help="Do not probe the ingress hosts (hides the 'Ingress Health' section).")
+    arg_parser.add_argument("--probe-max-hosts", type=int, default=PROBE_MAX_HOSTS,
+                            help="Ingress hosts probed per round; more hosts are covered over several rounds.")
+    arg_parser.add_argument("--storage-path", default=STORAGE_PATH,
+                            help="Root of the PVC folders for the 'PVC Storage' section (default: K8S_POD_STORAGE_PATH).")
+    arg_parser.add_argument("--logs-namespace", default=None,
+                            help="Enable the 'Pod Logs' pane for pods in this namespace.")
+    arg_parser.add_argument("--logs-selector", default=None,
+                            help="Enable the 'Pod Logs' pane for pods matching this label selector (all namespaces unless --logs-namespace).")
+    cli_args = arg_parser.parse_args()
+    LOG_TAIL_NAMESPACE = cli_args.logs_namespace
+    LOG_TAIL_SELECTOR = cli_args.logs_selector
+    CPU_BUDGET = cli_args.cpu_budget
+    PROBES_ENABLED = not cli_args.no_probes
+    PROBE_MAX_HOSTS = cli_args.probe_max_hosts
+    STORAGE_PATH = os.path.expanduser(cli_args.storage_path) if cli_args.storage_path else None
+    if cli_args.tiled:
+        layout_mode = "tiled"
     try:
-        curses.wrapper(main)
+        if cli_args.ndjson:
+            if cli_args.once:
+                snapshot_ndjson()
+            else:
+                ingest_ndjson(only_changed=cli_args.only_changed)
+        else:
+            curses.wrapper(main)
     except KeyboardInterrupt:
         logging.info("KeyboardInterrupt (Ctrl+C) detected outside curses.wrapper.")
         pass
+    except BrokenPipeError:
+        logging.info("NDJSON consumer went away.")
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno()) # No second error when stdout is flushed at exit
     except Exception as e:
         logging.critical(f"Unhandled exception outside curses.wrapper: {e}", exc_info=True)
         sys.exit(1)
@@ -679,6 +1334,6 @@ if __name__ == '__main__':
             if source_process and source_process.poll() is None:
                 try: source_process.terminate()
                 except: pass
-            if temp_output_file and os.path.exists(temp_output_file.name):
-                try: temp_output_file.close(); os.remove(temp_output_file.name)
+            if capture_file:
+                try: capture_file.close(remove=True)
                 except: pass
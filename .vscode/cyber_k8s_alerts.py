@@ -0,0 +1,381 @@
+# ==============================================================================
+# Cyber K8s Alerts - Declarative alert rules evaluated on snapshot deltas
+# ==============================================================================
+# Shared helpers for the Cyber K8s tools. Rules come from a small YAML file
+# (cyber-k8s-alert-rules.yaml) and are compiled once into rule objects. Each
+# rule watches one section and only sees the rows that were added, changed or
+# removed since the previous snapshot (SectionIndex.delta), keeping a small
+# state entry per row key. Conditions that depend on time or on the number of
+# snapshots ("for 5 minutes", "for 3 cycles") are handled with timer heaps, so
+# unchanged rows cost nothing: evaluation grows with churn, not cluster size.
+# The monitor feeds complete snapshots only (observe_snapshot), so a section
+# read while the source script is still writing it never fires or resolves.
+#
+# Rule kinds:
+# - restarts:    RESTARTS grew by more than 'increase' within 'window_min'
+# - not_ready:   READY x/y below y (or STATUS unhealthy) for 'for_min'
+# - above:       numeric 'field' above 'threshold' for 'cycles' snapshots
+#                ('CPU(%)' and 'CPU%' name the same column)
+# - disappeared: a row vanished and stayed gone for 'grace_cycles' snapshots
+# ==============================================================================
+
+import heapq
+import logging
+import os
+import re
+import time
+from collections import OrderedDict, deque
+
+from cyber_k8s_events import format_age
+from cyber_k8s_index import HEALTHY_STATUSES, SECTION_HEADER, format_table, split_sections
+
+try:
+    import yaml
+except ImportError: # The monitor itself only needs 'art'; fall back to the built-in rules
+    yaml = None
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cyber-k8s-alert-rules.yaml")
+
+# Used when the rule file is missing or PyYAML is not installed
+DEFAULT_RULE_SPECS = [
+    {"name": "pod-restarts", "kind": "restarts", "section": "Active Pods", "increase": 3, "window_min": 10},
+    {"name": "pod-not-ready", "kind": "not_ready", "section": "Active Pods", "for_min": 5},
+    {"name": "node-cpu-high", "kind": "above", "section": "Node Resource Usage", "field": "CPU(%)", "threshold": 80, "cycles": 3},
+    {"name": "ingress-gone", "kind": "disappeared", "section": "INGRESS Status"},
+]
+
+MAX_RESOLVED = 20          # Recently resolved alerts kept for display
+MAX_RESTART_SAMPLES = 32   # Restart counter samples kept per pod
+LEADING_NUMBER = re.compile(r"^-?\d+(?:\.\d+)?")
+
+
+def field_spellings(field):
+    """Both spellings of a percent column: kubectl top prints 'CPU(%)' or 'CPU%' depending on its version."""
+    if field.endswith("(%)"):
+        return (field, field[:-3] + "%")
+    if field.endswith("%"):
+        return (field, field[:-1] + "(%)")
+    return (field,)
+
+
+def parse_number(value):
+    """Leading number of a table cell ('45%', '230m', '3 (2m ago)'); None if there is none."""
+    match = LEADING_NUMBER.match((value or "").strip())
+    return float(match.group(0)) if match else None
+
+
+class Alert:
+    __slots__ = ("rule", "key", "severity", "message", "since", "resolved_at")
+
+    def __init__(self, rule, key, message, since):
+        self.rule = rule.name
+        self.key = key
+        self.severity = rule.severity
+        self.message = message
+        self.since = since
+        self.resolved_at = None
+
+
+class Rule:
+    """Base class: one compiled rule with per-row-key state."""
+    kind = None
+
+    def __init__(self, spec):
+        self.name = spec.get("name") or f"{self.kind}:{spec['section']}"
+        self.section = spec["section"]
+        self.severity = spec.get("severity", "warning")
+        namespace = spec.get("namespace")
+        self.namespace = re.compile(namespace) if namespace else None
+        self.state = {} # row key -> rule specific state
+
+    def applies(self, key, fields):
+        if fields is None and key not in self.state:
+            return False
+        return self.namespace is None or bool(self.namespace.fullmatch(key[0]))
+
+    def observe(self, engine, key, old, new):
+        """Called for a row that was added (old None), changed, or removed (new None)."""
+
+    def due(self, engine, key, token):
+        """Called when a timer scheduled by this rule expires."""
+
+
+class RestartsRule(Rule):
+    kind = "restarts"
+
+    def __init__(self, spec):
+        super().__init__(spec)
+        self.field = spec.get("field", "RESTARTS")
+        self.increase = int(spec.get("increase", 3))
+        self.window_sec = float(spec.get("window_min", 10)) * 60
+
+    def observe(self, engine, key, old, new):
+        if new is None:
+            self.state.pop(key, None)
+            engine.resolve(self, key)
+            return
+        restarts = parse_number(new.get(self.field))
+        if restarts is None:
+            return
+        samples = self.state.get(key)
+        if samples is None:
+            samples = self.state[key] = deque(maxlen=MAX_RESTART_SAMPLES)
+        if not samples or samples[-1][1] != restarts:
+            samples.append((engine.now, restarts))
+        self._evaluate(engine, key)
+
+    def _evaluate(self, engine, key):
+        samples = self.state.get(key)
+        if not samples:
+            return
+        cutoff = engine.now - self.window_sec
+        # The newest sample at or before the cutoff is the baseline for the window
+        while len(samples) > 1 and samples[1][0] <= cutoff:
+            samples.popleft()
+        grown = samples[-1][1] - samples[0][1]
+        if grown > self.increase:
+            engine.fire(self, key, f"restarts +{grown:.0f} in {self.window_sec / 60:.0f}m (now {samples[-1][1]:.0f})")
+            # Re-check once the oldest sample leaves the window, even if the row never changes again
+            engine.schedule_at(samples[1][0] + self.window_sec if len(samples) > 1 else engine.now + self.window_sec,
+                               self, key, None)
+        else:
+            engine.resolve(self, key)
+
+    def due(self, engine, key, token):
+        self._evaluate(engine, key)
+
+
+class NotReadyRule(Rule):
+    kind = "not_ready"
+
+    def __init__(self, spec):
+        super().__init__(spec)
+        self.for_sec = float(spec.get("for_min", 5)) * 60
+
+    @staticmethod
+    def not_ready(fields):
+        ready = (fields.get("READY") or "").split("/")
+        if len(ready) == 2 and ready[0].isdigit() and ready[1].isdigit() and int(ready[0]) < int(ready[1]):
+            return True
+        status = fields.get("STATUS")
+        return bool(status) and status not in HEALTHY_STATUSES
+
+    def observe(self, engine, key, old, new):
+        if new is None or not self.not_ready(new):
+            self.state.pop(key, None)
+            engine.resolve(self, key)
+            return
+        detail = f"READY {new.get('READY', '-')} STATUS {new.get('STATUS', '-')}"
+        state = self.state.get(key)
+        if state is None:
+            self.state[key] = [engine.now, detail]
+            engine.schedule_at(engine.now + self.for_sec, self, key, engine.now)
+        else:
+            state[1] = detail
+
+    def due(self, engine, key, token):
+        state = self.state.get(key)
+        if state is not None and state[0] == token: # Still the same not-ready streak
+            engine.fire(self, key, f"not Ready for {self.for_sec / 60:.0f}m ({state[1]})")
+
+
+class AboveRule(Rule):
+    kind = "above"
+
+    def __init__(self, spec):
+        super().__init__(spec)
+        self.field = spec["field"]
+        self.fields = field_spellings(self.field)
+        self.threshold = float(spec["threshold"])
+        self.cycles = max(1, int(spec.get("cycles", 1)))
+
+    def observe(self, engine, key, old, new):
+        value = None
+        if new is not None:
+            value = next((parse_number(new[field]) for field in self.fields if field in new), None)
+        if value is None or value <= self.threshold:
+            self.state.pop(key, None)
+            engine.resolve(self, key)
+            return
+        state = self.state.get(key)
+        if state is None:
+            start = engine.cycle + 1 # Counts the snapshot being observed
+            self.state[key] = [start, value]
+            engine.schedule_cycle(start + self.cycles - 1, self, key, start)
+        else:
+            state[1] = value
+
+    def due(self, engine, key, token):
+        state = self.state.get(key)
+        if state is not None and state[0] == token:
+            engine.fire(self, key, f"{self.field} {state[1]:g} > {self.threshold:g} for {self.cycles} cycles")
+
+
+class DisappearedRule(Rule):
+    kind = "disappeared"
+
+    def __init__(self, spec):
+        super().__init__(spec)
+        self.grace_cycles = int(spec.get("grace_cycles", 1)) # Rides out a section read mid-write
+
+    def observe(self, engine, key, old, new):
+        if new is not None:
+            self.state[key] = None # Known and present
+            engine.resolve(self, key)
+        elif key in self.state:
+            self.state[key] = engine.cycle + 1 + self.grace_cycles
+            engine.schedule_cycle(self.state[key], self, key, self.state[key])
+
+    def due(self, engine, key, token):
+        if self.state.get(key) == token:
+            del self.state[key] # Alert once; a row with the same key arms the rule again
+            engine.fire(self, key, f"disappeared from {self.section}")
+
+
+RULE_KINDS = {rule.kind: rule for rule in (RestartsRule, NotReadyRule, AboveRule, DisappearedRule)}
+
+
+def compile_rules(specs):
+    """(rules, errors): rule objects for valid specs, one message per invalid spec."""
+    rules, errors = [], []
+    for i, spec in enumerate(specs or []):
+        try:
+            rule_class = RULE_KINDS[spec["kind"]]
+            rules.append(rule_class(spec))
+        except KeyError as e:
+            errors.append(f"rule {i + 1}: missing or unknown {e} (kinds: {', '.join(RULE_KINDS)})")
+        except (TypeError, ValueError, re.error) as e:
+            errors.append(f"rule {i + 1}: {e}")
+    return rules, errors
+
+
+def load_rules(path=DEFAULT_RULES_PATH):
+    """(rules, errors) from the YAML rule file; the built-in rules when it cannot be used."""
+    if not os.path.isfile(path):
+        return compile_rules(DEFAULT_RULE_SPECS)
+    if yaml is None:
+        rules, errors = compile_rules(DEFAULT_RULE_SPECS)
+        return rules, [f"PyYAML not installed, using built-in rules instead of {os.path.basename(path)}"] + errors
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = yaml.safe_load(f) or {}
+    except (OSError, yaml.YAMLError) as e:
+        rules, errors = compile_rules(DEFAULT_RULE_SPECS)
+        return rules, [f"{os.path.basename(path)}: {e}"] + errors
+    return compile_rules(data.get("rules", []))
+
+
+class AlertEngine:
+    """Feeds section deltas to the rules and keeps the firing/resolved alerts."""
+
+    def __init__(self, rules, errors=None, clock=time.time):
+        self.rules_by_section = {}
+        for rule in rules:
+            self.rules_by_section.setdefault(rule.section, []).append(rule)
+        self.errors = list(errors or [])
+        self.clock = clock
+        self.now = clock()
+        self.cycle = 0
+        self.firing = OrderedDict()   # (rule name, key) -> Alert
+        self.resolved = deque(maxlen=MAX_RESOLVED)
+        self.version = 0
+        self.evaluations = 0
+        self._timers = []             # (due time, seq, rule, key, token)
+        self._cycle_timers = []       # (due cycle, seq, rule, key, token)
+        self._seq = 0
+
+    @property
+    def sections(self):
+        return list(self.rules_by_section)
+
+    # --- inputs ---
+    def observe(self, section, delta):
+        """Evaluates the rules of 'section' on the rows in delta [(key, old fields, new fields)]."""
+        rules = self.rules_by_section.get(section)
+        if not rules or not delta:
+            return
+        self.now = self.clock()
+        for key, old, new in delta:
+            if old is None and new is None:
+                continue # Free-form line, not a table row
+            for rule in rules:
+                if rule.applies(key, new):
+                    rule.observe(self, key, old, new)
+                    self.evaluations += 1
+
+    def observe_snapshot(self, index, text):
+        """Feeds one complete snapshot of colima-k8s-persistent.sh output through 'index' (a TableIndex
+        of the engine's own), then advances the cycle."""
+        for title, lines in split_sections(text.splitlines()):
+            if title not in self.rules_by_section:
+                continue
+            if lines and SECTION_HEADER.match(lines[0]):
+                lines = lines[1:]
+            index.update(title, "\n".join(lines).strip())
+            self.observe(title, index.delta(title))
+        self.advance_cycle()
+
+    def advance_cycle(self):
+        """A complete snapshot was observed; runs the cycle timers that are due."""
+        self.cycle += 1
+        self.now = self.clock()
+        while self._cycle_timers and self._cycle_timers[0][0] <= self.cycle:
+            _, _, rule, key, token = heapq.heappop(self._cycle_timers)
+            rule.due(self, key, token)
+
+    def tick(self):
+        """Runs the time-based timers that are due; O(1) when none is."""
+        if not self._timers or self._timers[0][0] > self.clock():
+            return
+        self.now = self.clock()
+        while self._timers and self._timers[0][0] <= self.now:
+            _, _, rule, key, token = heapq.heappop(self._timers)
+            rule.due(self, key, token)
+
+    # --- used by rules ---
+    def schedule_at(self, when, rule, key, token):
+        self._seq += 1
+        heapq.heappush(self._timers, (when, self._seq, rule, key, token))
+
+    def schedule_cycle(self, cycle, rule, key, token):
+        self._seq += 1
+        heapq.heappush(self._cycle_timers, (cycle, self._seq, rule, key, token))
+
+    def fire(self, rule, key, message):
+        alert = self.firing.get((rule.name, key))
+        if alert is not None:
+            if alert.message != message:
+                alert.message = message
+                self.version += 1
+            return
+        self.firing[(rule.name, key)] = Alert(rule, key, message, self.now)
+        self.version += 1
+        logging.warning(f"ALERT {rule.name} [{rule.severity}] {'/'.join(filter(None, key))}: {message}")
+
+    def resolve(self, rule, key):
+        alert = self.firing.pop((rule.name, key), None)
+        if alert is None:
+            return
+        alert.resolved_at = self.now
+        self.resolved.append(alert)
+        self.version += 1
+        logging.info(f"Resolved {rule.name} {'/'.join(filter(None, key))}")
+
+    # --- reading ---
+    def render_lines(self):
+        """Summary plus the firing and recently resolved alerts as one table."""
+        now = self.clock()
+        rule_count = sum(len(rules) for rules in self.rules_by_section.values())
+        lines = [f"Rules: {rule_count}  Firing: {len(self.firing)}  Snapshots: {self.cycle}  "
+                 f"Row evaluations: {self.evaluations}  Pending timers: {len(self._timers) + len(self._cycle_timers)}"]
+        lines.extend(f"Rule error: {error}" for error in self.errors)
+        lines.append("")
+        rows = [(alert.key[0] or "-", alert.key[1], "Firing", alert.severity, alert.rule,
+                 format_age(now - alert.since), alert.message) for alert in reversed(self.firing.values())]
+        rows += [(alert.key[0] or "-", alert.key[1], "Resolved", alert.severity, alert.rule,
+                  format_age(now - alert.resolved_at), alert.message) for alert in reversed(self.resolved)]
+        if not rows:
+            lines.append("No alerts.")
+            return lines
+        return lines + format_table(("NAMESPACE", "NAME", "STATUS", "SEVERITY", "RULE", "AGE", "MESSAGE"), rows)
+
@@ -0,0 +1,223 @@
+# ==============================================================================
+# Cyber K8s Buffers - Bounded memory and disk for long-running sessions
+# ==============================================================================
+# Shared helpers for the Cyber K8s tools. Everything here has a fixed budget,
+# so a session that runs for a week holds as much as one that ran a minute:
+#
+# - PipeReader: non-blocking reads of a subprocess pipe (select + os.read).
+# - LogFollower: the same for a log file written by someone else, followed
+#   across rotation like 'tail -F'.
+# - SnapshotBuffer: the snapshot being written plus a bounded deque of the
+#   latest complete snapshots ("=== <date> ===" blocks).
+# - RotatingCapture: an append-only capture file rotated by size.
+# - LRUCache: an OrderedDict capped by entry count.
+# ==============================================================================
+
+import codecs
+import os
+import select
+from collections import OrderedDict, deque
+
+from cyber_k8s_index import SNAPSHOT_HEADER
+
+DEFAULT_HISTORY_SNAPSHOTS = 4         # Complete snapshots kept in memory
+DEFAULT_CAPTURE_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_CAPTURE_KEEP = 1              # Rotated capture files kept ("<path>.1" ...)
+MAX_PENDING_CHARS = 4 * 1024 * 1024   # A snapshot larger than this is cut (runaway output)
+READ_CHUNK_BYTES = 64 * 1024
+
+
+class PipeReader:
+    """Reads whatever a pipe has available without ever blocking."""
+
+    def __init__(self, pipe):
+        self.fd = pipe.fileno()
+        self.decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.eof = False
+        self.bytes_read = 0
+
+    def read_available(self, max_bytes=4 * READ_CHUNK_BYTES):
+        """Text available right now (possibly ''); sets eof when the writer has gone."""
+        chunks = []
+        total = 0
+        while not self.eof and total < max_bytes:
+            try:
+                ready = select.select([self.fd], [], [], 0)[0]
+            except (OSError, ValueError):
+                self.eof = True
+                break
+            if not ready:
+                break
+            data = os.read(self.fd, READ_CHUNK_BYTES)
+            if not data:
+                self.eof = True
+                break
+            chunks.append(data)
+            total += len(data)
+        self.bytes_read += total
+        return self.decoder.decode(b"".join(chunks), final=self.eof)
+
+
+class LogFollower:
+    """
+    Reads what was appended to a file since the last call, never blocking.
+    Starts at the last snapshot header near the end (so the current snapshot
+    comes first) and follows the path when the file is rotated or truncated.
+    """
+
+    def __init__(self, path, tail_bytes=MAX_PENDING_CHARS):
+        self.path = path
+        self.tail_bytes = tail_bytes
+        self.file = None
+        self.identity = None   # (st_ino, st_dev) of the open file
+        self.decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.rotations = 0
+        self.bytes_read = 0
+
+    def _open(self, from_start):
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            return False
+        stat = os.fstat(f.fileno())
+        if not from_start:
+            start = max(0, stat.st_size - self.tail_bytes)
+            f.seek(start)
+            data = f.read()
+            at = data.rfind(b"\n=== ") + 1
+            if at == 0 and not (start == 0 and data.startswith(b"=== ")):
+                at = len(data) # No snapshot in sight; only new output
+            f.seek(start + at)
+        self.file = f
+        self.identity = (stat.st_ino, stat.st_dev)
+        self.decoder.reset()
+        return True
+
+    def read_available(self, max_bytes=4 * READ_CHUNK_BYTES):
+        """Text appended since the last call (possibly ''); '' while the file does not exist."""
+        if self.file is None and not self._open(from_start=False):
+            return ""
+        data = self.file.read(max_bytes)
+        if not data:
+            try:
+                stat = os.stat(self.path)
+            except OSError:
+                return "" # Between rotation and the writer's next append
+            if (stat.st_ino, stat.st_dev) != self.identity or stat.st_size < self.file.tell():
+                self.file.close()
+                self.file = None
+                if self._open(from_start=True):
+                    self.rotations += 1
+                    data = self.file.read(max_bytes)
+        self.bytes_read += len(data)
+        return self.decoder.decode(data)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class SnapshotBuffer:
+    """The snapshot in progress plus the last 'history_size' complete snapshots."""
+
+    def __init__(self, history_size=DEFAULT_HISTORY_SNAPSHOTS):
+        self.history = deque(maxlen=max(1, history_size)) # Complete snapshots, oldest first
+        self.current = []      # Complete lines of the snapshot being written
+        self.partial = ""      # Trailing text without a newline yet
+        self.current_chars = 0
+        self.snapshots = 0     # Complete snapshots seen in total
+        self.version = 0
+
+    def feed(self, text):
+        """Adds source output; returns True if any complete line arrived."""
+        if not text:
+            return False
+        lines = (self.partial + text).split("\n")
+        self.partial = lines.pop()
+        for line in lines:
+            if SNAPSHOT_HEADER.match(line) and self.current:
+                self.history.append("\n".join(self.current))
+                self.snapshots += 1
+                self.current = []
+                self.current_chars = 0
+            if self.current_chars < MAX_PENDING_CHARS:
+                self.current.append(line)
+                self.current_chars += len(line) + 1
+        if lines:
+            self.version += 1
+        return bool(lines)
+
+    def latest(self):
+        return self.history[-1] if self.history else ""
+
+    def text(self):
+        """Latest complete snapshot followed by the one in progress (sections not yet rewritten keep their last value)."""
+        return "\n".join(part for part in (self.latest(), "\n".join(self.current)) if part)
+
+    def retained_chars(self):
+        return sum(len(snapshot) for snapshot in self.history) + self.current_chars + len(self.partial)
+
+
+class RotatingCapture:
+    """Append-only capture file; renamed to '<path>.1' (shifting older ones) past max_bytes."""
+
+    def __init__(self, path, max_bytes=DEFAULT_CAPTURE_MAX_BYTES, keep=DEFAULT_CAPTURE_KEEP):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.keep = keep
+        self.rotations = 0
+        self.file = open(path, "w", encoding="utf-8")
+        self.size = 0
+
+    def write(self, text):
+        if not text:
+            return
+        self.file.write(text)
+        self.file.flush()
+        self.size += len(text.encode("utf-8", errors="replace"))
+        if self.size >= self.max_bytes:
+            self.rotate()
+
+    def rotate(self):
+        self.file.close()
+        for i in range(self.keep, 0, -1):
+            source = self.path if i == 1 else f"{self.path}.{i - 1}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{i}")
+        if self.keep <= 0:
+            os.remove(self.path)
+        self.file = open(self.path, "w", encoding="utf-8")
+        self.size = 0
+        self.rotations += 1
+
+    def close(self, remove=False):
+        self.file.close()
+        if remove:
+            for path in [self.path] + [f"{self.path}.{i}" for i in range(1, self.keep + 1)]:
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+class LRUCache(OrderedDict):
+    """dict capped at max_entries; reads and writes make an entry most recent."""
+
+    def __init__(self, max_entries):
+        super().__init__()
+        self.max_entries = max_entries
+        self.evicted = 0
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.max_entries:
+            self.popitem(last=False)
+            self.evicted += 1
@@ -0,0 +1,213 @@
+# ==============================================================================
+# Cyber K8s Events - Streaming cluster events with bounded aggregation
+# ==============================================================================
+# Shared helpers for the Cyber K8s tools. Follows 'kubectl get events -A
+# --watch' in a background thread and collapses repeated events by
+# (involvedObject, reason, message) into counters held in a bounded LRU map
+# with a TTL. Rendering is rate limited and only looks at a fixed number of
+# entries (newest via LRU order, hottest via a decayed rate score), so memory
+# and render cost stay flat during event storms.
+# ==============================================================================
+
+import heapq
+import math
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
+
+from cyber_k8s_index import format_table
+
+# One tab-separated line per event object; --watch re-emits an event when its count changes.
+EVENTS_COMMAND = [
+    "kubectl", "get", "events", "-A", "--watch", "-o",
+    "jsonpath={.metadata.namespace}{\"\\t\"}{.metadata.name}{\"\\t\"}{.involvedObject.kind}/{.involvedObject.name}"
+    "{\"\\t\"}{.type}{\"\\t\"}{.reason}{\"\\t\"}{.count}{\"\\t\"}{.message}{\"\\n\"}",
+]
+
+DEFAULT_MAX_ENTRIES = 500       # Distinct (object, reason, message) groups kept
+DEFAULT_TTL_SEC = 3600          # Groups not seen for this long are dropped
+DEFAULT_RENDER_INTERVAL_SEC = 2 # Minimum time between two renders
+HOT_HALF_LIFE_SEC = 300         # Decay of the "hotness" score
+MAX_SOURCES_PER_GROUP = 8       # Event objects remembered per group (for count deltas)
+
+
+class EventGroup:
+    __slots__ = ("namespace", "obj", "type", "reason", "message", "count",
+                 "first_seen", "last_seen", "score", "sources")
+
+    def __init__(self, namespace, obj, type_, reason, message, now):
+        self.namespace = namespace
+        self.obj = obj
+        self.type = type_
+        self.reason = reason
+        self.message = message
+        self.count = 0
+        self.first_seen = now
+        self.last_seen = now
+        self.score = 0.0
+        self.sources = OrderedDict() # event object name -> last reported count
+
+    def decayed_score(self, now):
+        return self.score * math.exp(-(now - self.last_seen) * math.log(2) / HOT_HALF_LIFE_SEC)
+
+
+class EventAggregator:
+    """Bounded LRU/TTL map of collapsed events. Thread-safe."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl_sec=DEFAULT_TTL_SEC,
+                 render_interval_sec=DEFAULT_RENDER_INTERVAL_SEC, clock=time.time):
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self.render_interval_sec = render_interval_sec
+        self.clock = clock
+        self.groups = OrderedDict() # key -> EventGroup, least recently seen first
+        self.lock = threading.Lock()
+        self.total_events = 0
+        self.evicted = 0
+        self.version = 0
+        self._rendered = (None, 0.0, [])  # (version, time, lines)
+
+    def add(self, namespace, obj, type_, reason, message, count=1, source=None):
+        """Records one (possibly repeated) event; count is the event object's own counter."""
+        now = self.clock()
+        key = (namespace, obj, reason, message)
+        with self.lock:
+            group = self.groups.get(key)
+            increment = max(count, 1)
+            if group is not None and source is not None:
+                previous = group.sources.get(source)
+                if previous is not None:
+                    # Same count: re-delivered (the watch re-lists on reconnect). Lower: a new series.
+                    increment = count - previous if count >= previous else max(count, 1)
+                if increment == 0:
+                    return
+            if group is None:
+                group = EventGroup(namespace, obj, type_, reason, message, now)
+                self.groups[key] = group
+            else:
+                self.groups.move_to_end(key)
+            if source is not None:
+                group.sources.pop(source, None)
+                group.sources[source] = count
+                if len(group.sources) > MAX_SOURCES_PER_GROUP:
+                    group.sources.popitem(last=False)
+            group.score = group.decayed_score(now) + increment
+            group.count += increment
+            group.last_seen = now
+            group.type = type_ or group.type
+            self.total_events += increment
+            self.version += 1
+            self._expire(now)
+
+    def _expire(self, now):
+        # LRU order means expired groups are always at the front
+        while self.groups:
+            key, group = next(iter(self.groups.items()))
+            if len(self.groups) <= self.max_entries and now - group.last_seen <= self.ttl_sec:
+                break
+            del self.groups[key]
+            self.evicted += 1
+
+    def feed_line(self, line):
+        """Parses one line of EVENTS_COMMAND output."""
+        parts = line.rstrip("\n").split("\t", 6)
+        if len(parts) < 7:
+            return False
+        namespace, name, obj, type_, reason, count, message = parts
+        try:
+            count = int(count)
+        except ValueError:
+            count = 1
+        self.add(namespace, obj, type_, reason, message.strip(), count=count, source=f"{namespace}/{name}")
+        return True
+
+    def newest(self, limit):
+        with self.lock:
+            return [self.groups[key] for key in islice(reversed(self.groups), limit)]
+
+    def hottest(self, limit):
+        now = self.clock()
+        with self.lock:
+            return heapq.nlargest(limit, self.groups.values(), key=lambda g: g.decayed_score(now))
+
+    def render_lines(self, limit=10, force=False):
+        """
+        Table of the newest and hottest groups. Re-rendered at most once per
+        render_interval_sec, and only when new events arrived.
+        """
+        now = self.clock()
+        version, rendered_at, lines = self._rendered
+        if not force and version is not None and (version == self.version or now - rendered_at < self.render_interval_sec):
+            return lines
+        with self.lock:
+            self._expire(now)
+            current_version = self.version
+        lines = [f"Events seen: {self.total_events}  Groups: {len(self.groups)}/{self.max_entries}  Evicted: {self.evicted}", ""]
+        for title, groups in (("NEWEST", self.newest(limit)), ("HOTTEST", self.hottest(limit))):
+            lines.append(f"{title}:")
+            lines.extend(format_event_table(groups, now))
+            lines.append("")
+        self._rendered = (current_version, now, lines)
+        return lines
+
+
+def format_age(seconds):
+    seconds = int(max(seconds, 0))
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m"
+    return f"{seconds // 3600}h"
+
+
+def format_event_table(groups, now):
+    rows = [(g.namespace or "-", g.obj, g.type or "-", g.reason or "-", str(g.count),
+             format_age(now - g.last_seen), g.message[:120] or "-") for g in groups]
+    if not rows:
+        return ["No events."]
+    return format_table(("NAMESPACE", "OBJECT", "TYPE", "REASON", "COUNT", "LAST", "MESSAGE"), rows)
+
+
+class EventStream:
+    """Background thread that follows EVENTS_COMMAND and feeds an EventAggregator."""
+
+    def __init__(self, aggregator=None, command=None, retry_sec=5):
+        self.aggregator = aggregator or EventAggregator()
+        self.command = command or EVENTS_COMMAND
+        self.retry_sec = retry_sec
+        self.process = None
+        self.error = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="cyber-k8s-events", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self.process and self.process.poll() is None:
+            try:
+                self.process.terminate()
+            except OSError:
+                pass
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.process = subprocess.Popen(self.command, stdout=subprocess.PIPE,
+                                                stderr=subprocess.DEVNULL, text=True, bufsize=1)
+                self.error = None
+                for line in self.process.stdout:
+                    if self._stop.is_set():
+                        break
+                    self.aggregator.feed_line(line)
+                self.process.wait()
+            except Exception as e: # kubectl missing, cluster down, ...
+                self.error = str(e)
+            # The watch ends when the API server closes it; reconnect after a pause
+            self._stop.wait(self.retry_sec)
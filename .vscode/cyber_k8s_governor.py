@@ -0,0 +1,136 @@
+# ==============================================================================
+# Cyber K8s Governor - Idle-aware pacing and CPU budget for the tool loops
+# ==============================================================================
+# Shared helpers for the Cyber K8s tools. A Governor watches how often the data
+# changes and when the user last did something (keypress, resize). While
+# nothing happens it slows the loop down step by step, from 'min_interval' up
+# to 'max_interval'; any change or user activity snaps it back to full speed.
+#
+# An optional CPU budget (fraction of one core, e.g. 0.05 = 5%) caps each
+# cycle: after a cycle that used 'cpu' seconds of CPU, the caller sleeps until
+# the cycle's wall time is at least cpu / budget.
+#
+# "Changed" is decided by a ChangeDetector: a per-section hash of the content
+# without the snapshot header and without columns that move on every poll
+# (AGE, CPU/memory usage, latencies, counters), so a steady cluster goes idle.
+# ==============================================================================
+
+import hashlib
+import re
+import time
+
+from cyber_k8s_index import SNAPSHOT_HEADER, parse_table
+
+DEFAULT_IDLE_STEP_SEC = 30  # Quiet time before each slow-down step
+DEFAULT_BACKOFF = 2.0       # Interval multiplier per step
+
+# Table columns that change on every poll without anything happening
+VOLATILE_COLUMNS = {
+    "AGE", "LAST",                                                   # kubectl ages, event age
+    "CPU(cores)", "CPU%", "CPU(%)", "MEMORY(bytes)", "MEMORY%", "MEMORY(%)",  # kubectl top
+    "P50(MS)", "P95(MS)", "P99(MS)", "PROBES", "ERRORS", "SKIPPED",  # ingress probes
+    "SIZE", "FILES", "GROWTH",                                       # PVC storage
+}
+# "(5m ago)" suffixes of RESTARTS and similar columns
+VOLATILE_VALUE = re.compile(r"\s*\([^()]* ago\)")
+# Free-form lines here only carry counters, durations and clock times as numbers
+VOLATILE_TEXT = re.compile(r"\d+(?:[.:]\d+)*")
+
+
+def stable_text(text):
+    """Section content with the snapshot header and volatile columns/numbers removed."""
+    out = []
+    for kind, line, fields in parse_table(text or ""):
+        if kind == "row":
+            out.append("\t".join(VOLATILE_VALUE.sub("", value) for title, value in fields.items()
+                                 if title not in VOLATILE_COLUMNS))
+        elif kind == "header":
+            out.append(line.strip())
+        elif not SNAPSHOT_HEADER.match(line.strip()):
+            out.append(VOLATILE_TEXT.sub("#", line.strip()))
+    return "\n".join(out)
+
+
+class ChangeDetector:
+    """Remembers a stable content hash per section and reports real changes only."""
+
+    def __init__(self):
+        self.hashes = {}
+
+    def changed(self, key, text):
+        digest = hashlib.sha1(stable_text(text).encode("utf-8", errors="replace")).digest()
+        if self.hashes.get(key) == digest:
+            return False
+        self.hashes[key] = digest
+        return True
+
+    def update(self, sections):
+        """changed() for every (key, text) of a mapping; True if any of them changed."""
+        return bool([key for key, text in sections.items() if self.changed(key, text)])
+
+
+class Governor:
+    def __init__(self, min_interval, max_interval, idle_step_sec=DEFAULT_IDLE_STEP_SEC,
+                 backoff=DEFAULT_BACKOFF, cpu_budget=None, clock=time.monotonic, cpu_clock=time.process_time):
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.idle_step_sec = idle_step_sec
+        self.backoff = backoff
+        self.cpu_budget = cpu_budget
+        self.clock = clock
+        self.cpu_clock = cpu_clock
+        self.last_event = clock()
+        self.level = 0
+        self.changes = 0
+        self.activities = 0
+        self.throttled_sec = 0.0
+        self._cycle_start = None
+
+    # --- inputs ---
+    def note_change(self):
+        """New data arrived."""
+        self.changes += 1
+        self._wake()
+
+    def note_activity(self):
+        """The user pressed a key or resized the terminal."""
+        self.activities += 1
+        self._wake()
+
+    def _wake(self):
+        self.last_event = self.clock()
+        self.level = 0
+
+    # --- pacing ---
+    def interval(self):
+        """Current tick/poll interval; grows one step per idle_step_sec of quiet."""
+        quiet = self.clock() - self.last_event
+        self.level = int(quiet // self.idle_step_sec) if self.idle_step_sec > 0 else 0
+        return min(self.min_interval * (self.backoff ** self.level), self.max_interval)
+
+    def slowdown(self):
+        """How many times slower than full speed the loop currently runs (>= 1)."""
+        return self.interval() / self.min_interval if self.min_interval > 0 else 1.0
+
+    def idle(self):
+        return self.interval() > self.min_interval
+
+    # --- CPU budget ---
+    def begin_cycle(self):
+        self._cycle_start = (self.clock(), self.cpu_clock())
+
+    def end_cycle(self):
+        """Seconds the caller should sleep so the cycle stays within the CPU budget."""
+        if self._cycle_start is None or not self.cpu_budget:
+            return 0.0
+        wall_start, cpu_start = self._cycle_start
+        self._cycle_start = None
+        cpu_used = self.cpu_clock() - cpu_start
+        wall_used = self.clock() - wall_start
+        extra = max(0.0, cpu_used / self.cpu_budget - wall_used)
+        self.throttled_sec += extra
+        return extra
+
+    def describe(self):
+        return (f"interval={self.interval():.2f}s level={self.level} changes={self.changes} "
+                f"activities={self.activities} throttled={self.throttled_sec:.1f}s")
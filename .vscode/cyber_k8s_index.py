@@ -0,0 +1,298 @@
+# ==============================================================================
+# Cyber K8s Index - Table parsing and secondary indexes for section content
+# ==============================================================================
+# Shared helpers for the Cyber K8s tools. Parses the fixed-width tables printed
+# by 'kubectl get ...' into rows and keeps per-section secondary indexes
+# (namespace, node, status) that are updated incrementally as new snapshots
+# arrive, so drilldown filters only touch the rows that match.
+# ==============================================================================
+
+import hashlib
+import re
+
+# Section markers printed by colima-k8s-persistent.sh.
+SECTION_HEADER = re.compile(r"^---\s(.*)\s---$")
+SNAPSHOT_HEADER = re.compile(r"^===\s(.*)\s===$")
+
+# A header line is a run of upper-case column titles, e.g. "NAMESPACE   NAME";
+# a title may end in a parenthesised unit such as "CPU(cores)" (kubectl top).
+TABLE_HEADER = re.compile(r"^[A-Z][A-Z0-9%/_\-]*(?:\([A-Za-z%]+\))?(?:\s+[A-Z][A-Z0-9%/_\-]*(?:\([A-Za-z%]+\))?)*$")
+# Column titles are separated by two or more spaces ("NOMINATED NODE" is one title).
+HEADER_COLUMN = re.compile(r"\S+(?: \S+)*")
+
+# Fields that get a secondary index.
+INDEXED_FIELDS = ("namespace", "node", "status")
+
+# Statuses considered healthy; everything else is a "problem" for drilldown.
+HEALTHY_STATUSES = {"Running", "Ready", "Completed", "Succeeded", "Bound", "Active"}
+# Status filter value meaning "any status not in HEALTHY_STATUSES", resolved at query time
+PROBLEM_FILTER = "problem"
+
+# Sections whose rows are nodes themselves (NAME is the node)
+NODE_SECTIONS = {"Kubernetes Nodes", "Node Resource Usage"}
+
+# Command behind each section of colima-k8s-persistent.sh (in the script's order),
+# for tools that run the commands themselves but reason in sections.
+SECTION_COMMANDS = {
+    "Colima Status": "colima status k8s",
+    "Kubernetes Cluster Info": "kubectl cluster-info",
+    "Kubernetes Nodes": "kubectl get nodes -o wide",
+    "Node Resource Usage": "kubectl top nodes",
+    "INGRESS Status": "kubectl get ing -A",
+    "Active Pods": "kubectl get pods -A -o wide --field-selector=status.phase=Running",
+    "Service Status": "kubectl get svc -A",
+}
+
+
+def split_sections(batch):
+    """Splits a list of lines into [(section_title, lines)] on '--- Title ---' markers."""
+    sections = []
+    current_section = None
+    current_lines = []
+    for line in batch:
+        m = SECTION_HEADER.match(line)
+        if m:
+            if current_section is not None:
+                sections.append((current_section, current_lines))
+            current_section = m.group(1).strip()
+            current_lines = [line]
+        else:
+            if current_section is None:
+                current_section = "Unknown Section"
+                current_lines = []
+            current_lines.append(line)
+    if current_section is not None:
+        sections.append((current_section, current_lines))
+    return sections
+
+
+def parse_header(line):
+    """Returns [(title, start_col)] for a kubectl table header line."""
+    return [(m.group(0), m.start()) for m in HEADER_COLUMN.finditer(line)]
+
+
+def parse_row(columns, line):
+    """Slices a table row into a {TITLE: value} dict using header column offsets."""
+    fields = {}
+    for i, (title, start) in enumerate(columns):
+        end = columns[i + 1][1] if i + 1 < len(columns) else None
+        fields[title] = line[start:end].strip() if end is not None else line[start:].strip()
+    return fields
+
+
+def parse_table(text):
+    """
+    Parses section text into a list of (kind, line, fields) tuples.
+    kind is 'header', 'row' or 'text'; fields is None for non-row lines.
+    """
+    parsed = []
+    columns = None
+    for line in text.splitlines():
+        if not line.strip():
+            columns = None
+            parsed.append(("text", line, None))
+        elif TABLE_HEADER.match(line.strip()) and len(line.split()) > 1:
+            columns = parse_header(line)
+            parsed.append(("header", line, None))
+        elif columns:
+            parsed.append(("row", line, parse_row(columns, line)))
+        else:
+            parsed.append(("text", line, None))
+    return parsed
+
+
+def format_table(header, rows):
+    """
+    Renders rows the way kubectl does, so parse_table() reads them back:
+    left-aligned columns joined by three spaces, last column free text.
+    """
+    widths = [max(len(header[i]), *(len(r[i]) for r in rows)) for i in range(len(header) - 1)]
+    def fmt(row):
+        return "   ".join(row[i].ljust(widths[i]) for i in range(len(widths))) + "   " + row[-1]
+    return [fmt(header)] + [fmt(r) for r in rows]
+
+
+def table_record(text):
+    """
+    Machine-readable form of section text for NDJSON output: parsed table rows
+    plus the free-form lines, and a content hash for change suppression.
+    """
+    rows, lines = [], []
+    for kind, line, fields in parse_table(text):
+        if kind == "row":
+            rows.append(fields)
+        elif kind == "text" and line.strip():
+            lines.append(line)
+    return {
+        "hash": hashlib.sha1(text.encode("utf-8", errors="replace")).hexdigest(),
+        "rows": rows,
+        "text": lines,
+    }
+
+
+def row_key(fields, line):
+    """Stable identity for a row: (namespace, name) when available, else the raw line."""
+    if fields and fields.get("NAME"):
+        return (fields.get("NAMESPACE", ""), fields["NAME"])
+    return ("", line.strip())
+
+
+def row_attributes(fields, rows_are_nodes=False):
+    """Extracts the indexed attributes (namespace, node, status) of a parsed row."""
+    if not fields:
+        return {}
+    attrs = {}
+    if fields.get("NAMESPACE"):
+        attrs["namespace"] = fields["NAMESPACE"]
+    if fields.get("NODE"):
+        attrs["node"] = fields["NODE"]
+    elif (rows_are_nodes or "ROLES" in fields) and fields.get("NAME"):
+        attrs["node"] = fields["NAME"] # 'kubectl get nodes' / 'kubectl top nodes' rows are nodes themselves
+    if fields.get("STATUS"):
+        attrs["status"] = fields["STATUS"]
+    return attrs
+
+
+class Row:
+    __slots__ = ("key", "line", "lower", "fields", "attrs", "position")
+
+    def __init__(self, key, line, fields, position, rows_are_nodes=False):
+        self.key = key
+        self.line = line
+        self.lower = line.lower()
+        self.fields = fields
+        self.attrs = row_attributes(fields, rows_are_nodes)
+        self.position = position
+
+
+class SectionIndex:
+    """Rows of one section plus value -> row-key sets for each indexed field."""
+
+    def __init__(self, rows_are_nodes=False):
+        self.rows_are_nodes = rows_are_nodes
+        self.text = None
+        self.rows = {}      # key -> Row
+        self.headers = []   # (position, line) for table header lines
+        self.by_field = {field: {} for field in INDEXED_FIELDS}
+        self.delta = []     # Rows touched by the last update: (key, old fields, new fields)
+
+    def _index(self, row):
+        for field, value in row.attrs.items():
+            self.by_field[field].setdefault(value, set()).add(row.key)
+
+    def _unindex(self, row):
+        for field, value in row.attrs.items():
+            keys = self.by_field[field].get(value)
+            if keys is not None:
+                keys.discard(row.key)
+                if not keys:
+                    del self.by_field[field][value]
+
+    def update(self, text):
+        """
+        Applies a new snapshot; only added, changed and removed rows touch the
+        indexes. Those rows are also left in 'delta' (old/new fields are None
+        for added/removed rows).
+        """
+        self.delta = []
+        if text == self.text:
+            return (0, 0, 0)
+        self.text = text
+        added = changed = 0
+        seen = set()
+        self.headers = []
+        for position, (kind, line, fields) in enumerate(parse_table(text)):
+            if kind == "header":
+                self.headers.append((position, line))
+                continue
+            if not line.strip():
+                continue
+            # Free-form lines (e.g. 'colima status') are kept as field-less rows
+            key = row_key(fields, line)
+            if key in seen: # Duplicate key within a snapshot: the raw line, numbered if it repeats too
+                base = key = ("", line.strip())
+                occurrence = 1
+                while key in seen:
+                    key = base + (occurrence,)
+                    occurrence += 1
+            seen.add(key)
+            old = self.rows.get(key)
+            if old is not None and old.line == line:
+                old.position = position
+                continue
+            if old is not None:
+                self._unindex(old)
+                changed += 1
+            else:
+                added += 1
+            row = Row(key, line, fields, position, self.rows_are_nodes)
+            self.rows[key] = row
+            self._index(row)
+            self.delta.append((key, old.fields if old is not None else None, fields))
+        removed_keys = [key for key in self.rows if key not in seen]
+        for key in removed_keys:
+            old = self.rows.pop(key)
+            self._unindex(old)
+            self.delta.append((key, old.fields, None))
+        return (added, changed, len(removed_keys))
+
+    def values(self, field):
+        return sorted(self.by_field.get(field, {}))
+
+    def query(self, namespace=None, node=None, status=None, text=None):
+        """
+        Returns the section lines matching all given filters, in table order.
+        namespace/node/status may be a single value or a collection of values;
+        status may also be PROBLEM_FILTER (every status not in HEALTHY_STATUSES).
+        """
+        if status == PROBLEM_FILTER:
+            status = [value for value in self.by_field["status"] if value not in HEALTHY_STATUSES]
+        candidates = None
+        for field, wanted in (("namespace", namespace), ("node", node), ("status", status)):
+            if wanted is None:
+                continue
+            values = [wanted] if isinstance(wanted, str) else wanted
+            keys = set()
+            for value in values:
+                keys |= self.by_field[field].get(value, set())
+            candidates = keys if candidates is None else candidates & keys
+            if not candidates:
+                break
+        rows = self.rows.values() if candidates is None else [self.rows[key] for key in candidates]
+        if text:
+            needle = text.lower()
+            rows = [row for row in rows if needle in row.lower]
+        matched = sorted(rows, key=lambda row: row.position)
+        if not matched:
+            return []
+        # Keep the column headers so filtered tables remain readable
+        merged = sorted(self.headers + [(row.position, row.line) for row in matched])
+        return [line for _, line in merged]
+
+
+class TableIndex:
+    """Per-section SectionIndex collection used by the monitor drilldown."""
+
+    def __init__(self):
+        self.sections = {}
+
+    def update(self, section, text):
+        index = self.sections.get(section)
+        if index is None:
+            index = self.sections[section] = SectionIndex(rows_are_nodes=section in NODE_SECTIONS)
+        return index.update(text or "")
+
+    def delta(self, section):
+        index = self.sections.get(section)
+        return index.delta if index else []
+
+    def values(self, section, field):
+        index = self.sections.get(section)
+        return index.values(field) if index else []
+
+    def problem_statuses(self, section):
+        return [status for status in self.values(section, "status") if status not in HEALTHY_STATUSES]
+
+    def query(self, section, **filters):
+        index = self.sections.get(section)
+        return index.query(**filters) if index else []
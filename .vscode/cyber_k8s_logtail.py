@@ -0,0 +1,308 @@
+# ==============================================================================
+# Cyber K8s Log Tail - Concurrent multi-pod log multiplexer
+# ==============================================================================
+# Shared helpers for the Cyber K8s tools. Follows 'kubectl logs -f' for every
+# pod matching a namespace and/or label selector using asyncio subprocesses on
+# a private event loop in a background thread, so the UI never blocks.
+#
+# - Lines are merged in timestamp order through a heap with a short reorder
+#   window; the heap and the merged output are both bounded.
+# - Each pod keeps its own ring buffer of recent lines.
+# - Pods are rediscovered periodically: new pods are followed, vanished pods
+#   are dropped, and broken streams reconnect with backoff from the last
+#   timestamp seen. Lines are prefixed with their container, whose last
+#   timestamp is tracked separately (containers interleave out of order);
+#   only the replay right after a reconnect is deduplicated.
+# - stop() waits for the loop to kill and reap its kubectl children; any left
+#   after STOP_TIMEOUT_SEC are killed from the calling thread.
+# ==============================================================================
+
+import asyncio
+import heapq
+import os
+import signal
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+DEFAULT_MAX_PODS = 30          # Streams followed at once
+DEFAULT_RING_SIZE = 200        # Lines kept per pod
+DEFAULT_MERGED_SIZE = 1000     # Lines kept in the merged view
+DEFAULT_HEAP_LIMIT = 5000      # Lines waiting for reordering before forced release
+DEFAULT_REORDER_WINDOW_SEC = 0.5
+DEFAULT_REDISCOVER_SEC = 10
+DEFAULT_INITIAL_TAIL = 20
+MAX_BACKOFF_SEC = 15
+STREAM_LINE_LIMIT = 1024 * 1024 # asyncio readline limit for very long log lines
+STOP_TIMEOUT_SEC = 3.0         # stop() waits this long for the loop to reap its children
+
+
+def parse_log_timestamp_ns(raw):
+    """
+    Integer nanoseconds since the epoch from a 'kubectl logs --timestamps'
+    RFC3339Nano prefix. The fraction has a variable length, so the strings
+    themselves do not compare correctly.
+    """
+    head, _, frac = raw.rstrip("Z").partition(".")
+    if frac and not frac.isdigit():
+        return None
+    try:
+        seconds = int(datetime.fromisoformat(head + "+00:00").timestamp())
+    except ValueError:
+        return None
+    return seconds * 1_000_000_000 + int((frac + "000000000")[:9])
+
+
+def parse_log_timestamp(raw):
+    """Epoch seconds from a 'kubectl logs --timestamps' prefix, or None."""
+    ns = parse_log_timestamp_ns(raw)
+    return ns / 1e9 if ns is not None else None
+
+
+class PodStream:
+    __slots__ = ("namespace", "name", "ring", "last_seen", "replay", "last_ts", "lines", "reconnects", "task", "process")
+
+    def __init__(self, namespace, name, ring_size):
+        self.namespace = namespace
+        self.name = name
+        self.ring = deque(maxlen=ring_size)
+        self.last_seen = {}   # container -> (ns, raw timestamp) of its newest line
+        self.replay = {}      # container -> ns; lines up to it are replays after a reconnect
+        self.last_ts = 0.0
+        self.lines = 0
+        self.reconnects = 0
+        self.task = None
+        self.process = None
+
+    def begin_replay(self):
+        """Called before (re)connecting: lines up to each container's last timestamp are replays."""
+        self.replay = {container: ns for container, (ns, _) in self.last_seen.items()}
+
+
+class LogTail:
+    """Follows logs of all pods selected by namespace/label selector."""
+
+    def __init__(self, namespace=None, selector=None, max_pods=DEFAULT_MAX_PODS,
+                 ring_size=DEFAULT_RING_SIZE, merged_size=DEFAULT_MERGED_SIZE,
+                 heap_limit=DEFAULT_HEAP_LIMIT, reorder_window_sec=DEFAULT_REORDER_WINDOW_SEC,
+                 rediscover_sec=DEFAULT_REDISCOVER_SEC, initial_tail=DEFAULT_INITIAL_TAIL, kubectl="kubectl"):
+        self.namespace = namespace
+        self.selector = selector
+        self.max_pods = max_pods
+        self.ring_size = ring_size
+        self.heap_limit = heap_limit
+        self.reorder_window_sec = reorder_window_sec
+        self.rediscover_sec = rediscover_sec
+        self.initial_tail = initial_tail
+        self.kubectl = kubectl
+        self.streams = {}             # (namespace, pod) -> PodStream
+        self.merged = deque(maxlen=merged_size)
+        self.lock = threading.Lock()  # Guards 'merged' and 'streams' for readers on other threads
+        self.error = None
+        self.dropped = 0              # Lines released early because the heap was full
+        self.version = 0
+        self._heap = []
+        self._seq = 0
+        self._loop = None
+        self._main_task = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    # --- thread / loop management ---
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run_loop, name="cyber-k8s-logtail", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run_loop(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._main_task = self._loop.create_task(self._main())
+        try:
+            self._loop.run_until_complete(self._main_task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._loop.close()
+
+    def stop(self, timeout=STOP_TIMEOUT_SEC):
+        """Cancels the loop and waits for it to kill its kubectl children; kills leftovers itself."""
+        self._stop.set()
+        try:
+            if self._loop is not None and self._main_task is not None:
+                self._loop.call_soon_threadsafe(self._main_task.cancel)
+        except RuntimeError:
+            pass # Loop already closed
+        if self._thread is None:
+            return
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            with self.lock:
+                streams = list(self.streams.values())
+            for stream in streams:
+                if stream.process is not None and stream.process.returncode is None:
+                    try:
+                        os.kill(stream.process.pid, signal.SIGKILL)
+                    except (ProcessLookupError, PermissionError):
+                        pass
+
+    # --- discovery ---
+    def _discovery_command(self):
+        cmd = [self.kubectl, "get", "pods", "--field-selector=status.phase=Running", "-o",
+               "jsonpath={range .items[*]}{.metadata.namespace}{\"\\t\"}{.metadata.name}{\"\\n\"}{end}"]
+        cmd += ["-n", self.namespace] if self.namespace else ["-A"]
+        if self.selector:
+            cmd += ["-l", self.selector]
+        return cmd
+
+    async def _discover(self):
+        process = await asyncio.create_subprocess_exec(
+            *self._discovery_command(), stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+        out, err = await process.communicate()
+        if process.returncode != 0:
+            raise RuntimeError(err.decode("utf-8", errors="replace").strip() or f"exit {process.returncode}")
+        pods = []
+        for line in out.decode("utf-8", errors="replace").splitlines():
+            if "\t" in line:
+                pods.append(tuple(line.split("\t", 1)))
+        return sorted(pods)[:self.max_pods]
+
+    def _rebalance(self, pods):
+        wanted = set(pods)
+        for key in [key for key in self.streams if key not in wanted]:
+            with self.lock:
+                stream = self.streams.pop(key)
+            if stream.task:
+                stream.task.cancel()
+        for namespace, name in pods:
+            if (namespace, name) not in self.streams:
+                stream = PodStream(namespace, name, self.ring_size)
+                stream.task = self._loop.create_task(self._follow(stream))
+                with self.lock:
+                    self.streams[(namespace, name)] = stream
+
+    # --- following ---
+    def _logs_command(self, stream):
+        cmd = [self.kubectl, "logs", "-f", "--timestamps", "--all-containers", "--prefix",
+               "-n", stream.namespace, stream.name]
+        if stream.last_seen:
+            # From the container that is furthest behind, so no container misses lines
+            cmd.append(f"--since-time={min(stream.last_seen.values())[1]}")
+        else:
+            cmd.append(f"--tail={self.initial_tail}")
+        return cmd
+
+    async def _follow(self, stream):
+        backoff = 1.0
+        try:
+            while True:
+                stream.begin_replay()
+                stream.process = await asyncio.create_subprocess_exec(
+                    *self._logs_command(stream), stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL, limit=STREAM_LINE_LIMIT)
+                while True:
+                    try:
+                        raw = await stream.process.stdout.readline()
+                    except ValueError: # Line longer than STREAM_LINE_LIMIT
+                        continue
+                    if not raw:
+                        break
+                    self._ingest(stream, raw.decode("utf-8", errors="replace").rstrip("\n"))
+                    backoff = 1.0
+                await stream.process.wait()
+                # Stream ended (container restart, API timeout); reconnect from the last timestamp
+                stream.reconnects += 1
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, MAX_BACKOFF_SEC)
+        finally:
+            if stream.process and stream.process.returncode is None:
+                try:
+                    stream.process.kill()
+                    await stream.process.wait() # Reap before the loop closes
+                except (ProcessLookupError, asyncio.CancelledError):
+                    pass
+
+    def _ingest(self, stream, line):
+        container = ""
+        if line.startswith("[") and "] " in line: # --prefix: "[pod/<pod>/<container>] "
+            prefix, line = line[1:].split("] ", 1)
+            container = prefix.rsplit("/", 1)[-1]
+        raw_ts, _, text = line.partition(" ")
+        ts_ns = parse_log_timestamp_ns(raw_ts)
+        if ts_ns is None:
+            ts, text = time.time(), line
+        else:
+            replayed_up_to = stream.replay.get(container)
+            if replayed_up_to is not None:
+                if ts_ns <= replayed_up_to:
+                    return # Replayed by --since-time after a reconnect
+                del stream.replay[container] # Past the replay; everything after it is new
+            last = stream.last_seen.get(container)
+            if last is None or ts_ns > last[0]:
+                stream.last_seen[container] = (ts_ns, raw_ts)
+            ts = ts_ns / 1e9
+        stream.last_ts = ts
+        stream.lines += 1
+        entry = (ts, stream.name, text)
+        stream.ring.append(entry)
+        self._seq += 1
+        heapq.heappush(self._heap, (ts, self._seq, entry))
+        if len(self._heap) > self.heap_limit:
+            self._release(heapq.heappop(self._heap)[2])
+            self.dropped += 1
+
+    def _release(self, entry):
+        with self.lock:
+            self.merged.append(entry)
+            self.version += 1
+
+    def _drain(self, now):
+        cutoff = now - self.reorder_window_sec
+        while self._heap and self._heap[0][0] <= cutoff:
+            self._release(heapq.heappop(self._heap)[2])
+
+    async def _main(self):
+        next_discovery = 0.0
+        try:
+            while not self._stop.is_set():
+                now = time.time()
+                if now >= next_discovery:
+                    try:
+                        self._rebalance(await self._discover())
+                        self.error = None
+                    except Exception as e:
+                        self.error = str(e)
+                    next_discovery = now + self.rediscover_sec
+                self._drain(now)
+                await asyncio.sleep(0.2)
+        finally:
+            for stream in self.streams.values():
+                if stream.task:
+                    stream.task.cancel()
+            await asyncio.gather(*(s.task for s in self.streams.values() if s.task), return_exceptions=True)
+
+    # --- reading (any thread) ---
+    def recent(self, limit=50):
+        """Last merged lines as (ts, pod, text), oldest first."""
+        with self.lock:
+            count = len(self.merged)
+            return [self.merged[i] for i in range(max(0, count - limit), count)]
+
+    def render_lines(self, limit=50, width=None):
+        target = self.namespace or "all namespaces"
+        if self.selector:
+            target += f" -l {self.selector}"
+        with self.lock: # The loop thread adds and drops streams
+            streams = list(self.streams.values())
+        lines = [f"Following {len(streams)} pods in {target}  Early releases: {self.dropped}"]
+        if self.error:
+            lines.append(f"Discovery error: {self.error}")
+        pod_width = max([len(s.name) for s in streams] + [3])
+        pod_width = min(pod_width, 32)
+        for ts, pod, text in self.recent(limit):
+            stamp = time.strftime("%H:%M:%S", time.localtime(ts))
+            line = f"{stamp} {pod[:pod_width].ljust(pod_width)} | {text}"
+            lines.append(line[:width] if width else line)
+        return lines
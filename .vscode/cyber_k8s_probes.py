@@ -0,0 +1,387 @@
+# ==============================================================================
+# Cyber K8s Probes - Ingress endpoint health prober with latency histograms
+# ==============================================================================
+# Shared helpers for the Cyber K8s tools. Takes the hosts listed by 'kubectl
+# get ing -A' and checks that they actually answer over HTTP(S).
+#
+# - Probes run concurrently on a small bounded thread pool, over keep-alive
+#   http.client connections pooled per (scheme, host, port).
+# - HTTPS trusts the system CAs, the mkcert root CA (CAROOT) and the local
+#   wildcard certificate from k8s/ (pinned as a partial chain).
+# - Latency per host goes into a log-bucketed streaming histogram (p50/p95/p99
+#   in constant memory).
+# - Cost is bounded: at most 'max_hosts' probes per round (rotating through the
+#   rest), each with a timeout, and a wall-clock budget per round. A host never
+#   has more than one probe queued or running: hosts still busy from an earlier
+#   round are skipped and probes still queued at the budget are cancelled, so
+#   slow endpoints cannot build up a backlog.
+# - 'resolve' maps a host to an (ip, port) so tests can point hosts at local
+#   stub servers; Host header and SNI still use the real name.
+# ==============================================================================
+
+import http.client
+import math
+import os
+import socket
+import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from cyber_k8s_index import format_table, parse_table
+
+DEFAULT_MAX_HOSTS = 20          # Probes per round; more hosts are covered over several rounds
+DEFAULT_WORKERS = 4             # Concurrent probes
+DEFAULT_TIMEOUT_SEC = 3.0       # Connect/read timeout of one probe
+DEFAULT_ROUND_BUDGET_SEC = 5.0  # Wall time a round may take before late probes are reported as skipped
+DEFAULT_INTERVAL_SEC = 15       # Time between rounds
+DEFAULT_PATH = "/"
+MAX_BODY_BYTES = 64 * 1024      # Larger bodies are not drained; the connection is dropped instead
+MAX_IDLE_PER_KEY = 2            # Idle keep-alive connections kept per (scheme, host, port)
+HISTOGRAM_GROWTH = 1.1          # Bucket width ratio (~5% relative error on percentiles)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WILDCARD_CERT_PATH = os.path.join(REPO_ROOT, "k8s", "_wildcard.onto.one+1.pem")
+
+
+class LatencyHistogram:
+    """Streaming histogram with logarithmic buckets; memory does not grow with samples."""
+    __slots__ = ("buckets", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.buckets = {} # bucket index -> count
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, ms):
+        ms = max(ms, 0.001)
+        index = int(math.floor(math.log(ms) / math.log(HISTOGRAM_GROWTH)))
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += ms
+        self.min = ms if self.min is None else min(self.min, ms)
+        self.max = ms if self.max is None else max(self.max, ms)
+
+    def percentile(self, q):
+        """Upper edge of the bucket holding the q-th percentile (q in 0..100), clamped to min/max."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(self.count * q / 100.0))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(max(HISTOGRAM_GROWTH ** (index + 1), self.min), self.max)
+        return self.max
+
+
+class HostStats:
+    __slots__ = ("namespace", "histogram", "probes", "errors", "skipped", "last_status", "last_error", "last_ms", "last_probe")
+
+    def __init__(self, namespace):
+        self.namespace = namespace
+        self.histogram = LatencyHistogram()
+        self.probes = 0
+        self.errors = 0
+        self.skipped = 0
+        self.last_status = None
+        self.last_error = None
+        self.last_ms = None
+        self.last_probe = None
+
+    def healthy(self):
+        return self.last_status is not None and self.last_status < 500 and self.last_error is None
+
+
+def discover_targets(ingress_text):
+    """
+    [(namespace, scheme, host)] from 'kubectl get ing -A' output. Hosts are
+    probed over HTTPS when the ingress lists port 443, wildcards are skipped.
+    """
+    targets = {}
+    for kind, _, fields in parse_table(ingress_text or ""):
+        if kind != "row" or not fields.get("HOSTS"):
+            continue
+        scheme = "https" if "443" in fields.get("PORTS", "") else "http"
+        for host in fields["HOSTS"].split(","):
+            host = host.strip()
+            if host and "*" not in host:
+                targets.setdefault((scheme, host), fields.get("NAMESPACE", ""))
+    return sorted((namespace, scheme, host) for (scheme, host), namespace in targets.items())
+
+
+def ca_candidates():
+    """CA files to trust besides the system store: $CYBER_K8S_PROBE_CA, the mkcert root, the k8s/ wildcard."""
+    paths = []
+    if os.environ.get("CYBER_K8S_PROBE_CA"):
+        paths.append(os.environ["CYBER_K8S_PROBE_CA"])
+    caroots = [os.environ.get("CAROOT"),
+               os.path.expanduser("~/Library/Application Support/mkcert"),
+               os.path.expanduser("~/.local/share/mkcert")]
+    paths.extend(os.path.join(root, "rootCA.pem") for root in caroots if root)
+    paths.append(WILDCARD_CERT_PATH)
+    return [path for path in paths if os.path.isfile(path)]
+
+
+def make_ssl_context(cafiles=None, verify=True):
+    """Default context plus the local CAs; partial chains let the wildcard leaf act as its own anchor."""
+    context = ssl.create_default_context()
+    if not verify:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        return context
+    for path in ca_candidates() if cafiles is None else cafiles:
+        try:
+            context.load_verify_locations(cafile=path)
+        except (OSError, ssl.SSLError):
+            pass
+    if hasattr(ssl, "VERIFY_X509_PARTIAL_CHAIN"):
+        context.verify_flags |= ssl.VERIFY_X509_PARTIAL_CHAIN
+    return context
+
+
+class _ProbeConnection:
+    """Connects to an overridden address while keeping the real host name for Host and SNI."""
+
+    def connect(self):
+        if self.target is None:
+            return super().connect()
+        self.sock = socket.create_connection(self.target, self.timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if isinstance(self, http.client.HTTPSConnection):
+            self.sock = self._context.wrap_socket(self.sock, server_hostname=self.host)
+
+
+class ProbeHTTPConnection(_ProbeConnection, http.client.HTTPConnection):
+    def __init__(self, host, target=None, **kwargs):
+        super().__init__(host, **kwargs)
+        self.target = target
+
+
+class ProbeHTTPSConnection(_ProbeConnection, http.client.HTTPSConnection):
+    def __init__(self, host, target=None, **kwargs):
+        super().__init__(host, **kwargs)
+        self.target = target
+
+
+class ConnectionPool:
+    """Idle keep-alive connections per (scheme, host); each connection is used by one probe at a time."""
+
+    def __init__(self, ssl_context=None, timeout=DEFAULT_TIMEOUT_SEC, resolve=None, max_idle=MAX_IDLE_PER_KEY):
+        self.ssl_context = ssl_context
+        self.timeout = timeout
+        self.resolve = resolve or {}
+        self.max_idle = max_idle
+        self.idle = {} # (scheme, host) -> [connection]
+        self.lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, scheme, host):
+        """(connection, reused)"""
+        with self.lock:
+            idle = self.idle.get((scheme, host))
+            if idle:
+                self.reused += 1
+                return idle.pop(), True
+            self.created += 1
+        if scheme == "https":
+            if self.ssl_context is None:
+                self.ssl_context = make_ssl_context()
+            return ProbeHTTPSConnection(host, target=self.resolve.get(host), timeout=self.timeout,
+                                        context=self.ssl_context), False
+        return ProbeHTTPConnection(host, target=self.resolve.get(host), timeout=self.timeout), False
+
+    def release(self, scheme, host, connection):
+        with self.lock:
+            idle = self.idle.setdefault((scheme, host), [])
+            if len(idle) < self.max_idle:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def retain(self, keys):
+        """Closes idle connections of hosts that are no longer probed."""
+        with self.lock:
+            for key in [key for key in self.idle if key not in keys]:
+                for connection in self.idle.pop(key):
+                    connection.close()
+
+    def close(self):
+        self.retain(set())
+
+
+class Prober:
+    """Probes ingress hosts in bounded rounds, on demand or from a background thread."""
+
+    def __init__(self, max_hosts=DEFAULT_MAX_HOSTS, workers=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT_SEC,
+                 round_budget_sec=DEFAULT_ROUND_BUDGET_SEC, interval_sec=DEFAULT_INTERVAL_SEC,
+                 path=DEFAULT_PATH, resolve=None, ssl_context=None):
+        self.max_hosts = max_hosts
+        self.round_budget_sec = round_budget_sec
+        self.interval_sec = interval_sec
+        self.path = path
+        self.pool = ConnectionPool(ssl_context=ssl_context, timeout=timeout, resolve=resolve)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cyber-k8s-probe")
+        self.targets = []             # [(namespace, scheme, host)]
+        self.stats = {}               # (scheme, host) -> HostStats
+        self.in_flight = {}           # (scheme, host) -> Future of its queued or running probe
+        self.lock = threading.Lock()  # Guards targets/stats for readers on other threads
+        self.rounds = 0
+        self.version = 0
+        self.last_round_ms = None
+        self._offset = 0              # Rotation through targets when there are more than max_hosts
+        self._stop = threading.Event()
+        self._thread = None
+
+    # --- targets ---
+    def set_targets(self, targets):
+        """Replaces the probed hosts; stats of hosts that are gone are dropped."""
+        targets = list(targets)
+        with self.lock:
+            if targets == self.targets:
+                return
+            self.targets = targets
+            keys = {(scheme, host) for _, scheme, host in targets}
+            for key in [key for key in self.stats if key not in keys]:
+                del self.stats[key]
+            for namespace, scheme, host in targets:
+                self.stats.setdefault((scheme, host), HostStats(namespace))
+            self.version += 1
+        self.pool.retain(keys)
+
+    def update_from_ingress(self, ingress_text):
+        self.set_targets(discover_targets(ingress_text))
+
+    # --- probing ---
+    def _request(self, scheme, host):
+        """One GET over a pooled connection; a reused connection the server already closed is retried once."""
+        for _ in range(2):
+            connection, reused = self.pool.acquire(scheme, host)
+            started = time.perf_counter()
+            try:
+                connection.request("GET", self.path, headers={"User-Agent": "cyber-k8s-probe", "Connection": "keep-alive"})
+                response = connection.getresponse()
+                body = response.read(MAX_BODY_BYTES + 1)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                connection.close()
+                if reused:
+                    continue
+                raise
+            except Exception:
+                connection.close()
+                raise
+            if response.will_close or len(body) > MAX_BODY_BYTES or not response.isclosed():
+                connection.close()
+            else:
+                self.pool.release(scheme, host, connection)
+            return response.status, elapsed_ms
+        raise http.client.RemoteDisconnected("connection closed")
+
+    def _probe(self, scheme, host):
+        try:
+            status, elapsed_ms = self._request(scheme, host)
+            error = None
+        except Exception as e: # DNS, refused, TLS, timeout, ...
+            status, elapsed_ms, error = None, None, f"{type(e).__name__}: {e}"[:80]
+        with self.lock:
+            stats = self.stats.get((scheme, host))
+            if stats is None:
+                return # Host disappeared while the probe ran
+            stats.probes += 1
+            stats.last_probe = time.time()
+            stats.last_status, stats.last_ms, stats.last_error = status, elapsed_ms, error
+            if error is not None or status >= 500:
+                stats.errors += 1
+            if elapsed_ms is not None:
+                stats.histogram.add(elapsed_ms)
+            self.version += 1
+
+    def _finished(self, key, future):
+        with self.lock:
+            if self.in_flight.get(key) is future:
+                del self.in_flight[key]
+
+    def probe_round(self):
+        """Probes up to max_hosts targets concurrently; returns the number of probes that finished in budget."""
+        with self.lock:
+            targets = self.targets
+            if len(targets) > self.max_hosts:
+                start = self._offset % len(targets)
+                batch = (targets[start:] + targets[:start])[:self.max_hosts]
+                self._offset = start + self.max_hosts
+            else:
+                batch = list(targets)
+            skipped = [(scheme, host) for _, scheme, host in batch if (scheme, host) in self.in_flight]
+            for key in skipped:
+                self.stats[key].skipped += 1 # Still busy with an earlier round's probe
+        started = time.perf_counter()
+        futures = {}
+        for _, scheme, host in batch:
+            key = (scheme, host)
+            if key in skipped:
+                continue
+            future = self.executor.submit(self._probe, scheme, host)
+            with self.lock:
+                self.in_flight[key] = future
+            future.add_done_callback(lambda f, key=key: self._finished(key, f))
+            futures[future] = key
+        done, late = wait(futures, timeout=self.round_budget_sec)
+        for future in late:
+            future.cancel() # Still queued: dropped; already running: left to its timeout (runs _finished, takes the lock)
+        with self.lock:
+            for future in late:
+                stats = self.stats.get(futures[future])
+                if stats is not None:
+                    stats.skipped += 1
+            self.rounds += 1
+            self.last_round_ms = (time.perf_counter() - started) * 1000
+            self.version += 1
+        return len(done)
+
+    # --- background thread ---
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="cyber-k8s-prober", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self.targets:
+                self.probe_round()
+            self._stop.wait(self.interval_sec)
+
+    def stop(self):
+        self._stop.set()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.pool.close()
+
+    # --- reading (any thread) ---
+    def render_lines(self):
+        """Summary line plus one table row per probed host."""
+        def ms(value):
+            return f"{value:.0f}" if value is not None else "-"
+        with self.lock:
+            rows = []
+            for namespace, scheme, host in self.targets:
+                stats = self.stats[(scheme, host)]
+                if stats.probes == 0:
+                    status = "Pending"
+                else:
+                    status = "Ready" if stats.healthy() else "Down"
+                histogram = stats.histogram
+                rows.append((namespace or "-", f"{scheme}://{host}", status,
+                             str(stats.last_status) if stats.last_status is not None else "-",
+                             ms(histogram.percentile(50)), ms(histogram.percentile(95)), ms(histogram.percentile(99)),
+                             str(stats.probes), str(stats.errors), str(stats.skipped), stats.last_error or "-"))
+            summary = (f"Hosts: {len(self.targets)}  Per round: {min(len(self.targets), self.max_hosts)}  "
+                       f"Rounds: {self.rounds}  Last round: {ms(self.last_round_ms)} ms  "
+                       f"Connections: {self.pool.created} new / {self.pool.reused} reused")
+        if not rows:
+            return [summary, "", "No ingress hosts discovered."]
+        header = ("NAMESPACE", "HOST", "STATUS", "CODE", "P50(MS)", "P95(MS)", "P99(MS)", "PROBES", "ERRORS", "SKIPPED", "LAST ERROR")
+        return [summary, ""] + format_table(header, rows)
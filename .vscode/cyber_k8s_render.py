@@ -0,0 +1,418 @@
+# ==============================================================================
+# Cyber K8s Render - Pluggable render backends and clocks
+# ==============================================================================
+# Shared helpers for the Cyber K8s tools. Both tools draw through a backend
+# object instead of talking to 'curses' or 'sys.stdout' directly, and sleep
+# through a clock object instead of 'time.sleep'. This lets the same drawing
+# code run against:
+#
+# - CursesBackend:         the real curses screen (cyber-k8s-monitor.py).
+# - AnsiStreamBackend:     an ANSI text stream, normally sys.stdout
+#                          (cyber-k8s-logstream.py).
+# - VirtualScreenBackend:  an in-memory cell grid, for golden-frame checks.
+# - NullBackend:           discards output and only counts it, for benchmarks.
+#
+# VirtualClock advances time instantly on sleep(), so typing animations finish
+# in microseconds while still reporting how long they would have taken.
+# ==============================================================================
+
+import re
+import shutil
+import sys
+import time
+
+try:
+    import curses
+    error = curses.error
+except ImportError: # Windows without curses: virtual/null/ANSI backends still work
+    curses = None
+
+    class error(Exception):
+        pass
+
+ANSI_SEQUENCE = re.compile(r"\x1b\[([0-9;?]*)([A-Za-z])")
+
+
+# ==============================================================================
+#                             Clocks
+# ==============================================================================
+
+class RealClock:
+    """Wall clock; sleep() really sleeps."""
+
+    def time(self):
+        return time.time()
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class VirtualClock:
+    """Clock whose sleep() only advances an internal counter."""
+
+    def __init__(self, start=0.0):
+        self.start = start
+        self.now = 0.0
+        self.sleeps = 0
+
+    def time(self):
+        return self.start + self.now
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps += 1
+        if seconds > 0:
+            self.now += seconds
+
+
+# ==============================================================================
+#                             Windows
+# ==============================================================================
+
+class VirtualWindow:
+    """
+    In-memory stand-in for a curses window. Implements the subset of the curses
+    window API used by the monitor; noutrefresh() copies the buffer onto the
+    owning screen (if any), like curses does with its virtual screen.
+    """
+
+    def __init__(self, height, width, begin_y=0, begin_x=0, screen=None):
+        self.screen = screen
+        self.begin_y, self.begin_x = begin_y, begin_x
+        self.attr = 0
+        self._alloc(height, width)
+
+    def _alloc(self, height, width):
+        self.height, self.width = max(1, height), max(1, width)
+        self.cells = [[(" ", 0)] * self.width for _ in range(self.height)]
+        self.y = self.x = 0
+
+    # --- geometry ---
+    def getmaxyx(self):
+        return (self.height, self.width)
+
+    def getbegyx(self):
+        return (self.begin_y, self.begin_x)
+
+    def getyx(self):
+        return (self.y, self.x)
+
+    def resize(self, height, width):
+        old = self.cells
+        self._alloc(height, width)
+        for row in range(min(len(old), self.height)):
+            self.cells[row][:min(len(old[row]), self.width)] = old[row][:self.width]
+
+    def mvwin(self, y, x):
+        self.begin_y, self.begin_x = y, x
+
+    def move(self, y, x):
+        if not (0 <= y < self.height and 0 <= x < self.width):
+            raise error("move() returned ERR")
+        self.y, self.x = y, x
+
+    # --- attributes ---
+    def attron(self, attr):
+        self.attr |= attr
+
+    def attroff(self, attr):
+        self.attr &= ~attr
+
+    # --- drawing ---
+    def clear(self):
+        self.cells = [[(" ", 0)] * self.width for _ in range(self.height)]
+        self.y = self.x = 0
+
+    erase = clear
+
+    def clrtoeol(self):
+        row = self.cells[self.y]
+        for col in range(self.x, self.width):
+            row[col] = (" ", 0)
+
+    def box(self):
+        if self.height < 2 or self.width < 2:
+            raise error("box() returned ERR")
+        self.cells[0] = [("+", self.attr)] + [("-", self.attr)] * (self.width - 2) + [("+", self.attr)]
+        self.cells[-1] = list(self.cells[0])
+        for row in range(1, self.height - 1):
+            self.cells[row][0] = ("|", self.attr)
+            self.cells[row][-1] = ("|", self.attr)
+
+    def addch(self, *args):
+        """addch(ch[, attr]) or addch(y, x, ch[, attr])."""
+        if len(args) >= 3:
+            self.move(args[0], args[1])
+            args = args[2:]
+        char = args[0] if isinstance(args[0], str) else chr(args[0])
+        attr = args[1] if len(args) > 1 else 0
+        self._put(char, attr | self.attr)
+
+    def addstr(self, *args):
+        """addstr(text[, attr]) or addstr(y, x, text[, attr])."""
+        if len(args) >= 3:
+            self.move(args[0], args[1])
+            args = args[2:]
+        text = args[0]
+        attr = args[1] if len(args) > 1 else 0
+        for char in text:
+            self._put(char, attr | self.attr)
+
+    def _put(self, char, attr):
+        if char == "\n":
+            self.clrtoeol()
+            self.x = 0
+            if self.y + 1 >= self.height:
+                raise error("addch() returned ERR")
+            self.y += 1
+            return
+        self.cells[self.y][self.x] = (char, attr)
+        self.x += 1
+        if self.x >= self.width:
+            self.x = 0
+            self.y += 1
+            if self.y >= self.height:
+                # curses leaves the cursor on the last cell and reports an error
+                self.y, self.x = self.height - 1, self.width - 1
+                raise error("addch() returned ERR")
+
+    def noutrefresh(self):
+        if self.screen is not None:
+            self.screen.blit(self)
+
+    def refresh(self):
+        self.noutrefresh()
+        if self.screen is not None:
+            self.screen.doupdate()
+
+    # --- inspection ---
+    def lines(self):
+        return ["".join(char for char, _ in row) for row in self.cells]
+
+
+# ==============================================================================
+#                             Backends
+# ==============================================================================
+
+class RenderBackend:
+    """
+    Interface shared by all backends. Stream-style drawing (logstream) uses
+    write()/flush(); window-style drawing (monitor) uses newwin()/doupdate().
+    """
+
+    def __init__(self):
+        self.stats = {"chars": 0, "writes": 0, "flushes": 0, "updates": 0}
+
+    def size(self):
+        """Returns (rows, cols)."""
+        raise NotImplementedError
+
+    def write(self, text):
+        raise NotImplementedError
+
+    def flush(self):
+        self.stats["flushes"] += 1
+
+    def newwin(self, height, width, begin_y, begin_x):
+        raise NotImplementedError
+
+    def doupdate(self):
+        self.stats["updates"] += 1
+
+
+class NullBackend(RenderBackend):
+    """Discards everything; only keeps counters."""
+
+    def __init__(self, rows=24, cols=80):
+        super().__init__()
+        self.rows, self.cols = rows, cols
+
+    def size(self):
+        return (self.rows, self.cols)
+
+    def write(self, text):
+        self.stats["chars"] += len(text)
+        self.stats["writes"] += 1
+
+    def newwin(self, height, width, begin_y, begin_x):
+        return VirtualWindow(height, width, begin_y, begin_x)
+
+
+class VirtualScreenBackend(RenderBackend):
+    """
+    In-memory terminal: a rows x cols grid of (char, attr) cells. write()
+    understands newlines, carriage returns, clear-screen/home and SGR colour
+    sequences; windows are composited onto the grid on noutrefresh().
+    """
+
+    def __init__(self, rows=24, cols=80):
+        super().__init__()
+        self.rows, self.cols = rows, cols
+        self.cursor_y = self.cursor_x = 0
+        self.sgr = ""
+        self.clear()
+
+    def size(self):
+        return (self.rows, self.cols)
+
+    def clear(self):
+        self.cells = [[(" ", "")] * self.cols for _ in range(self.rows)]
+        self.cursor_y = self.cursor_x = 0
+
+    def _newline(self):
+        self.cursor_x = 0
+        self.cursor_y += 1
+        if self.cursor_y >= self.rows:
+            self.cells.pop(0)
+            self.cells.append([(" ", "")] * self.cols)
+            self.cursor_y = self.rows - 1
+
+    def write(self, text):
+        self.stats["chars"] += len(text)
+        self.stats["writes"] += 1
+        pos = 0
+        for match in ANSI_SEQUENCE.finditer(text):
+            self._write_plain(text[pos:match.start()])
+            self._control(match.group(1), match.group(2))
+            pos = match.end()
+        self._write_plain(text[pos:])
+
+    def _control(self, params, command):
+        if command == "m":
+            self.sgr = "" if params in ("", "0") else params
+        elif command == "J" and params == "2":
+            self.clear()
+        elif command == "H":
+            parts = [int(p) for p in params.split(";") if p.isdigit()]
+            self.cursor_y = min(self.rows - 1, (parts[0] - 1) if parts else 0)
+            self.cursor_x = min(self.cols - 1, (parts[1] - 1) if len(parts) > 1 else 0)
+
+    def _write_plain(self, text):
+        for char in text:
+            if char == "\n":
+                self._newline()
+            elif char == "\r":
+                self.cursor_x = 0
+            else:
+                if self.cursor_x >= self.cols:
+                    self._newline()
+                self.cells[self.cursor_y][self.cursor_x] = (char, self.sgr)
+                self.cursor_x += 1
+
+    def newwin(self, height, width, begin_y, begin_x):
+        return VirtualWindow(height, width, begin_y, begin_x, screen=self)
+
+    def blit(self, win):
+        for row in range(win.height):
+            y = win.begin_y + row
+            if not 0 <= y < self.rows:
+                continue
+            for col in range(win.width):
+                x = win.begin_x + col
+                if 0 <= x < self.cols:
+                    self.cells[y][x] = win.cells[row][col]
+
+    def lines(self):
+        """Current frame as plain text, one string per row (trailing blanks kept)."""
+        return ["".join(char for char, _ in row) for row in self.cells]
+
+    def frame(self):
+        """Current frame as a single string with trailing blanks stripped, for golden comparisons."""
+        return "\n".join(line.rstrip() for line in self.lines()).rstrip("\n")
+
+
+class AnsiStreamBackend(RenderBackend):
+    """
+    Writes straight to a text stream (sys.stdout by default). Windows are drawn
+    on an internal VirtualScreenBackend and doupdate() emits only the rows that
+    changed since the previous update, using cursor-positioning sequences.
+    """
+
+    def __init__(self, stream=None):
+        super().__init__()
+        self.stream = stream or sys.stdout
+        self.screen = None
+        self.emitted = []
+
+    def size(self):
+        size = shutil.get_terminal_size((80, 20))
+        return (size.lines, size.columns)
+
+    def write(self, text):
+        self.stats["chars"] += len(text)
+        self.stats["writes"] += 1
+        self.stream.write(text)
+
+    def flush(self):
+        super().flush()
+        self.stream.flush()
+
+    def newwin(self, height, width, begin_y, begin_x):
+        rows, cols = self.size()
+        if self.screen is None or self.screen.size() != (rows, cols):
+            self.screen = VirtualScreenBackend(rows, cols)
+            self.emitted = []
+        return self.screen.newwin(height, width, begin_y, begin_x)
+
+    def doupdate(self):
+        super().doupdate()
+        if self.screen is None:
+            return
+        lines = self.screen.lines()
+        for row, line in enumerate(lines):
+            if row < len(self.emitted) and self.emitted[row] == line:
+                continue
+            self.write(f"\x1b[{row + 1};1H{line}")
+        self.emitted = lines
+        self.flush()
+
+
+class CursesBackend(RenderBackend):
+    """The real curses screen."""
+
+    def __init__(self, stdscr):
+        super().__init__()
+        self.stdscr = stdscr
+
+    def size(self):
+        return self.stdscr.getmaxyx()
+
+    def write(self, text):
+        self.stats["chars"] += len(text)
+        self.stats["writes"] += 1
+        try:
+            self.stdscr.addstr(ANSI_SEQUENCE.sub("", text))
+        except error:
+            pass
+
+    def flush(self):
+        super().flush()
+        self.stdscr.refresh()
+
+    def newwin(self, height, width, begin_y, begin_x):
+        return curses.newwin(height, width, begin_y, begin_x)
+
+    def doupdate(self):
+        super().doupdate()
+        curses.doupdate()
+
+
+BACKENDS = {
+    "ansi": AnsiStreamBackend,
+    "virtual": VirtualScreenBackend,
+    "null": NullBackend,
+}
+
+
+def make_backend(name, **kwargs):
+    """Builds a stream-capable backend by name ('ansi', 'virtual' or 'null')."""
+    try:
+        return BACKENDS[name](**kwargs)
+    except KeyError:
+        raise ValueError(f"Unknown render backend '{name}'. Choose from: {', '.join(BACKENDS)}")
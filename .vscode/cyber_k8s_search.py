@@ -0,0 +1,640 @@
+# ==============================================================================
+# Cyber K8s Search - Inverted index over the persistent cluster log
+# ==============================================================================
+# Shared helpers for the Cyber K8s tools. colima-k8s-persistent.sh appends one
+# snapshot per cycle ("=== <date> ===" followed by "--- Section ---" blocks) to
+# /tmp/colima-k8s-persistent.log. This module indexes that log incrementally:
+#
+# - Each complete snapshot gets an id, its byte offset, epoch and segment,
+#   kept in packed arrays (SnapshotTable, 18 bytes per snapshot); the
+#   timestamp text is read back from the log when a result is shown.
+# - Every token (pod names, namespaces, IPs, statuses, ...) maps to a posting
+#   list of (snapshot, section) pairs, stored delta/varint encoded.
+# - The index lives next to the log ("<log>.idx"): a zlib-compressed header
+#   (vocabulary, segments) and snapshot table, then the raw posting lists.
+#   Only the vocabulary stays in memory; a query reads the posting lists of
+#   its terms from the file, and postings added since the last save (at most
+#   MAX_PENDING_POSTING_BYTES, flushed while a large backlog is indexed) are
+#   appended to them. Reopening resumes from the last indexed byte offset.
+# - The log is rotated by size ("<log>.<epoch>", plus "<log>.bak" from the
+#   script's start) and rotated copies are kept for LOG_RETENTION_DAYS. The index follows the inode of the current log into its
+#   rotated name, so earlier snapshots stay searchable; once pruned segments
+#   hold most of the snapshots the index is rebuilt from what is left.
+#
+# Queries intersect posting lists and jump straight to the byte offset of the
+# matching snapshots, so answering "when did pod X start restarting" never
+# rescans the log. Interactive callers use IndexWorker, which builds and
+# updates the index and answers queries on a background thread.
+# ==============================================================================
+
+import glob
+import json
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from array import array
+from bisect import bisect_left
+
+from cyber_k8s_index import SNAPSHOT_HEADER, split_sections
+
+INDEX_MAGIC = b"CK8SIDX3"
+INDEX_SUFFIX = ".idx"
+DEFAULT_LOG_PATH = "/tmp/colima-k8s-persistent.log"
+DEFAULT_UPDATE_INTERVAL_SEC = 60 # IndexWorker catch-up interval while no query is pending
+MAX_PENDING_POSTING_BYTES = 4 * 1024 * 1024 # Postings held in memory before they are written to the index file
+
+# Posting = snapshot_id * SECTION_SLOTS + section_id
+SECTION_SLOTS = 256
+
+TOKEN_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9._:/\-]*")
+SNAPSHOT_TIME_FORMATS = ("%a %b %d %H:%M:%S %Z %Y", "%a %d %b %Y %H:%M:%S %Z", "%a %b %d %H:%M:%S %Y")
+
+
+def tokenize(line):
+    """Lower-cased search tokens of a line; skips pure numbers and one-character noise."""
+    tokens = set()
+    for raw in TOKEN_PATTERN.findall(line):
+        token = raw.rstrip(".:/-").lower()
+        if len(token) < 2 or token.isdigit():
+            continue
+        tokens.add(token)
+    return tokens
+
+
+def parse_snapshot_time(text):
+    """Best-effort epoch seconds for a '=== $(date) ===' header, None if unknown."""
+    for fmt in SNAPSHOT_TIME_FORMATS:
+        try:
+            return time.mktime(time.strptime(text.strip(), fmt))
+        except ValueError:
+            continue
+    return None
+
+
+def encode_varints(values, previous=0):
+    """Delta + LEB128 encoding of an increasing integer list."""
+    out = bytearray()
+    for value in values:
+        delta = value - previous
+        previous = value
+        while True:
+            byte = delta & 0x7F
+            delta >>= 7
+            if delta:
+                out.append(byte | 0x80)
+            else:
+                out.append(byte)
+                break
+    return bytes(out)
+
+
+def decode_varints(data):
+    """Inverse of encode_varints()."""
+    values = []
+    current = shift = value = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        current += value
+        values.append(current)
+        value = shift = 0
+    return values
+
+
+class SearchHit:
+    __slots__ = ("snapshot", "section", "epoch", "offset")
+
+    def __init__(self, snapshot, section, epoch, offset):
+        self.snapshot = snapshot
+        self.section = section
+        self.epoch = epoch
+        self.offset = offset
+
+
+class SnapshotTable:
+    """Per-snapshot (byte offset, epoch, segment id) in packed arrays; an unknown epoch is stored as NaN."""
+    __slots__ = ("offsets", "epochs", "segments")
+
+    def __init__(self):
+        self.offsets = array("q")
+        self.epochs = array("d")
+        self.segments = array("H")
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, snapshot_id):
+        epoch = self.epochs[snapshot_id]
+        return self.offsets[snapshot_id], (None if epoch != epoch else epoch), self.segments[snapshot_id]
+
+    def append(self, offset, epoch, segment):
+        self.offsets.append(offset)
+        self.epochs.append(float("nan") if epoch is None else epoch)
+        self.segments.append(segment)
+
+    def nbytes(self):
+        return sum(column.itemsize * len(column) for column in (self.offsets, self.epochs, self.segments))
+
+    def to_bytes(self):
+        return self.offsets.tobytes() + self.epochs.tobytes() + self.segments.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data, count):
+        table = cls()
+        position = 0
+        for column in (table.offsets, table.epochs, table.segments):
+            end = position + column.itemsize * count
+            column.frombytes(data[position:end])
+            position = end
+        if position != len(data):
+            raise ValueError("snapshot table size mismatch")
+        return table
+
+
+class LogIndex:
+    """Incrementally maintained inverted index for one persistent log file."""
+
+    def __init__(self, log_path=DEFAULT_LOG_PATH, index_path=None, max_pending_bytes=MAX_PENDING_POSTING_BYTES):
+        self.log_path = log_path
+        self.index_path = index_path or log_path + INDEX_SUFFIX
+        self.max_pending_bytes = max_pending_bytes
+        self._file = None
+        self.reset()
+
+    def reset(self):
+        self.close()
+        self.meta = {"inode": None, "device": None, "offset": 0}
+        self.segments = []      # segment id -> [path, inode, device]; the last one is the live log
+        self.sections = []      # section id -> name
+        self.snapshots = SnapshotTable()
+        self.terms = {}         # token -> [stored begin, stored length, pending bytes, last posting]
+        self.vocabulary = None  # sorted token list, built lazily for prefix queries
+        self.pending_bytes = 0  # Postings not yet written to the index file
+        self._postings_base = 0 # File offset of the first stored posting list
+        self.dirty = False
+
+    def close(self):
+        """Closes the index file the stored postings are read from."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # --- persistence ---
+    def load(self):
+        """Loads the on-disk index (vocabulary and snapshot table); a missing or unreadable index starts empty."""
+        self.reset()
+        try:
+            f = open(self.index_path, "rb")
+        except OSError:
+            return False
+        try:
+            if f.read(len(INDEX_MAGIC)) != INDEX_MAGIC:
+                raise ValueError("bad magic")
+            header_len, = struct.unpack(">I", f.read(4))
+            header = json.loads(zlib.decompress(f.read(header_len)))
+            table_len, = struct.unpack(">I", f.read(4))
+            snapshots = SnapshotTable.from_bytes(zlib.decompress(f.read(table_len)), header["snapshots"])
+        except (ValueError, KeyError, struct.error, zlib.error):
+            f.close()
+            return False
+        self.meta = header["meta"]
+        self.segments = header["segments"]
+        self.sections = header["sections"]
+        self.snapshots = snapshots
+        for token, begin, length, last in header["terms"]:
+            self.terms[token] = [begin, length, b"", last]
+        self._file, self._postings_base = f, f.tell()
+        return True
+
+    def _stored_postings(self, entry):
+        if not entry[1]:
+            return b""
+        self._file.seek(self._postings_base + entry[0])
+        return self._file.read(entry[1])
+
+    def save(self):
+        """
+        Writes the index atomically (temp file + rename): stored postings are
+        copied from the current file with the pending ones appended. The new
+        file stays open for queries.
+        """
+        terms = []
+        position = 0
+        for token, (_, length, pending, last) in self.terms.items():
+            terms.append([token, position, length + len(pending), last])
+            position += length + len(pending)
+        header = zlib.compress(json.dumps({
+            "meta": self.meta,
+            "segments": self.segments,
+            "sections": self.sections,
+            "snapshots": len(self.snapshots),
+            "terms": terms,
+        }, separators=(",", ":")).encode("utf-8"))
+        table = zlib.compress(self.snapshots.to_bytes())
+        tmp_path = self.index_path + ".tmp"
+        f = open(tmp_path, "w+b")
+        try:
+            f.write(INDEX_MAGIC + struct.pack(">I", len(header)) + header + struct.pack(">I", len(table)) + table)
+            postings_base = f.tell()
+            for entry in self.terms.values():
+                f.write(self._stored_postings(entry) + entry[2])
+            f.flush()
+            os.replace(tmp_path, self.index_path)
+        except BaseException:
+            f.close()
+            raise
+        self.close()
+        self._file, self._postings_base = f, postings_base
+        for entry, (_, begin, length, _) in zip(self.terms.values(), terms):
+            entry[0], entry[1], entry[2] = begin, length, b""
+        self.pending_bytes = 0
+        self.dirty = False
+
+    # --- indexing ---
+    def _section_id(self, name):
+        try:
+            return self.sections.index(name)
+        except ValueError:
+            if len(self.sections) >= SECTION_SLOTS:
+                return SECTION_SLOTS - 1 # Overflow bucket; never expected in practice
+            self.sections.append(name)
+            return len(self.sections) - 1
+
+    def _add_snapshot(self, offset, timestamp, lines):
+        snapshot_id = len(self.snapshots)
+        self.snapshots.append(offset, parse_snapshot_time(timestamp), len(self.segments) - 1)
+        postings = {}
+        for title, section_lines in split_sections(lines):
+            section_id = self._section_id(title)
+            for line in section_lines:
+                for token in tokenize(line):
+                    postings.setdefault(token, set()).add(section_id)
+        for token, section_ids in postings.items():
+            values = [snapshot_id * SECTION_SLOTS + sid for sid in sorted(section_ids)]
+            entry = self.terms.get(token)
+            if entry is None:
+                encoded = encode_varints(values)
+                self.terms[token] = [0, 0, encoded, values[-1]]
+                self.vocabulary = None
+            else:
+                encoded = encode_varints(values, entry[3])
+                entry[2] += encoded
+                entry[3] = values[-1]
+            self.pending_bytes += len(encoded)
+        self.dirty = True
+
+    def rotated_paths(self):
+        """Rotated copies of the log ("<log>.<epoch>", "<log>.bak"), oldest first."""
+        paths = []
+        for path in glob.glob(glob.escape(self.log_path) + ".*"):
+            if path.endswith((INDEX_SUFFIX, ".tmp")):
+                continue
+            try:
+                paths.append((os.stat(path).st_mtime, path))
+            except OSError:
+                continue
+        return [path for _, path in sorted(paths)]
+
+    def _start_segment(self, path, stat):
+        self.segments.append([path, stat.st_ino, stat.st_dev])
+        self.meta.update({"inode": stat.st_ino, "device": stat.st_dev, "offset": 0})
+        self.dirty = True
+
+    def _index_file(self, path, final):
+        """
+        Indexes the complete snapshots of the current segment from meta offset.
+        With final (a rotated file that no longer grows) the last snapshot is
+        indexed too.
+        """
+        added = 0
+        with open(path, "rb") as f:
+            f.seek(self.meta["offset"])
+            snapshot_offset = None
+            snapshot_time = None
+            snapshot_lines = []
+            position = self.meta["offset"]
+            for raw in f:
+                if not raw.endswith(b"\n") and not final:
+                    break # Partial last line, wait for the writer to finish it
+                line = raw.decode("utf-8", errors="replace").rstrip("\n")
+                match = SNAPSHOT_HEADER.match(line)
+                if match:
+                    if snapshot_offset is not None:
+                        self._add_snapshot(snapshot_offset, snapshot_time, snapshot_lines)
+                        added += 1
+                    # Everything before this header is now indexed
+                    self.meta["offset"] = position
+                    if self.pending_bytes > self.max_pending_bytes:
+                        self.save() # A consistent point: a reopened index resumes right here
+                    snapshot_offset, snapshot_time, snapshot_lines = position, match.group(1).strip(), []
+                elif snapshot_offset is not None:
+                    snapshot_lines.append(line)
+                position += len(raw)
+            if final:
+                if snapshot_offset is not None:
+                    self._add_snapshot(snapshot_offset, snapshot_time, snapshot_lines)
+                    added += 1
+                self.meta["offset"] = position
+        # The trailing snapshot of the live log may still be growing; it is searched linearly (see tail_hits)
+        return added
+
+    def _index_rotated(self, paths):
+        added = 0
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                self._start_segment(path, stat)
+                added += self._index_file(path, final=True)
+            except OSError:
+                continue
+        return added
+
+    def _segment_alive(self, segment):
+        path, inode, device = segment
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        return (stat.st_ino, stat.st_dev) == (inode, device)
+
+    def gone_segments(self):
+        """Ids of rotated segments that were pruned (or replaced) on disk."""
+        return {i for i, segment in enumerate(self.segments[:-1]) if not self._segment_alive(segment)}
+
+    def update(self):
+        """
+        Indexes complete snapshots appended since the last call. Returns the
+        number of new snapshots. When the log was rotated, the old segment is
+        finished under its rotated name (plus any segment rotated since); a log
+        that was replaced or truncated otherwise restarts the index.
+        """
+        try:
+            stat = os.stat(self.log_path)
+        except OSError:
+            return 0
+        added = 0
+        if self.meta["inode"] is not None and (self.meta["inode"], self.meta["device"]) != (stat.st_ino, stat.st_dev):
+            rotated = self.rotated_paths()
+            old = next((i for i, path in enumerate(rotated)
+                        if self._segment_alive([path, self.meta["inode"], self.meta["device"]])), None)
+            if old is None:
+                self.reset()
+            else:
+                self.segments[-1][0] = rotated[old]
+                added += self._index_file(rotated[old], final=True)
+                added += self._index_rotated(rotated[old + 1:])
+                self._start_segment(self.log_path, stat)
+        elif stat.st_size < self.meta["offset"]:
+            self.reset()
+        if self.meta["inode"] is None:
+            # Fresh index: pick up the history that was already rotated away
+            added += self._index_rotated(self.rotated_paths())
+            self._start_segment(self.log_path, stat)
+        gone = self.gone_segments()
+        if gone and 2 * sum(1 for segment in self.snapshots.segments if segment in gone) > len(self.snapshots):
+            # Most postings point at pruned segments; rebuild from what is left on disk
+            self.reset()
+            return self.update()
+        if stat.st_size != self.meta["offset"]:
+            added += self._index_file(self.log_path, final=False)
+        return added
+
+    # --- querying ---
+    def _postings(self, term):
+        """Sorted postings for a term; 'prefix*' unions all tokens with that prefix."""
+        term = term.lower()
+        if term.endswith("*"):
+            prefix = term[:-1]
+            if self.vocabulary is None:
+                self.vocabulary = sorted(self.terms)
+            merged = set()
+            for i in range(bisect_left(self.vocabulary, prefix), len(self.vocabulary)):
+                token = self.vocabulary[i]
+                if not token.startswith(prefix):
+                    break
+                entry = self.terms[token]
+                merged.update(decode_varints(self._stored_postings(entry) + entry[2]))
+            return merged
+        entry = self.terms.get(term)
+        return set(decode_varints(self._stored_postings(entry) + entry[2])) if entry else set()
+
+    def _posting_size(self, term):
+        entry = self.terms.get(term.lower())
+        return entry[1] + len(entry[2]) if entry else 0
+
+    def search(self, query, section=None):
+        """Returns SearchHits (oldest first) for snapshot sections containing every query term."""
+        terms = [t for t in query.split() if t.strip("*")]
+        if not terms:
+            return []
+        postings = None
+        for term in sorted(terms, key=self._posting_size):
+            found = self._postings(term)
+            postings = found if postings is None else postings & found
+            if not postings:
+                return []
+        hits = []
+        gone = self.gone_segments()
+        for posting in sorted(postings):
+            snapshot_id, section_id = divmod(posting, SECTION_SLOTS)
+            name = self.sections[section_id]
+            if section and name != section:
+                continue
+            offset, epoch, segment = self.snapshots[snapshot_id]
+            if segment in gone:
+                continue
+            hits.append(SearchHit(snapshot_id, name, epoch, offset))
+        return hits
+
+    def timestamp(self, snapshot_id):
+        """The '=== <date> ===' text of a snapshot, read from its header line in the log."""
+        offset, _, segment = self.snapshots[snapshot_id]
+        try:
+            with open(self.segments[segment][0], "rb") as f:
+                f.seek(offset)
+                line = f.readline(4096).decode("utf-8", errors="replace").rstrip("\n")
+        except OSError:
+            return "" # Segment pruned since the search
+        match = SNAPSHOT_HEADER.match(line)
+        return match.group(1).strip() if match else ""
+
+    def snapshot_lines(self, snapshot_id):
+        """Reads one snapshot straight from its byte offset in its segment."""
+        start, _, segment = self.snapshots[snapshot_id]
+        following = self.snapshots[snapshot_id + 1] if snapshot_id + 1 < len(self.snapshots) else None
+        if following is not None and following[2] == segment:
+            end = following[0]
+        elif segment == len(self.segments) - 1:
+            end = self.meta["offset"]
+        else:
+            end = None # Last snapshot of a rotated segment runs to the end of the file
+        try:
+            with open(self.segments[segment][0], "rb") as f:
+                f.seek(start)
+                data = f.read() if end is None else f.read(max(0, end - start))
+        except OSError:
+            return [] # Segment pruned since the search
+        return data.decode("utf-8", errors="replace").splitlines()
+
+    def matching_lines(self, hit, query):
+        """Lines of the hit's section that contain any query term (prefix terms match substrings)."""
+        needles = [t.lower().rstrip("*") for t in query.split() if t.strip("*")]
+        for title, lines in split_sections(self.snapshot_lines(hit.snapshot)[1:]):
+            if title == hit.section:
+                return [line for line in lines if any(n in line.lower() for n in needles)]
+        return []
+
+    def tail_hits(self, query, section=None):
+        """Linear scan of the not-yet-indexed trailing snapshot: [(section, timestamp, line)]."""
+        needles = [t.lower().rstrip("*") for t in query.split() if t.strip("*")]
+        if not needles:
+            return []
+        try:
+            with open(self.log_path, "rb") as f:
+                f.seek(self.meta["offset"])
+                lines = f.read().decode("utf-8", errors="replace").splitlines()
+        except OSError:
+            return []
+        if not lines or not SNAPSHOT_HEADER.match(lines[0]):
+            return []
+        timestamp = SNAPSHOT_HEADER.match(lines[0]).group(1).strip()
+        results = []
+        for title, section_lines in split_sections(lines[1:]):
+            if section and title != section:
+                continue
+            text = "\n".join(section_lines).lower()
+            if all(n in text for n in needles):
+                results.extend((title, timestamp, line) for line in section_lines if any(n in line.lower() for n in needles))
+        return results
+
+
+def format_results(index, query, section=None, limit=20):
+    """Human-readable report: first/last seen, disappearance and the latest matching lines."""
+    hits = index.search(query, section=section)
+    tail = index.tail_hits(query, section=section)
+    out = [f"Query: {query}" + (f"  [section: {section}]" if section else ""),
+           f"Indexed snapshots: {len(index.snapshots)}  Matching sections: {len(hits) + len({t[0] for t in tail})}"]
+    if not hits and not tail:
+        out.append("No matches.")
+        return out
+    if hits:
+        out.append(f"First seen: {index.timestamp(hits[0].snapshot)}")
+        last = hits[-1]
+        out.append(f"Last seen:  {tail[0][1] if tail else index.timestamp(last.snapshot)}")
+        if not tail and last.snapshot + 1 < len(index.snapshots):
+            out.append(f"Gone since: {index.timestamp(last.snapshot + 1)}")
+    out.append("")
+    shown = 0
+    for title, timestamp, line in reversed(tail):
+        if shown >= limit:
+            break
+        out.append(f"[{timestamp}] {title}: {line.strip()}")
+        shown += 1
+    for hit in reversed(hits):
+        if shown >= limit:
+            break
+        timestamp = index.timestamp(hit.snapshot)
+        for line in index.matching_lines(hit, query):
+            out.append(f"[{timestamp}] {hit.section}: {line.strip()}")
+            shown += 1
+            if shown >= limit:
+                break
+    return out
+
+
+def open_index(log_path=DEFAULT_LOG_PATH):
+    """Loads the index for a log, catches up with new snapshots and persists it."""
+    index = LogIndex(log_path)
+    index.load()
+    if index.update() or index.dirty:
+        index.save()
+    return index
+
+
+class IndexWorker:
+    """
+    Owns a LogIndex on a background thread: builds or catches it up every
+    interval_sec and runs submitted queries there, so a UI thread never waits
+    on the log. Readers poll 'version' and render_lines().
+    """
+
+    def __init__(self, log_path=DEFAULT_LOG_PATH, interval_sec=DEFAULT_UPDATE_INTERVAL_SEC, limit=200):
+        self.log_path = log_path
+        self.interval_sec = interval_sec
+        self.limit = limit
+        self.index = None       # Only touched by the worker thread
+        self.ready = False      # True once the index has caught up with the log
+        self.error = None
+        self.query = None
+        self.results = None     # Report for 'query'; None while it is pending
+        self.version = 0
+        self.lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="cyber-k8s-search", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def submit(self, query):
+        """Queues a query (replacing any pending one); its report appears in render_lines()."""
+        with self.lock:
+            self.query = query
+            self.results = None
+            self.version += 1
+        self._wake.set()
+
+    def _catch_up(self):
+        try:
+            if self.index is None:
+                self.index = LogIndex(self.log_path)
+                self.index.load()
+            if self.index.update() or self.index.dirty:
+                self.index.save()
+            self.error = None
+        except Exception as e:
+            self.error = str(e)
+        if not self.ready:
+            self.ready = True
+            with self.lock:
+                self.version += 1
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._catch_up()
+            with self.lock:
+                query = self.query if self.results is None else None
+            if query is not None:
+                try:
+                    results = format_results(self.index, query, limit=self.limit)
+                except Exception as e:
+                    results = [f"Search failed: {e}"]
+                with self.lock:
+                    if self.query == query:
+                        self.results = results
+                        self.version += 1
+            self._wake.wait(self.interval_sec)
+            self._wake.clear()
+        if self.index is not None:
+            self.index.close()
+
+    def render_lines(self):
+        with self.lock:
+            query, results = self.query, self.results
+        if results is not None:
+            return list(results)
+        status = f"Indexing {self.log_path}..." if not self.ready else "Searching..."
+        lines = [f"Query: {query}", status] if query else [status]
+        return lines + ([f"Index error: {self.error}"] if self.error else [])
@@ -0,0 +1,301 @@
+# ==============================================================================
+# Cyber K8s Storage - Incremental persistent-volume usage scanner
+# ==============================================================================
+# Shared helpers for the Cyber K8s tools. Measures the 'pvc-*' folders under
+# K8S_POD_STORAGE_PATH (the ones backup-pvcs.sh archives) without re-walking
+# millions of files on every refresh.
+#
+# - Only the 'pvc-*' folders directly under the root are walked; other folders
+#   and files there are neither scanned nor counted.
+# - Every directory is cached as (mtime_ns, bytes and files directly inside,
+#   subdirectory names); the cache is kept on disk between runs.
+# - A rescan stats each directory once and only lists (os.scandir) and stats
+#   the files of directories whose mtime changed. Files growing in place do
+#   not touch their directory's mtime, so a full rescan runs periodically.
+# - Scans run in a background thread that yields the GIL regularly, so the UI
+#   thread stays responsive; on Linux the thread also runs at low OS priority.
+#   Totals are recomputed and the cache rewritten only when a directory was
+#   relisted.
+# - Reports per-PVC size, growth rate (bounded sample history) and the
+#   largest subtrees.
+# ==============================================================================
+
+import hashlib
+import heapq
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+from cyber_k8s_index import format_table
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.expanduser("~/.cache/cyber-k8s")
+CACHE_VERSION = 2                  # 2: only pvc-* folders are cached
+PVC_PREFIX = "pvc-"                # Folders measured under the root (the ones backup-pvcs.sh archives)
+
+DEFAULT_INTERVAL_SEC = 60          # Time between incremental scans
+DEFAULT_FULL_RESCAN_SEC = 3600     # Time between full rescans (catches files growing in place)
+DEFAULT_NICENESS = 19              # Scanner thread priority (best effort)
+GROWTH_SAMPLES = 120               # Size samples kept per PVC for the growth rate
+MIN_GROWTH_SPAN_SEC = 60           # Samples must span this long before a growth rate is shown
+SUBTREE_MAX_DEPTH = 3              # Depth below the storage root considered for "largest subtrees"
+YIELD_EVERY_DIRS = 200             # Directories scanned between two short sleeps (lets other threads run)
+
+
+def storage_root(env_file=None):
+    """K8S_POD_STORAGE_PATH from the environment or the repo's .env, with ~ expanded; None if unset."""
+    value = os.environ.get("K8S_POD_STORAGE_PATH")
+    if not value:
+        try:
+            with open(env_file or os.path.join(REPO_ROOT, ".env"), encoding="utf-8") as f:
+                for line in f:
+                    key, sep, raw = line.strip().partition("=")
+                    if sep and key.strip() == "K8S_POD_STORAGE_PATH":
+                        value = raw.split(" #", 1)[0].strip().strip("'\"")
+        except OSError:
+            return None
+    if not value or value == "null":
+        return None
+    return os.path.expanduser(value)
+
+
+def default_cache_path(root):
+    digest = hashlib.sha1(os.path.abspath(root).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(CACHE_DIR, f"storage-{digest}.json")
+
+
+def parse_pvc_name(folder):
+    """(namespace, claim) from a local-path folder name 'pvc-<uid>_<namespace>_<claim>'."""
+    parts = folder.split("_", 2)
+    if folder.startswith("pvc-") and len(parts) == 3:
+        return parts[1], parts[2]
+    return "", folder
+
+
+def format_bytes(value):
+    value = float(value)
+    for unit in ("B", "KiB", "MiB", "GiB", "TiB"):
+        if abs(value) < 1024 or unit == "TiB":
+            return f"{value:.0f}{unit}" if unit == "B" else f"{value:.1f}{unit}"
+        value /= 1024
+
+
+def disk_bytes(stat_result):
+    """Allocated size (what fills the disk); apparent size where st_blocks is not available."""
+    blocks = getattr(stat_result, "st_blocks", None)
+    return blocks * 512 if blocks is not None else stat_result.st_size
+
+
+class StorageScanner:
+    """Incremental du(1) over the pvc-* folders of the storage root, cached per directory."""
+
+    def __init__(self, root, cache_path=None, interval_sec=DEFAULT_INTERVAL_SEC,
+                 full_rescan_sec=DEFAULT_FULL_RESCAN_SEC, niceness=DEFAULT_NICENESS, clock=time.time):
+        self.root = os.path.abspath(root)
+        self.cache_path = cache_path or default_cache_path(self.root)
+        self.interval_sec = interval_sec
+        self.full_rescan_sec = full_rescan_sec
+        self.niceness = niceness
+        self.clock = clock
+        self.dirs = {}              # relative path -> [mtime_ns, bytes, files, [subdir names]]
+        self.totals = {}            # relative path -> (bytes, files) including subdirectories
+        self.history = {}           # PVC folder -> deque[(ts, bytes)]
+        self.lock = threading.Lock()  # Guards totals/history for readers on other threads
+        self.last_full_scan = 0.0
+        self.last_scan = None       # Stats of the latest scan
+        self.error = None
+        self.version = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self.load()
+
+    # --- persistent cache ---
+    def load(self):
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("version") != CACHE_VERSION or data.get("root") != self.root:
+            return False
+        self.dirs = data.get("dirs", {})
+        self.last_full_scan = data.get("last_full_scan", 0.0)
+        self.history = {pvc: deque(map(tuple, samples), maxlen=GROWTH_SAMPLES)
+                        for pvc, samples in data.get("history", {}).items()}
+        self._aggregate()
+        return True
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        data = {
+            "version": CACHE_VERSION,
+            "root": self.root,
+            "last_full_scan": self.last_full_scan,
+            "dirs": self.dirs,
+            "history": {pvc: list(samples) for pvc, samples in self.history.items()},
+        }
+        tmp_path = self.cache_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, self.cache_path)
+
+    # --- scanning ---
+    def scan(self, full=False):
+        """
+        Brings the cache up to date. Unchanged directories cost one stat();
+        only changed ones (or all, when full) are listed. Returns scan stats.
+        """
+        started = time.perf_counter()
+        stats = {"full": full, "dirs": 0, "rescanned": 0, "files_stat": 0}
+        fresh = {}
+        stack = [""]
+        while stack:
+            rel = stack.pop()
+            path = os.path.join(self.root, rel) if rel else self.root
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                continue # Deleted while scanning
+            stats["dirs"] += 1
+            cached = self.dirs.get(rel)
+            if cached is not None and not full and cached[0] == mtime_ns:
+                entry = cached
+            else:
+                entry = self._list_dir(path, mtime_ns, stats, pvcs_only=not rel)
+                stats["rescanned"] += 1
+            fresh[rel] = entry
+            stack.extend(os.path.join(rel, name) if rel else name for name in entry[3])
+            if stats["dirs"] % YIELD_EVERY_DIRS == 0:
+                time.sleep(0.001)
+        now = self.clock()
+        # With nothing relisted, fresh can only lack directories that vanished along with their parent
+        changed = full or stats["rescanned"] or len(fresh) != len(self.dirs)
+        with self.lock:
+            self.dirs = fresh # Directories that vanished are dropped here
+            if full:
+                self.last_full_scan = now
+            if changed:
+                self._aggregate()
+            for rel, (size, _) in self.totals.items():
+                if rel and os.sep not in rel:
+                    self.history.setdefault(rel, deque(maxlen=GROWTH_SAMPLES)).append((now, size))
+            for pvc in [pvc for pvc in self.history if pvc not in self.totals]:
+                del self.history[pvc]
+            stats["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            self.last_scan = stats
+            self.version += 1
+        if changed:
+            self.save() # Unchanged scans only add growth samples; they are written with the next change
+        return stats
+
+    def _list_dir(self, path, mtime_ns, stats, pvcs_only=False):
+        """With pvcs_only (the root), only 'pvc-*' subdirectories are kept and files are skipped."""
+        size, files, subdirs = 0, 0, []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if pvcs_only:
+                            if entry.name.startswith(PVC_PREFIX) and entry.is_dir(follow_symlinks=False):
+                                subdirs.append(entry.name)
+                        elif entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        else:
+                            size += disk_bytes(entry.stat(follow_symlinks=False))
+                            files += 1
+                            stats["files_stat"] += 1
+                    except OSError:
+                        continue
+        except OSError:
+            pass # Permission denied or vanished; counted as empty
+        return [mtime_ns, size, files, subdirs]
+
+    def _aggregate(self):
+        """Recomputes per-directory totals bottom-up (deepest paths first)."""
+        totals = {}
+        for rel in sorted(self.dirs, key=lambda r: r.count(os.sep) + (1 if r else 0), reverse=True):
+            _, size, files, subdirs = self.dirs[rel]
+            for name in subdirs:
+                child = totals.get(os.path.join(rel, name) if rel else name)
+                if child:
+                    size += child[0]
+                    files += child[1]
+            totals[rel] = (size, files)
+        self.totals = totals
+
+    # --- background thread ---
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="cyber-k8s-storage", daemon=True)
+            self._thread.start()
+        return self
+
+    def _lower_priority(self):
+        # Best effort, Linux only: there a native thread id is a valid PRIO_PROCESS target and only
+        # this thread is reniced. Elsewhere (macOS) the id is not a pid and os.nice() would renice the
+        # whole process, UI included, so the scanner keeps normal priority and relies on yielding.
+        if not sys.platform.startswith("linux"):
+            return
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), self.niceness)
+        except (AttributeError, OSError):
+            pass
+
+    def _run(self):
+        self._lower_priority()
+        while not self._stop.is_set():
+            try:
+                self.scan(full=self.clock() - self.last_full_scan >= self.full_rescan_sec)
+                self.error = None
+            except Exception as e:
+                self.error = str(e)
+            self._stop.wait(self.interval_sec)
+
+    def stop(self):
+        self._stop.set()
+
+    # --- reading (any thread) ---
+    def growth_per_hour(self, pvc):
+        samples = self.history.get(pvc)
+        if not samples or samples[-1][0] - samples[0][0] < MIN_GROWTH_SPAN_SEC:
+            return None
+        return (samples[-1][1] - samples[0][1]) * 3600 / (samples[-1][0] - samples[0][0])
+
+    def largest_subtrees(self, limit=10):
+        """Largest directories inside the PVCs (down to SUBTREE_MAX_DEPTH below the root)."""
+        with self.lock:
+            candidates = ((rel, total) for rel, total in self.totals.items()
+                          if 1 <= rel.count(os.sep) < SUBTREE_MAX_DEPTH)
+            return heapq.nlargest(limit, candidates, key=lambda item: item[1][0])
+
+    def render_lines(self, limit=10):
+        """Scan summary, the per-PVC table and the largest subtrees."""
+        if self.last_scan is None and not self.totals:
+            return [f"Scanning {self.root} ..."] + ([f"Scan error: {self.error}"] if self.error else [])
+        with self.lock:
+            pvcs = sorted(((rel, total) for rel, total in self.totals.items() if rel and os.sep not in rel),
+                          key=lambda item: item[1][0], reverse=True)
+            root_total = self.totals.get("", (0, 0))
+            scan = self.last_scan or {}
+            rows = []
+            for rel, (size, files) in pvcs:
+                namespace, claim = parse_pvc_name(rel)
+                growth = self.growth_per_hour(rel)
+                rows.append((namespace or "-", claim, format_bytes(size), str(files),
+                             f"{format_bytes(growth)}/h" if growth is not None else "-", rel))
+        lines = [f"Root: {self.root}  Total: {format_bytes(root_total[0])} in {root_total[1]} files",
+                 f"Last scan: {'full' if scan.get('full') else 'incremental'}  {scan.get('elapsed_ms', '-')} ms  "
+                 f"dirs {scan.get('dirs', 0)}  relisted {scan.get('rescanned', 0)}  files stat'ed {scan.get('files_stat', 0)}"]
+        if self.error:
+            lines.append(f"Scan error: {self.error}")
+        lines.append("")
+        lines.extend(format_table(("NAMESPACE", "NAME", "SIZE", "FILES", "GROWTH", "FOLDER"), rows)
+                     if rows else ["No volumes found."])
+        subtrees = [(format_bytes(size), str(files), rel) for rel, (size, files) in self.largest_subtrees(limit)]
+        if subtrees:
+            lines.extend(["", "LARGEST SUBTREES:"])
+            lines.extend(format_table(("SIZE", "FILES", "PATH"), subtrees))
+        return lines
@@ -0,0 +1,27 @@
+# Tests for the Cyber K8s tools. Run from the repository root:
+#   python -m pytest -q .vscode/tests
+import importlib.util
+import os
+import sys
+
+import pytest
+
+TOOLS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, TOOLS_DIR) # The cyber_k8s_* modules live next to the scripts
+
+
+@pytest.fixture(scope="session")
+def load_script():
+    """Imports one of the hyphen-named scripts (e.g. 'cyber-k8s-monitor') as a module."""
+    loaded = {}
+
+    def load(name):
+        if name not in loaded:
+            pytest.importorskip("art") # Both scripts render their banners with it
+            spec = importlib.util.spec_from_file_location(name.replace("-", "_"), os.path.join(TOOLS_DIR, f"{name}.py"))
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            loaded[name] = module
+        return loaded[name]
+
+    return load
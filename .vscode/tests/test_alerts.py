@@ -0,0 +1,112 @@
+from cyber_k8s_alerts import AlertEngine, compile_rules
+from cyber_k8s_buffers import SnapshotBuffer
+from cyber_k8s_index import TableIndex, format_table
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def engine_with(*specs):
+    rules, errors = compile_rules(specs)
+    assert not errors
+    clock = Clock()
+    return AlertEngine(rules, clock=clock), clock
+
+
+def usage_table(header, *nodes):
+    return format_table(header.split(), nodes)
+
+
+def snapshot(minute, header, *nodes):
+    lines = [f"=== Mon Oct 19 10:{minute:02d}:00 UTC 2026 ===", "--- Node Resource Usage ---"]
+    lines += usage_table(header, *nodes)
+    lines += ["--- INGRESS Status ---", "NAMESPACE   NAME   HOSTS", "default     web    web.local"]
+    return "\n".join(lines) + "\n"
+
+
+class Feed:
+    """The monitor's path: source output -> SnapshotBuffer -> complete snapshots -> engine."""
+
+    def __init__(self, engine):
+        self.engine, self.buffer, self.index, self.seen = engine, SnapshotBuffer(), TableIndex(), 0
+
+    def __call__(self, text):
+        self.buffer.feed(text)
+        new = self.buffer.snapshots - self.seen
+        self.seen = self.buffer.snapshots
+        for complete in list(self.buffer.history)[-new:] if new else []:
+            self.engine.observe_snapshot(self.index, complete)
+
+
+def firing(engine):
+    return sorted((name, key[1]) for name, key in engine.firing)
+
+
+def test_above_fires_after_cycles_dedupes_and_resolves():
+    engine, _ = engine_with({"name": "cpu", "kind": "above", "section": "Node Resource Usage",
+                             "field": "CPU(%)", "threshold": 80, "cycles": 2})
+    feed = Feed(engine)
+    header = "NAME CPU(cores) CPU(%)"
+    feed(snapshot(0, header, ("colima", "900m", "90%")))
+    feed(snapshot(1, header, ("colima", "950m", "95%")))
+    assert firing(engine) == [] # The first snapshot is only complete once the next one starts
+    feed(snapshot(2, header, ("colima", "920m", "92%")))
+    assert firing(engine) == [("cpu", "colima")]
+    version = engine.version
+    feed(snapshot(3, header, ("colima", "920m", "92%")))
+    assert firing(engine) == [("cpu", "colima")] and engine.version == version # Still firing: no duplicate
+    feed(snapshot(4, header, ("colima", "100m", "10%")))
+    assert firing(engine) == [("cpu", "colima")]
+    feed(snapshot(5, header, ("colima", "100m", "10%")))
+    assert firing(engine) == [] and [alert.rule for alert in engine.resolved] == ["cpu"]
+
+
+def test_percent_field_matches_both_spellings():
+    engine, _ = engine_with({"name": "memory", "kind": "above", "section": "Node Resource Usage",
+                             "field": "MEMORY(%)", "threshold": 90})
+    engine.observe_snapshot(TableIndex(), snapshot(0, "NAME CPU% MEMORY%", ("colima", "10%", "95%")))
+    assert firing(engine) == [("memory", "colima")]
+
+
+def test_half_written_sections_neither_resolve_nor_fire():
+    engine, _ = engine_with({"name": "ingress-gone", "kind": "disappeared", "section": "INGRESS Status",
+                             "grace_cycles": 0},
+                            {"name": "cpu", "kind": "above", "section": "Node Resource Usage",
+                             "field": "CPU(%)", "threshold": 80})
+    feed = Feed(engine)
+    header = "NAME CPU(cores) CPU(%)"
+    feed(snapshot(0, header, ("colima", "900m", "90%")))
+    feed(snapshot(1, header, ("colima", "900m", "90%")))
+    assert firing(engine) == [("cpu", "colima")]
+    # The next snapshot arrives in pieces: the usage header without rows, then an empty INGRESS table
+    rows = usage_table(header, ("colima", "900m", "90%"))
+    feed("=== Mon Oct 19 10:02:00 UTC 2026 ===\n--- Node Resource Usage ---\n" + rows[0] + "\n")
+    feed(rows[1] + "\n--- INGRESS Status ---\nNAMESPACE   NAME   HOSTS\n")
+    assert firing(engine) == [("cpu", "colima")] and engine.cycle == 2 # Not resolved, not counted
+    feed("default     web    web.local\n")
+    feed(snapshot(3, header, ("colima", "900m", "90%")))
+    assert firing(engine) == [("cpu", "colima")] and engine.cycle == 3
+    assert list(engine.resolved) == [] # The half-written INGRESS table never looked like a removal
+
+
+def test_disappeared_and_restarts_rules():
+    engine, clock = engine_with({"name": "ingress-gone", "kind": "disappeared", "section": "INGRESS Status"},
+                                {"name": "restarts", "kind": "restarts", "section": "Active Pods",
+                                 "increase": 2, "window_min": 10})
+    index = TableIndex()
+    pods = "--- Active Pods ---\nNAMESPACE   NAME    READY   STATUS    RESTARTS\ndefault     web-1   1/1     Running   {}\n"
+    ingress = "--- INGRESS Status ---\nNAMESPACE   NAME\n"
+    engine.observe_snapshot(index, "=== one ===\n" + pods.format(0) + ingress + "default     web\n")
+    clock.now += 60
+    engine.observe_snapshot(index, "=== two ===\n" + pods.format(5) + ingress)
+    assert firing(engine) == [("restarts", "web-1")] # Gone once: still within the grace cycle
+    engine.observe_snapshot(index, "=== three ===\n" + pods.format(5) + ingress)
+    assert firing(engine) == [("ingress-gone", "web"), ("restarts", "web-1")]
+    clock.now += 11 * 60
+    engine.tick()
+    assert firing(engine) == [("ingress-gone", "web")] # The restarts left the window
@@ -0,0 +1,91 @@
+import os
+
+from cyber_k8s_buffers import LRUCache, LogFollower, PipeReader, RotatingCapture, SnapshotBuffer
+
+
+def test_follower_starts_at_last_snapshot_and_follows_rotation(tmp_path):
+    log = str(tmp_path / "cluster.log")
+    with open(log, "w") as f:
+        f.write("=== one ===\n--- Nodes ---\nold\n=== two ===\n--- Nodes ---\n")
+    follower = LogFollower(log)
+    assert follower.read_available() == "=== two ===\n--- Nodes ---\n"
+    assert follower.read_available() == ""
+    with open(log, "a") as f:
+        f.write("colima   Ready")
+    assert follower.read_available() == "colima   Ready"
+    os.rename(log, log + ".1700000000") # colima-k8s-persistent.sh rotation
+    assert follower.read_available() == "" # New log not written yet
+    with open(log, "w") as f:
+        f.write("\n=== three ===\n")
+    assert follower.read_available() == "\n=== three ===\n"
+    assert follower.rotations == 1
+    with open(log, "w") as f: # Truncated in place
+        f.write("=== four ===\n")
+    assert follower.read_available() == "=== four ===\n"
+    follower.close()
+
+
+def test_follower_waits_for_the_log(tmp_path):
+    log = str(tmp_path / "cluster.log")
+    follower = LogFollower(log)
+    assert follower.read_available() == ""
+    with open(log, "w") as f:
+        f.write("starting colima\n")
+    assert follower.read_available() == "" # No snapshot yet: only new output is read
+    with open(log, "a") as f:
+        f.write("=== one ===\n")
+    assert follower.read_available() == "=== one ===\n"
+
+
+def test_snapshot_buffer_keeps_only_the_latest_complete_snapshots():
+    buffer = SnapshotBuffer(history_size=2)
+    assert not buffer.feed("")
+    assert buffer.feed("=== one ===\n--- Nodes ---\ncolima   Rea") and buffer.snapshots == 0
+    assert buffer.text() == "=== one ===\n--- Nodes ---" # The partial line waits for its newline
+    buffer.feed("dy\n=== two ===\n")
+    assert buffer.snapshots == 1 and buffer.latest() == "=== one ===\n--- Nodes ---\ncolima   Ready"
+    assert buffer.text() == buffer.latest() + "\n=== two ==="
+    for name in ("three", "four"):
+        buffer.feed(f"--- Nodes ---\n{name}\n=== {name} ===\n")
+    assert buffer.snapshots == 3 and len(buffer.history) == 2
+    assert buffer.latest() == "=== three ===\n--- Nodes ---\nfour"
+    assert buffer.retained_chars() == sum(len(s) for s in buffer.history) + len("=== four ===\n")
+
+
+def test_pipe_reader_never_blocks_and_decodes_split_characters():
+    read_fd, write_fd = os.pipe()
+    with os.fdopen(read_fd, "rb", buffering=0) as pipe:
+        reader = PipeReader(pipe)
+        assert reader.read_available() == "" # Nothing written yet: returns at once
+        os.write(write_fd, "café".encode()[:-1])
+        assert reader.read_available() == "caf" # Half a UTF-8 character is held back
+        os.write(write_fd, "é".encode()[-1:] + b" ok\n")
+        assert reader.read_available() == "é ok\n" and reader.bytes_read == 9
+        os.close(write_fd)
+        assert reader.read_available() == "" and reader.eof
+
+
+def test_rotating_capture_stays_within_its_budget(tmp_path):
+    path = str(tmp_path / "capture.tmp")
+    capture = RotatingCapture(path, max_bytes=10, keep=1)
+    capture.write("12345")
+    capture.write("67890") # Reaches max_bytes: rotated to '.1'
+    capture.write("abc")
+    assert capture.rotations == 1 and capture.size == 3
+    assert open(path + ".1").read() == "1234567890" and open(path).read() == "abc"
+    capture.write("defghijklm")
+    assert capture.rotations == 2 and open(path + ".1").read() == "abcdefghijklm"
+    assert not os.path.exists(path + ".2")
+    capture.close(remove=True)
+    assert not os.path.exists(path) and not os.path.exists(path + ".1")
+
+
+def test_lru_cache_evicts_the_least_recently_used():
+    cache = LRUCache(2)
+    cache["a"], cache["b"] = 1, 2
+    assert cache["a"] == 1 # 'a' is now the most recent
+    cache["c"] = 3
+    assert list(cache) == ["a", "c"] and cache.evicted == 1
+    assert cache.get("b") is None and cache.get("a") == 1
+    cache["d"] = 4
+    assert list(cache) == ["a", "d"] and cache.evicted == 2
@@ -0,0 +1,31 @@
+from cyber_k8s_events import EventAggregator
+
+BACKOFF = "default\tweb.17f\tPod/web\tWarning\tBackOff\t{count}\tBack-off restarting failed container\n"
+PULLED = "default\tweb.17a\tPod/web\tNormal\tPulled\t1\tContainer image already present\n"
+
+
+def total(aggregator, reason):
+    return sum(g.count for key, g in aggregator.groups.items() if key[2] == reason)
+
+
+def test_relist_after_reconnect_does_not_inflate_counts():
+    aggregator = EventAggregator(clock=lambda: 1000.0)
+    for line in (PULLED, BACKOFF.format(count=5)):
+        aggregator.feed_line(line)
+    version = aggregator.version
+    # The watch reconnects and re-lists every event with its current count
+    for line in (PULLED, BACKOFF.format(count=5)):
+        aggregator.feed_line(line)
+    assert total(aggregator, "BackOff") == 5
+    assert total(aggregator, "Pulled") == 1
+    assert aggregator.version == version # Nothing new to render
+    aggregator.feed_line(BACKOFF.format(count=6))
+    assert total(aggregator, "BackOff") == 6
+    assert aggregator.total_events == 7
+
+
+def test_lower_count_starts_a_new_series():
+    aggregator = EventAggregator(clock=lambda: 1000.0)
+    aggregator.feed_line(BACKOFF.format(count=5))
+    aggregator.feed_line(BACKOFF.format(count=2)) # Event object recreated with the same name
+    assert total(aggregator, "BackOff") == 7
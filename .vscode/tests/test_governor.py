@@ -0,0 +1,55 @@
+import time
+
+from cyber_k8s_governor import ChangeDetector, Governor
+from cyber_k8s_index import split_sections
+
+SNAPSHOT = """\
+=== {date} ===
+--- Node Resource Usage ---
+NAME     CPU(cores)   CPU%   MEMORY(bytes)   MEMORY%
+colima   {cpu}m         {pct}%     2010Mi          25%
+--- Active Pods ---
+NAMESPACE   NAME        READY   STATUS    RESTARTS        AGE
+default     web-7d9f    1/1     Running   {restarts:<16}{age}m
+litellm     litellm-0   1/1     {status:<10}0               {age}m"""
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def snapshot(i, status="Running"):
+    return SNAPSHOT.format(date=time.strftime("%a %b %d %H:%M:%S UTC 2026", time.gmtime(i * 15)),
+                           cpu=200 + i % 7, pct=5 + i % 3, restarts=f"2 ({3 + i // 4}m ago)", age=10 + i // 4,
+                           status=status)
+
+
+def run(detector, governor, clock, snapshots, start=0):
+    for i in range(start, start + snapshots):
+        clock.now = i * 15.0 # colima-k8s-persistent.sh prints one snapshot every 15 s
+        sections = {title: "\n".join(lines) for title, lines in split_sections(snapshot(i).splitlines())}
+        if detector.update(sections):
+            governor.note_change()
+
+
+def test_unchanged_cluster_backs_off_to_max_interval():
+    clock, detector = FakeClock(), ChangeDetector()
+    governor = Governor(1.0, 30.0, clock=clock)
+    run(detector, governor, clock, 40) # 10 minutes of ticking ages, usage and timestamps
+    assert governor.changes == 1 # Only the first snapshot
+    assert governor.interval() == 30.0
+
+
+def test_status_change_wakes_the_governor():
+    clock, detector = FakeClock(), ChangeDetector()
+    governor = Governor(1.0, 30.0, clock=clock)
+    run(detector, governor, clock, 40)
+    clock.now += 15
+    crashed = {title: "\n".join(lines) for title, lines in split_sections(snapshot(41, "Error").splitlines())}
+    assert detector.update(crashed)
+    governor.note_change()
+    assert governor.interval() == 1.0
@@ -0,0 +1,64 @@
+from cyber_k8s_index import PROBLEM_FILTER, SectionIndex, TableIndex, format_table, parse_table
+
+
+def test_format_table_parses_back():
+    rows = [("default", "web", "Running", "Back-off restarting failed container"),
+            ("kube-system", "coredns-5d78c9869d-x", "Pending", "-")]
+    lines = format_table(("NAMESPACE", "NAME", "STATUS", "MESSAGE"), rows)
+    assert lines[0] == "NAMESPACE     NAME                   STATUS    MESSAGE"
+    parsed = [fields for kind, _, fields in parse_table("\n".join(lines)) if kind == "row"]
+    assert [tuple(fields.values()) for fields in parsed] == rows
+
+
+PODS = """\
+NAMESPACE     NAME         READY   STATUS             RESTARTS   AGE   IP          NODE
+default       web-1        1/1     Running            0          5m    10.42.0.5   colima
+litellm       litellm-0    0/1     CrashLoopBackOff   7          12m   10.42.0.6   colima
+kube-system   coredns-x    1/1     Running            0          3d    10.42.0.2   colima"""
+
+EVENT_TABLES = """\
+NEWEST:
+NAMESPACE   OBJECT          TYPE      REASON    COUNT   LAST   MESSAGE
+litellm     pod/litellm-0   Warning   BackOff   7       5s     Back-off restarting failed container
+
+HOTTEST:
+NAMESPACE   OBJECT          TYPE      REASON    COUNT   LAST   MESSAGE
+litellm     pod/litellm-0   Warning   BackOff   7       5s     Back-off restarting failed container"""
+
+
+def test_delta_holds_only_touched_rows():
+    index = TableIndex()
+    assert index.update("Active Pods", PODS) == (3, 0, 0)
+    assert index.update("Active Pods", PODS) == (0, 0, 0) and index.delta("Active Pods") == []
+    restarted = PODS.replace("CrashLoopBackOff   7 ", "Running            8 ")
+    gone = "\n".join(line for line in restarted.splitlines() if "coredns" not in line)
+    assert index.update("Active Pods", gone) == (0, 1, 1)
+    (changed_key, old, new), (removed_key, removed, none) = index.delta("Active Pods")
+    assert changed_key == ("litellm", "litellm-0") and (old["STATUS"], new["STATUS"]) == ("CrashLoopBackOff", "Running")
+    assert removed_key == ("kube-system", "coredns-x") and removed["NAME"] == "coredns-x" and none is None
+    assert index.values("Active Pods", "namespace") == ["default", "litellm"]
+
+
+def test_drilldown_filters_keep_headers_and_order():
+    index = TableIndex()
+    index.update("Active Pods", PODS)
+    header = PODS.splitlines()[0]
+    assert index.query("Active Pods", status=PROBLEM_FILTER) == [header, PODS.splitlines()[2]]
+    assert index.query("Active Pods", namespace=["default", "kube-system"], node="colima") == \
+        [header, PODS.splitlines()[1], PODS.splitlines()[3]]
+    assert index.query("Active Pods", text="COREDNS") == [header, PODS.splitlines()[3]]
+    assert index.query("Active Pods", namespace="missing") == []
+    assert index.problem_statuses("Active Pods") == ["CrashLoopBackOff"]
+
+
+def test_usage_rows_are_indexed_by_node():
+    index = TableIndex()
+    index.update("Node Resource Usage", "NAME     CPU(cores)   CPU(%)   MEMORY(bytes)   MEMORY(%)\ncolima   412m         10%      2011Mi          51%")
+    assert index.values("Node Resource Usage", "node") == ["colima"]
+
+
+def test_repeated_lines_are_all_kept():
+    index = SectionIndex()
+    assert index.update(EVENT_TABLES) == (4, 0, 0) # Both table rows plus the two titles
+    assert index.query(namespace="litellm") == EVENT_TABLES.splitlines()[1:3] + EVENT_TABLES.splitlines()[5:7]
+    assert index.update(EVENT_TABLES) == (0, 0, 0)
@@ -0,0 +1,46 @@
+import os
+import re
+import subprocess
+import time
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "colima-k8s-persistent.sh")
+DAY = 86400
+
+
+def rotate_logfile(log, max_bytes, keep=0):
+    """Runs rotate_logfile() from colima-k8s-persistent.sh on 'log' (the script itself starts a cluster)."""
+    with open(SCRIPT) as f:
+        function = re.search(r"^rotate_logfile\(\) \{.*?^\}", f.read(), re.M | re.S).group(0)
+    env = dict(os.environ, LOGFILE=log, LOG_MAX_BYTES=str(max_bytes), LOG_RETENTION_DAYS="28", LOG_KEEP=str(keep))
+    subprocess.run(["bash", "-c", f'{function}\nrotate_logfile'], env=env, check=True)
+
+
+def rotated(tmp_path):
+    return sorted(name for name in os.listdir(tmp_path) if name != "cluster.log")
+
+
+def test_rotation_renames_past_the_size_and_prunes_by_age(tmp_path):
+    log = str(tmp_path / "cluster.log")
+    now = int(time.time())
+    for name in (f"cluster.log.{now - 29 * DAY}", f"cluster.log.{now - DAY}", "cluster.log.bak"):
+        (tmp_path / name).write_text("=== old ===\n")
+    (tmp_path / "cluster.log").write_text("=== now ===\n")
+    rotate_logfile(log, max_bytes=1024)
+    assert os.path.exists(log) # Under LOG_MAX_BYTES: nothing happens
+    assert rotated(tmp_path) == [f"cluster.log.{now - 29 * DAY}", f"cluster.log.{now - DAY}", "cluster.log.bak"]
+    rotate_logfile(log, max_bytes=8)
+    assert not os.path.exists(log)
+    names = rotated(tmp_path)
+    assert f"cluster.log.{now - 29 * DAY}" not in names # Past LOG_RETENTION_DAYS
+    assert f"cluster.log.{now - DAY}" in names and "cluster.log.bak" in names and len(names) == 3
+
+
+def test_rotation_keeps_at_most_log_keep_copies(tmp_path):
+    log = str(tmp_path / "cluster.log")
+    now = int(time.time())
+    for days in (3, 2, 1):
+        (tmp_path / f"cluster.log.{now - days * DAY}").write_text("=== old ===\n")
+    (tmp_path / "cluster.log").write_text("=== now ===\n")
+    rotate_logfile(log, max_bytes=8, keep=2)
+    names = rotated(tmp_path)
+    assert len(names) == 2 and f"cluster.log.{now - DAY}" in names # The newest copies survive
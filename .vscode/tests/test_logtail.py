@@ -0,0 +1,72 @@
+import os
+import time
+
+from cyber_k8s_logtail import LogTail, PodStream, parse_log_timestamp_ns
+
+
+def lines_of(stream):
+    return [text for _, _, text in stream.ring]
+
+
+def test_variable_length_fractions_compare_numerically():
+    assert parse_log_timestamp_ns("2025-01-01T00:00:02Z") < parse_log_timestamp_ns("2025-01-01T00:00:02.4Z")
+    assert parse_log_timestamp_ns("2025-01-01T00:00:01.5Z") == parse_log_timestamp_ns("2025-01-01T00:00:01.500000000Z")
+
+
+def test_interleaved_containers_keep_every_line():
+    tail, stream = LogTail(), PodStream("default", "web", 50)
+    for line in ("[pod/web/app] 2025-01-01T00:00:01.5Z app one",
+                 "[pod/web/sidecar] 2025-01-01T00:00:01.3Z sidecar one",
+                 "[pod/web/app] 2025-01-01T00:00:02Z app two",
+                 "[pod/web/app] 2025-01-01T00:00:02.4Z app three"):
+        tail._ingest(stream, line)
+    assert lines_of(stream) == ["app one", "sidecar one", "app two", "app three"]
+    assert "--since-time=2025-01-01T00:00:01.3Z" in tail._logs_command(stream)
+
+
+def test_reconnect_replay_is_deduplicated():
+    tail, stream = LogTail(), PodStream("default", "web", 50)
+    tail._ingest(stream, "[pod/web/app] 2025-01-01T00:00:01Z app one")
+    tail._ingest(stream, "[pod/web/sidecar] 2025-01-01T00:00:03Z sidecar one")
+    # Reconnect: --since-time replays from the container furthest behind
+    stream.begin_replay()
+    for line in ("[pod/web/app] 2025-01-01T00:00:01Z app one",
+                 "[pod/web/sidecar] 2025-01-01T00:00:03Z sidecar one",
+                 "[pod/web/app] 2025-01-01T00:00:04Z app two",
+                 "[pod/web/sidecar] 2025-01-01T00:00:03.5Z sidecar two",
+                 "[pod/web/app] 2025-01-01T00:00:03.9Z app late"): # Out of order, but after the replay
+        tail._ingest(stream, line)
+    assert lines_of(stream) == ["app one", "sidecar one", "app two", "sidecar two", "app late"]
+
+
+FAKE_KUBECTL = """#!/bin/sh
+case "$*" in
+ "get pods"*) printf 'default\\tweb-1\\ndefault\\tweb-2\\n' ;;
+ "logs -f"*) echo $$ >> "{pids}"; echo "2025-01-01T00:00:01Z hello"; exec sleep 1000 ;;
+esac
+"""
+
+
+def alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def test_stop_leaves_no_kubectl_children(tmp_path):
+    pids = tmp_path / "pids"
+    kubectl = tmp_path / "kubectl"
+    kubectl.write_text(FAKE_KUBECTL.replace("{pids}", str(pids)))
+    kubectl.chmod(0o755)
+    tail = LogTail(kubectl=str(kubectl), reorder_window_sec=0).start()
+    deadline = time.time() + 5
+    while len(tail.recent()) < 2 and time.time() < deadline:
+        tail.render_lines() # Reads the streams while the loop thread adds them
+        time.sleep(0.05)
+    assert tail.render_lines()[0].startswith("Following 2 pods")
+    tail.stop()
+    assert not tail._thread.is_alive()
+    followed = [int(pid) for pid in pids.read_text().split()]
+    assert len(followed) == 2 and not any(alive(pid) for pid in followed)
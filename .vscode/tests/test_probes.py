@@ -0,0 +1,93 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from cyber_k8s_probes import LatencyHistogram, Prober, discover_targets
+
+INGRESS = """\
+NAMESPACE   NAME      CLASS     HOSTS                     ADDRESS        PORTS     AGE
+litellm     litellm   traefik   litellm.onto.one          192.168.5.15   80, 443   3d
+swiss       swiss     traefik   swiss.onto.one,*.onto.one 192.168.5.15   80        3d"""
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # Keep-alive, like the ingress controller
+
+    def do_GET(self):
+        host = self.headers["Host"]
+        if host.startswith("slow"):
+            time.sleep(self.server.slow_sec)
+        status = 503 if host.startswith("down") else 200
+        body = b"ok"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.requests.append(host)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.requests, server.slow_sec = [], 0.0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_prober(stub, hosts, **kwargs):
+    prober = Prober(resolve={host: stub.server_address for host in hosts}, **kwargs)
+    prober.set_targets([("default", "http", host) for host in hosts])
+    return prober
+
+
+def test_discover_targets_from_ingress_table():
+    assert discover_targets(INGRESS) == [("litellm", "https", "litellm.onto.one"), ("swiss", "http", "swiss.onto.one")]
+
+
+def test_histogram_percentiles_stay_within_bucket_error():
+    histogram = LatencyHistogram()
+    for ms in range(1, 101):
+        histogram.add(ms)
+    assert histogram.percentile(50) == pytest.approx(50, rel=0.1)
+    assert histogram.percentile(99) == pytest.approx(99, rel=0.1)
+    assert len(histogram.buckets) < 60
+
+
+def test_round_probes_hosts_over_reused_connections(stub):
+    prober = make_prober(stub, ["web.onto.one", "down.onto.one"])
+    try:
+        for _ in range(3):
+            assert prober.probe_round() == 2
+        web, down = prober.stats[("http", "web.onto.one")], prober.stats[("http", "down.onto.one")]
+        assert (web.probes, web.errors, web.last_status, web.healthy()) == (3, 0, 200, True)
+        assert (down.errors, down.last_status, down.healthy()) == (3, 503, False)
+        assert prober.pool.created == 2 and prober.pool.reused == 4 # One keep-alive connection per host
+        assert "Down" in "\n".join(prober.render_lines())
+    finally:
+        prober.stop()
+
+
+def test_slow_hosts_do_not_build_a_backlog(stub):
+    stub.slow_sec = 1.0
+    hosts = ["slow1.onto.one", "slow2.onto.one"]
+    prober = make_prober(stub, hosts, workers=1, round_budget_sec=0.05)
+    try:
+        for _ in range(5):
+            prober.probe_round()
+            assert len(prober.in_flight) <= len(hosts) # At most one queued or running probe per host
+        time.sleep(stub.slow_sec * 1.5)
+        # Only the first probe of slow1 ever ran; everything queued behind it was cancelled or skipped
+        assert stub.requests == ["slow1.onto.one"]
+        assert prober.stats[("http", "slow1.onto.one")].skipped == 5
+        assert prober.in_flight == {}
+    finally:
+        prober.stop()
@@ -0,0 +1,101 @@
+import io
+
+from cyber_k8s_render import AnsiStreamBackend, VirtualClock, VirtualScreenBackend
+
+ACTIVE_PODS = (
+    "NAMESPACE   NAME             READY   STATUS             RESTARTS   AGE\n"
+    "default     web-7d9f         1/1     Running            0          5m\n"
+    "litellm     litellm-0        0/1     CrashLoopBackOff   7          12m"
+)
+
+# curses clrtoeol() blanks the right border of every line that was typed on
+ACTIVE_PODS_FRAME = """\
++------------------------------------------------------------------------------+
+|--- Active Pods ---
+|                                                                              |
+|NAMESPACE NAME READY STATUS RESTARTS AGE
+|default web-7d9f 1/1 Running 0 5m
+|litellm litellm-0 0/1 CrashLoopBackOff 7 12m
+|                                                                              |
+|                                                                              |
+|                                                                              |
++------------------------------------------------------------------------------+"""
+
+TITLE, CONTENT, HIGHLIGHT, DIM, WARNING, FAILING = (1 << n for n in range(8, 14)) # Stand-ins for color pairs
+
+
+def test_stream_frame_with_virtual_clock():
+    screen, clock = VirtualScreenBackend(rows=4, cols=20), VirtualClock()
+    screen.write("\x1b[2J\x1b[H")
+    for chunk in ["\x1b[32m", *"Ready", "\x1b[0m", *"\nnode-1 ok"]: # Typewriter: one character per write
+        screen.write(chunk)
+        clock.sleep(0.05)
+    assert screen.frame() == "Ready\nnode-1 ok"
+    assert screen.cells[0][0] == ("R", "32")
+    assert screen.cells[1][0] == ("n", "")
+    assert abs(clock.now - 0.05 * 17) < 1e-9 # Typing "took" 0.85 s without sleeping
+
+
+def test_ansi_stream_emits_only_changed_rows():
+    out = io.StringIO()
+    backend = AnsiStreamBackend(stream=out)
+    backend.size = lambda: (3, 10)
+    win = backend.newwin(3, 10, 0, 0)
+    win.addstr(0, 0, "one")
+    win.addstr(1, 0, "two")
+    win.noutrefresh()
+    backend.doupdate()
+    out.truncate(0)
+    out.seek(0)
+    win.addstr(1, 0, "TWO")
+    win.noutrefresh()
+    backend.doupdate()
+    assert out.getvalue() == "\x1b[2;1HTWO       "
+
+
+def test_monitor_section_golden_frame(load_script):
+    monitor = load_script("cyber-k8s-monitor")
+    monitor.sections["Active Pods"] = ACTIVE_PODS
+    monitor.clock = VirtualClock()
+    screen = VirtualScreenBackend(rows=10, cols=80)
+    win = screen.newwin(10, 80, 0, 0)
+    monitor.draw_section_content_matrix_style(win, "Active Pods", "Active Pods", TITLE, CONTENT, HIGHLIGHT, DIM,
+                                              delay_sec=0.01, color_warning_pair=WARNING, color_failing_pair=FAILING)
+    assert screen.frame() == ACTIVE_PODS_FRAME
+    assert screen.cells[5][23] == ("C", FAILING) # "CrashLoopBackOff"
+    assert screen.cells[4][22] == ("R", HIGHLIGHT) # "Running"
+    assert screen.cells[4][1] == ("d", CONTENT)
+    assert monitor.clock.sleeps == 117 # One sleep per typed character, none of them real
+
+
+def test_tiled_panes_redraw_only_what_changed(load_script, monkeypatch):
+    monitor = load_script("cyber-k8s-monitor")
+    screen = VirtualScreenBackend(rows=30, cols=240) # Room for all ten panes
+    for name, value in (("render_backend", screen), ("sections", dict(monitor.sections, **{"Active Pods": ACTIVE_PODS})),
+                        ("extra_sections", {}), ("pane_windows", {}), ("pane_signatures", {}),
+                        ("current_cycle_index", 0), ("pinned_section", None)):
+        monkeypatch.setattr(monitor, name, value)
+    drawn = []
+    draw = monitor.draw_section_content_matrix_style
+    monkeypatch.setattr(monitor, "draw_section_content_matrix_style",
+                        lambda win, title, *args, **kwargs: (drawn.append(title), draw(win, title, *args, **kwargs)))
+
+    def tick():
+        drawn.clear()
+        monitor.draw_main_screen.force_content_redraw = True # Set by the main loop on every pipe chunk and cycle step
+        monitor.draw_tiled_panes(0, 30, 240, (TITLE, CONTENT, HIGHLIGHT, DIM), (WARNING, FAILING))
+        return sorted(drawn)
+
+    assert len(tick()) == 10 and "Active Pods <n/o/s/p>" in drawn
+    assert screen.cells[0][0] == ("+", HIGHLIGHT) # The drilldown target's border
+    assert tick() == []
+    monitor.sections["Service Status"] = "NAMESPACE   NAME\ndefault     web"
+    assert tick() == ["Service Status"]
+    monitor.current_cycle_index = 2 # Cycle step: the keys now act on "Service Status"
+    assert tick() == ["Active Pods", "Service Status <n/o/s/p>"]
+    assert screen.cells[0][0] == ("+", TITLE)
+    monitor.extra_sections["Search Results"] = "Query: web"
+    monitor.pinned_section = "Search Results" # 'f' gets the first pane
+    assert "Search Results" in tick() and screen.frame().splitlines()[1].startswith("|--- Search Results ---")
+    monitor.draw_tiled_panes.force_redraw = True # Resize or layout switch
+    assert len(tick()) == 11
@@ -0,0 +1,106 @@
+import os
+import time
+
+from cyber_k8s_search import IndexWorker, LogIndex, format_results, open_index
+
+
+def snapshot(minute, *pods):
+    lines = [f"=== Mon Oct 19 10:{minute:02d}:00 UTC 2026 ===", "--- Active Pods ---",
+             "NAMESPACE   NAME      STATUS"]
+    lines += [f"default     {name}     {status}" for name, status in pods]
+    lines += ["--- Service Status ---", "NAMESPACE   NAME      TYPE", "default     web-svc   ClusterIP"]
+    return "\n".join(lines) + "\n"
+
+
+def write(path, *snapshots, mode="a"):
+    with open(path, mode) as f:
+        f.write("".join(snapshots))
+
+
+def test_query_reports_first_last_and_gone(tmp_path):
+    log = str(tmp_path / "cluster.log")
+    write(log, snapshot(0, ("web-1", "Running")), snapshot(1, ("web-1", "CrashLoopBackOff")),
+          snapshot(2, ("api-1", "Running")), snapshot(3, ("api-1", "Running")))
+    index = open_index(log)
+    assert len(index.snapshots) == 3 # The last snapshot may still grow; it is searched linearly
+    assert [hit.snapshot for hit in index.search("web-1")] == [0, 1]
+    assert [hit.snapshot for hit in index.search("WEB-1 crashloopbackoff")] == [1]
+    assert {hit.section for hit in index.search("web*")} == {"Active Pods", "Service Status"}
+    assert [hit.snapshot for hit in index.search("web*", section="Active Pods")] == [0, 1]
+    report = format_results(index, "web-1")
+    assert report[2:5] == ["First seen: Mon Oct 19 10:00:00 UTC 2026", "Last seen:  Mon Oct 19 10:01:00 UTC 2026",
+                           "Gone since: Mon Oct 19 10:02:00 UTC 2026"]
+    assert "[Mon Oct 19 10:01:00 UTC 2026] Active Pods: default     web-1     CrashLoopBackOff" in report
+    assert format_results(index, "api-1")[3] == "Last seen:  Mon Oct 19 10:03:00 UTC 2026" # From the unindexed tail
+
+
+def test_saved_index_resumes_from_its_offset(tmp_path):
+    log = str(tmp_path / "cluster.log")
+    write(log, snapshot(0, ("web-1", "Running")), snapshot(1, ("web-1", "Running")))
+    open_index(log)
+    index = LogIndex(log)
+    assert index.load() and len(index.snapshots) == 1
+    assert index.update() == 0 # Nothing new: the log is not re-read
+    write(log, snapshot(2, ("web-1", "Running")))
+    assert index.update() == 1
+    assert [hit.snapshot for hit in index.search("web-1")] == [0, 1]
+
+
+def test_rotation_is_followed_and_pruned_segments_drop_out(tmp_path):
+    log = str(tmp_path / "cluster.log")
+    write(log, snapshot(0, ("old-1", "Running")), snapshot(1, ("old-1", "Running")), snapshot(2, ("old-1", "Running")))
+    index = open_index(log)
+    assert len(index.snapshots) == 2
+    rotated = f"{log}.{int(time.time())}"
+    os.rename(log, rotated) # What colima-k8s-persistent.sh does past LOG_MAX_BYTES
+    write(log, *(snapshot(minute, ("new-1", "Running")) for minute in range(3, 8)))
+    assert index.update() == 5 # The rotated file's last snapshot plus four complete new ones
+    hits = index.search("old-1")
+    assert [hit.snapshot for hit in hits] == [0, 1, 2]
+    assert index.matching_lines(hits[-1], "old-1") == ["default     old-1     Running"] # Read from the rotated name
+    fresh = LogIndex(log)
+    fresh.update()
+    assert len(fresh.snapshots) == 7 and len(fresh.search("old-1")) == 3 # A new index picks up rotated history
+    os.remove(rotated)
+    assert index.search("old-1") == []
+    assert len(index.search("new-1")) == 4
+
+
+def test_worker_answers_queries_off_thread(tmp_path):
+    log = str(tmp_path / "cluster.log")
+    write(log, snapshot(0, ("web-1", "Running")), snapshot(1, ("web-1", "Running")))
+    worker = IndexWorker(log, interval_sec=0.05).start()
+    try:
+        worker.submit("web-1")
+        deadline = time.time() + 5
+        while worker.results is None and time.time() < deadline:
+            time.sleep(0.01)
+        lines = worker.render_lines()
+        assert lines[0] == "Query: web-1" and lines[2] == "First seen: Mon Oct 19 10:00:00 UTC 2026"
+        assert os.path.exists(log + ".idx")
+    finally:
+        worker.stop()
+
+
+def test_postings_stay_on_disk_and_a_flushed_build_resumes(tmp_path):
+    log = str(tmp_path / "cluster.log")
+    write(log, *(snapshot(minute, (f"web-{minute}", "Running")) for minute in range(8)))
+    index = open_index(log)
+    assert index.pending_bytes == 0 and all(entry[2] == b"" for entry in index.terms.values())
+    assert [hit.snapshot for hit in index.search("web*", section="Active Pods")] == list(range(7))
+    write(log, snapshot(8, ("web-1", "Running")), snapshot(9, ("api-1", "Running")))
+    assert index.update() == 2 and index.pending_bytes > 0
+    assert [hit.snapshot for hit in index.search("web-1")] == [1, 8] # Stored and pending postings together
+    index.close()
+    # A large backlog is flushed while it is indexed; a build cut short resumes from the last flush
+    partial_path = str(tmp_path / "partial.idx")
+    partial = LogIndex(log, index_path=partial_path, max_pending_bytes=16)
+    partial.update()
+    assert len(partial.snapshots) == 9 and partial.pending_bytes <= 16
+    reopened = LogIndex(log, index_path=partial_path) # As if the process died before save()
+    assert reopened.load() and 0 < len(reopened.snapshots) <= 9
+    reopened.update()
+    assert len(reopened.snapshots) == 9 and [hit.snapshot for hit in reopened.search("web-1")] == [1, 8]
+    assert format_results(reopened, "web-3")[2] == "First seen: Mon Oct 19 10:03:00 UTC 2026"
+    partial.close()
+    reopened.close()
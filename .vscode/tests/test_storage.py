@@ -0,0 +1,42 @@
+import os
+
+from cyber_k8s_storage import StorageScanner
+
+
+def test_steady_tree_is_not_reaggregated_or_saved(tmp_path):
+    root, cache = tmp_path / "storage", tmp_path / "cache.json"
+    (root / "pvc-1" / "data").mkdir(parents=True)
+    (root / "pvc-1" / "data" / "a.bin").write_bytes(b"x" * 10000)
+    scanner = StorageScanner(str(root), cache_path=str(cache))
+    scanner.scan(full=True)
+    saved = cache.stat().st_mtime_ns
+    aggregated = scanner.totals
+
+    stats = scanner.scan()
+    assert stats["rescanned"] == 0
+    assert scanner.totals is aggregated # No bottom-up pass over an unchanged tree
+    assert cache.stat().st_mtime_ns == saved
+    assert len(scanner.history["pvc-1"]) == 2 # Growth samples are still taken
+
+    (root / "pvc-1" / "data" / "b.bin").write_bytes(b"y" * 10000)
+    os.utime(root / "pvc-1" / "data", ns=(1, 1)) # Make the mtime change visible regardless of timestamp granularity
+    stats = scanner.scan()
+    assert stats["rescanned"] == 1
+    assert scanner.totals["pvc-1"][1] == 2
+    assert StorageScanner(str(root), cache_path=str(cache)).totals["pvc-1"][1] == 2
+
+
+def test_only_pvc_folders_are_walked(tmp_path):
+    root = tmp_path / "storage"
+    (root / "pvc-1a_litellm_data").mkdir(parents=True)
+    (root / "pvc-1a_litellm_data" / "db").write_bytes(b"x" * 10000)
+    (root / "backups" / "deep").mkdir(parents=True)
+    (root / "backups" / "deep" / "dump.tar").write_bytes(b"y" * 100000)
+    (root / "notes.txt").write_bytes(b"z" * 5000)
+    scanner = StorageScanner(str(root), cache_path=str(tmp_path / "cache.json"))
+    stats = scanner.scan(full=True)
+    assert stats["dirs"] == 2 and stats["files_stat"] == 1 # The root and the PVC
+    assert set(scanner.history) == {"pvc-1a_litellm_data"}
+    assert scanner.totals[""] == scanner.totals["pvc-1a_litellm_data"]
+    table = "\n".join(scanner.render_lines())
+    assert "litellm" in table and "backups" not in table